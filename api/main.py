@@ -1,50 +1,88 @@
 """
 FastAPI Backend for LinkedIn Post Factory
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Response, UploadFile, File, Form
+from fastapi import APIRouter, FastAPI, HTTPException, BackgroundTasks, Request, Response, UploadFile, File, Form, Depends
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from typing import Optional, List, Dict, Any, Awaitable, BinaryIO, Callable, Iterator, Tuple, Type
+from collections import OrderedDict, deque
 from datetime import datetime
-import sys
+from functools import lru_cache, partial
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 import uuid
 import io
 import base64
 import os
 import re
-import requests as _requests
+import time
+import hashlib
 import asyncio
+import aiohttp
+import logging
+import logging.handlers
+import queue
+import tempfile
+import orjson
 import google.generativeai as genai
 from pathlib import Path
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
+# SIMD-accelerated base64 when available; the stdlib encoder is a drop-in fallback.
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
 # Helper for data URIs
 def to_data_uri(data: bytes, mime_type: str) -> str:
-    b64 = base64.b64encode(data).decode('utf-8')
-    return f"data:{mime_type};base64,{b64}"
-
-# Ensure the project root is importable regardless of current working directory.
+    # Encode straight into a buffer that already holds the prefix, then decode once
+    # (avoids the extra str copy of decode-then-f-string for large assets).
+    out = bytearray(f"data:{mime_type};base64,".encode("ascii"))
+    out += _b64.b64encode(data)
+    return out.decode("ascii")
+
+# core/ and api/ are imported as installed packages (pip install -e .); the root is only
+# needed to locate .env and config files.
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
 
 # Always load environment variables from Post_Factory/.env.
 load_dotenv(PROJECT_ROOT / ".env")
 
+# Records are handed to a queue and written to stderr by a QueueListener thread, so a
+# burst of failures (e.g. a storage outage) never blocks the event loop on stream I/O.
+logger = logging.getLogger("post_factory")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+
 from core.post_generator import PostGenerator
 from core.voice_checker import VoiceChecker
 from core.content_tracker import ContentTracker
 from core.database_neon import NeonDatabase
+from core.llm_cache import llm_cache
 from api.services.news_service import NewsService
+from api.services.batch_llm import BatchLLMService
 # Try to import media generator (may not exist on all deployments)
 try:
     from api.services.media_generator import media_generator
     from api.services.storage_service import StorageService
+    from api.services.media_cache import imagen_cache, media_cache
     MEDIA_ENABLED = True
 except ImportError:
     print("Warning: Media generation services not available")
     media_generator = None
     StorageService = None
+    media_cache = None
+    imagen_cache = None
     MEDIA_ENABLED = False
 
 # ---------------------------------------------------------------------------
@@ -122,38 +160,30 @@ async def fetch_findings_for_url(url: str, source_name: str) -> tuple:
     if not url or not url.startswith('http'):
         return [], "", "No valid article URL was provided with this topic."
 
-    resolved_url_holder = [url]
-
-    def _sync_fetch() -> str:
-        resolved_url = url
+    resolved_url = url
+    try:
+        session = get_http_session()
         # Resolve Google News RSS redirect URLs to the actual article URL
         if 'news.google.com' in url:
             try:
-                r = _requests.get(
-                    url, timeout=10, allow_redirects=True,
+                async with session.get(
+                    url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=10),
                     headers={'User-Agent': 'Mozilla/5.0 (compatible; Googlebot/2.1)'}
-                )
-                if r.url and 'news.google.com' not in r.url:
-                    resolved_url = r.url
-                else:
-                    resolved_url = r.url
+                ) as r:
+                    resolved_url = str(r.url)
             except Exception:
                 pass
 
-        resolved_url_holder[0] = resolved_url
         jina_url = f"https://r.jina.ai/{resolved_url}"
-        resp = _requests.get(
+        async with session.get(
             jina_url,
             headers={"Accept": "text/plain", "X-Return-Format": "text"},
-            timeout=25,
+            timeout=aiohttp.ClientTimeout(total=25),
             allow_redirects=True,
-        )
-        return resp.text if resp.status_code == 200 else ""
-
-    try:
-        raw = await asyncio.get_event_loop().run_in_executor(None, _sync_fetch)
+        ) as resp:
+            raw = await resp.text() if resp.status == 200 else ""
         if not raw or len(raw.strip()) < 100:
-            domain = resolved_url_holder[0].split('/')[2] if '/' in resolved_url_holder[0] else url
+            domain = resolved_url.split('/')[2] if '/' in resolved_url else url
             return [], "", (
                 f"Could not retrieve article content from '{domain}'. "
                 f"The page may be paywalled, geo-blocked, or the URL may have expired. "
@@ -166,7 +196,7 @@ async def fetch_findings_for_url(url: str, source_name: str) -> tuple:
 
         # Detect paywall pages — these look like real content but contain no article body
         if _is_paywall_content(text):
-            domain = resolved_url_holder[0].split('/')[2] if '/' in resolved_url_holder[0] else url
+            domain = resolved_url.split('/')[2] if '/' in resolved_url else url
             return [], "", (
                 f"The article at '{domain}' is behind a paywall — only the subscription gate was retrieved, not the article content. "
                 f"To generate a post grounded in the real article, please open it in your browser, "
@@ -178,13 +208,167 @@ async def fetch_findings_for_url(url: str, source_name: str) -> tuple:
     except Exception as exc:
         return [], "", f"Failed to fetch article content: {str(exc)}"
 
+def _new_http_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=120)
+    )
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Keep-alive aiohttp session shared by outbound calls (article fetches, Vertex AI)."""
+    session = getattr(app.state, "http_session", None)
+    if session is None or session.closed:
+        session = app.state.http_session = _new_http_session()
+    return session
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared services and the pooled HTTP session before serving; close them on shutdown."""
+    log_listener.start()
+    app.state.http_session = _new_http_session()
+    try:
+        from core.vertex_wrapper import VertexWrapper
+        VertexWrapper.use_session(app.state.http_session)
+    except ImportError:
+        pass
+    clock_task = asyncio.create_task(_tick_clock())
+    start_media_executor()
+    start_upload_workers()
+    await asyncio.gather(asyncio.to_thread(_warm_services), warm_media_workers())
+
+    yield
+
+    clock_task.cancel()
+    await stop_upload_workers()
+    stop_media_executor()
+    # Only close what was actually built; calling the factory here would create it
+    if get_news_service.cache_info().currsize:
+        news_service = get_news_service()
+        if news_service is not None:
+            await news_service.aclose()
+    try:
+        from core.vertex_wrapper import VertexWrapper
+        await VertexWrapper.close_session()
+    except ImportError:
+        pass
+    await app.state.http_session.close()
+    log_listener.stop()
+
+
 app = FastAPI(
     description="AI-powered LinkedIn content generation with voice consistency",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 service_init_errors: Dict[str, str] = {}
 
+# Service factories: each service is built lazily on first use and then shared by
+# every request in this worker. Failures are recorded in service_init_errors and
+# the factory returns None, matching the "degraded" health reporting.
+@lru_cache(maxsize=1)
+def get_generator() -> Optional[PostGenerator]:
+    try:
+        return PostGenerator()
+    except Exception as exc:
+        service_init_errors["generator"] = str(exc)
+        print(f"Warning: Could not initialize post generator: {exc}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_checker() -> Optional[VoiceChecker]:
+    try:
+        return VoiceChecker()
+    except Exception as exc:
+        service_init_errors["checker"] = str(exc)
+        print(f"Warning: Could not initialize voice checker: {exc}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_db() -> Optional[NeonDatabase]:
+    try:
+        return NeonDatabase()
+    except Exception as exc:
+        service_init_errors["database"] = str(exc)
+        print(f"Warning: Could not initialize database: {exc}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_tracker() -> Optional[ContentTracker]:
+    db = get_db()
+    if db is None:
+        return None
+    try:
+        return ContentTracker(db_client=db)
+    except Exception as exc:
+        service_init_errors["tracker"] = str(exc)
+        print(f"Warning: Could not initialize content tracker: {exc}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_news_service() -> Optional[NewsService]:
+    try:
+        return NewsService()
+    except Exception as exc:
+        service_init_errors["news_service"] = str(exc)
+        print(f"Warning: Could not initialize news service: {exc}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_storage_service() -> Optional["StorageService"]:
+    # One storage client shared by every media endpoint: reuse the database's Supabase
+    # client when there is one (SupabaseDatabase), otherwise open one from SUPABASE_* env.
+    if not (MEDIA_ENABLED and StorageService):
+        return None
+    db = get_db()
+    supabase_client = getattr(db, 'supabase', None) if db is not None else None
+    if supabase_client is None and not os.getenv("SUPABASE_URL"):
+        return None
+    try:
+        if supabase_client is None:
+            return StorageService.from_env()
+        return StorageService(supabase_client)
+    except Exception as e:
+        service_init_errors["storage_service"] = str(e)
+        print(f"Warning: Could not initialize storage service: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_batch_llm_service() -> Optional[BatchLLMService]:
+    # Optional: only available when an OpenAI key is configured
+    if not os.getenv("OPENAI_API_KEY"):
+        return None
+    try:
+        return BatchLLMService(system_prompt=PostGenerator.GPT4_SYSTEM_PROMPT)
+    except Exception as exc:
+        service_init_errors["batch_llm"] = str(exc)
+        print(f"Warning: Could not initialize batch LLM service: {exc}")
+        return None
+
+
+# Max posts generated concurrently by /posts/batch (keeps provider QPM and memory bounded).
+BATCH_GENERATION_CONCURRENCY = int(os.getenv("BATCH_GENERATION_CONCURRENCY", "8"))
+
+# Wall-clock ISO timestamp refreshed once a second by _tick_clock; probe-style endpoints
+# read it instead of formatting a fresh datetime per request. Post rows keep exact times.
+CURRENT_ISO = datetime.now().isoformat()
+
+
+async def _tick_clock() -> None:
+    global CURRENT_ISO
+    while True:
+        CURRENT_ISO = datetime.now().isoformat()
+        await asyncio.sleep(1)
+
 # Health check endpoint for deployment platforms
 @app.get("/health")
 async def health_check():
@@ -192,10 +376,34 @@ async def health_check():
     status = "healthy" if not service_init_errors else "degraded"
     return {
         "status": status,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": CURRENT_ISO,
+        "services": {
+            "post_generator": "error" if "generator" in service_init_errors else "ready",
+            "voice_checker": "error" if "checker" in service_init_errors else "ready",
+            "content_tracker": "error" if "tracker" in service_init_errors else "ready",
+            "database": "error" if "database" in service_init_errors else "ready"
+        },
         "service_init_errors": service_init_errors,
     }
 
+# genai.list_models() is a network call; probes hitting /debug/diagnose reuse the last
+# successful listing for GEMINI_MODELS_TTL_SECONDS.
+GEMINI_MODELS_TTL_SECONDS = 600
+_gemini_models_cache: Dict[str, Any] = {"ts": 0.0, "models": None}
+
+
+def _list_gemini_models() -> List[Dict[str, str]]:
+    if _gemini_models_cache["models"] is not None and time.monotonic() - _gemini_models_cache["ts"] < GEMINI_MODELS_TTL_SECONDS:
+        return _gemini_models_cache["models"]
+    # Filter to relevant models and convert to list of dicts
+    models = [
+        {"name": m.name, "display_name": m.display_name}
+        for m in genai.list_models()
+        if 'generateContent' in m.supported_generation_methods
+    ]
+    _gemini_models_cache.update(ts=time.monotonic(), models=models)
+    return models
+
 @app.get("/debug/diagnose")
 async def diagnose_environment():
     """Diagnostic endpoint to check environment and available models"""
@@ -233,14 +441,7 @@ async def diagnose_environment():
              available_models.append({"name": "gpt-4o", "display_name": "OpenAI GPT-4o (Fallback Available)"})
 
         if api_key:
-            models = genai.list_models()
-            # Filter to relevant models and convert to list of dicts
-            for m in models:
-                if 'generateContent' in m.supported_generation_methods:
-                    available_models.append({
-                        "name": m.name,
-                        "display_name": m.display_name
-                    })
+            available_models.extend(await asyncio.to_thread(_list_gemini_models))
     except Exception as e:
         error_message = str(e)
 
@@ -252,7 +453,7 @@ async def diagnose_environment():
     }
 
     return {
-        "system_time": system_time.isoformat(),
+        "system_time": system_time,
         "api_key_status": api_key_status,
         "vertex_ai_status": vertex_status,
         "environment": env_vars,
@@ -261,6 +462,34 @@ async def diagnose_environment():
         "genai_lib_version": genai.__version__
     }
 
+@app.get("/debug/cache-stats")
+async def cache_stats():
+    """LLM response and media render cache counters"""
+    stats = llm_cache.stats()
+    if media_cache is not None:
+        stats["media"] = media_cache.stats()
+        stats["imagen"] = imagen_cache.stats()
+    return stats
+
+@app.get("/debug/media-pipeline")
+async def media_pipeline_stats():
+    """Render vs upload timings and upload queue depth"""
+    render = _pipeline_timings["render"]
+    upload = _pipeline_timings["upload"]
+    avg_render = sum(render) / len(render) if render else 0.0
+    avg_upload = sum(upload) / len(upload) if upload else 0.0
+    # rho: share of upload time hidden behind rendering (1.0 = uploads never the bottleneck)
+    rho = 1 - max(0.0, avg_upload - avg_render) / avg_upload if avg_upload else 1.0
+    return {
+        "avg_render_seconds": round(avg_render, 4),
+        "avg_upload_seconds": round(avg_upload, 4),
+        "rho": round(rho, 3),
+        "queue_depth": upload_queue.qsize() if upload_queue is not None else 0,
+        "queue_maxsize": UPLOAD_QUEUE_MAXSIZE,
+        "workers": UPLOAD_WORKERS,
+        "pending_posts": len(pending_uploads)
+    }
+
 @app.get("/debug/test-vertex")
 async def test_vertex_generation():
     """Test Vertex AI generation directly"""
@@ -279,11 +508,11 @@ async def test_vertex_generation():
         results["steps"].append("3. Refreshing token...")
         from google.auth.transport.requests import Request as AuthReq
         if not wrapper.credentials.valid:
-            wrapper.credentials.refresh(AuthReq())
+            await asyncio.to_thread(wrapper.credentials.refresh, AuthReq())
         results["steps"].append(f"4. Token valid={wrapper.credentials.valid}")
         
-        results["steps"].append("5. Calling generate_content...")
-        response = wrapper.generate_content("Reply with exactly: VERTEX_OK")
+        results["steps"].append("5. Calling generate_content_async...")
+        response = await wrapper.generate_content_async("Reply with exactly: VERTEX_OK")
         results["steps"].append(f"6. Response received: {str(response)[:200] if response else 'None'}")
         results["success"] = response is not None
         results["response_preview"] = str(response)[:500] if response else None
@@ -294,23 +523,31 @@ async def test_vertex_generation():
     return results
 
 @app.get("/debug/test-generate")
-async def test_generate_flow():
+async def test_generate_flow(generator: Optional[PostGenerator] = Depends(get_generator)):
     """Test the exact post generation flow step by step"""
+    if generator is None:
+        raise HTTPException(
+            status_code=503,
+            detail={"message": "Post generator did not initialize.", "services": service_init_errors},
+        )
     steps = []
     try:
-        steps.append("1. Starting generate_post flow...")
-        steps.append(f"2. generator.vertex exists={generator.vertex is not None}")
-        steps.append(f"3. generator.vertex.credentials={generator.vertex.credentials is not None if generator.vertex else 'N/A'}")
-        steps.append(f"4. generator.vertex.project_id={generator.vertex.project_id if generator.vertex else 'N/A'}")
-        steps.append(f"5. generator.vertex.model_name={generator.vertex.model_name if generator.vertex else 'N/A'}")
-        steps.append(f"6. generator.gemini={generator.gemini is not None}")
-        steps.append(f"7. RENDER env={os.getenv('RENDER')}")
-        
+        vertex = generator.vertex
+        steps = [
+            "1. Starting generate_post flow...",
+            f"2. generator.vertex exists={vertex is not None}",
+            f"3. generator.vertex.credentials={vertex.credentials is not None if vertex else 'N/A'}",
+            f"4. generator.vertex.project_id={vertex.project_id if vertex else 'N/A'}",
+            f"5. generator.vertex.model_name={vertex.model_name if vertex else 'N/A'}",
+            f"6. generator.gemini={generator.gemini is not None}",
+            f"7. RENDER env={os.getenv('RENDER')}",
+        ]
         steps.append("8. Building prompt...")
         prompt = "Generate a short LinkedIn post about AI. Keep it under 200 words."
-        
+
         steps.append("9. Calling _generate_gemini...")
-        text = generator._generate_gemini(prompt)
+        # The Gemini call is blocking; keep it off the event loop so probes don't stall other requests
+        text = await asyncio.to_thread(generator._generate_gemini, prompt)
         steps.append(f"10. Got response: {str(text)[:300]}")
         
         return {"success": True, "steps": steps, "preview": str(text)[:500]}
@@ -380,75 +617,123 @@ async def test_imagen():
         import traceback
         return {"success": False, "steps": steps, "error": f"{type(e).__name__}: {str(e)}", "traceback": traceback.format_exc()}
 
-# CORS middleware for frontend
+# HTTP caching for read-only JSON endpoints: Cache-Control per path plus a content
+# ETag so repeat clients can revalidate with a 304. Post, stats and media-list bodies
+# change with every write, so they are private and revalidated on each use; only
+# responses that are the same for every caller (trending news) may be shared by a CDN.
+# Registered before CORS so CORS stays the outermost layer and also tags 304s.
+PRIVATE_REVALIDATE = "private, no-cache"
+CACHEABLE_GET_PATHS: List[Tuple["re.Pattern[str]", str]] = [
+    (re.compile(r"^/(stats|dashboard)$"), PRIVATE_REVALIDATE),
+    (re.compile(r"^/news/trending$"), "public, max-age=300"),
+    (re.compile(r"^/recommendations/next-pillar$"), PRIVATE_REVALIDATE),
+    (re.compile(r"^/posts(/[^/]+)?$"), PRIVATE_REVALIDATE),
+    (re.compile(r"^/media/list/[^/]+$"), PRIVATE_REVALIDATE),
+]
+
+
+def _cache_control_for(path: str) -> Optional[str]:
+    for pattern, cache_control in CACHEABLE_GET_PATHS:
+        if pattern.match(path):
+            return cache_control
+    return None
+
+
+@app.middleware("http")
+async def http_cache_headers(request: Request, call_next):
+    cache_control = _cache_control_for(request.url.path) if request.method == "GET" else None
+    response = await call_next(request)
+    if cache_control is None or response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+    headers["ETag"] = etag
+    headers["Cache-Control"] = cache_control
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return Response(content=body, status_code=response.status_code, headers=headers, media_type=response.media_type)
+
+# Media and generation bodies are small JSON documents; refuse anything larger up front
+# (from Content-Length alone, before the body is read or a generator runs). Multipart
+# uploads such as /articles/extract carry whole documents and are not capped here.
+MAX_JSON_BODY_BYTES = int(os.getenv("MAX_JSON_BODY_BYTES", "1000000"))
+
+
+@app.middleware("http")
+async def limit_body_size(request: Request, call_next):
+    content_length = request.headers.get("content-length")
+    content_type = request.headers.get("content-type", "")
+    if content_length and not content_type.startswith("multipart/"):
+        try:
+            too_large = int(content_length) > MAX_JSON_BODY_BYTES
+        except ValueError:
+            return ORJSONResponse(status_code=400, content={"detail": "Invalid Content-Length header"})
+        if too_large:
+            return ORJSONResponse(
+                status_code=413,
+                content={"detail": f"Request body exceeds {MAX_JSON_BODY_BYTES} bytes"}
+            )
+    return await call_next(request)
+
+# CORS middleware for frontend. Origins come from CORS_ALLOW_ORIGINS (comma-separated);
+# CORS_ALLOW_ORIGIN_REGEX can additionally admit e.g. Vercel preview deployments.
+CORS_ALLOW_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", "https://linkedin-post-rho.vercel.app,http://localhost:3000").split(",")
+    if origin.strip()
+]
+CORS_ALLOW_ORIGIN_REGEX = os.getenv("CORS_ALLOW_ORIGIN_REGEX") or None
+
+# Platform probes and debug calls never come from a browser; skip CORS handling for them.
+CORS_BYPASS_PREFIXES = ("/health", "/debug/")
+
+
+class ProbeBypassCORSMiddleware(CORSMiddleware):
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(CORS_BYPASS_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Restrict in production
+    ProbeBypassCORSMiddleware,
+    allow_origins=CORS_ALLOW_ORIGINS,
+    allow_origin_regex=CORS_ALLOW_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
     expose_headers=["Content-Disposition"],
 )
 
-# Initialize services
-generator = None
-try:
-    generator = PostGenerator()
-except Exception as exc:
-    service_init_errors["generator"] = str(exc)
-    print(f"Warning: Could not initialize post generator: {exc}")
-
-checker = None
-try:
-    checker = VoiceChecker()
-except Exception as exc:
-    service_init_errors["checker"] = str(exc)
-    print(f"Warning: Could not initialize voice checker: {exc}")
-
-db = None
-try:
-    db = NeonDatabase()
-except Exception as exc:
-    service_init_errors["database"] = str(exc)
-    print(f"Warning: Could not initialize database: {exc}")
-
-tracker = None
-if db is not None:
-    try:
-        tracker = ContentTracker(db_client=db)
-    except Exception as exc:
-        service_init_errors["tracker"] = str(exc)
-        print(f"Warning: Could not initialize content tracker: {exc}")
-
-news_service = None
-try:
-    news_service = NewsService()
-except Exception as exc:
-    service_init_errors["news_service"] = str(exc)
-    print(f"Warning: Could not initialize news service: {exc}")
-
-# Initialize storage service if available
-storage_service = None
-supabase_client = getattr(db, 'supabase', None) if db is not None else None
-if MEDIA_ENABLED and StorageService and supabase_client is not None:
-    try:
-        storage_service = StorageService(supabase_client)
-    except Exception as e:
-        service_init_errors["storage_service"] = str(e)
-        print(f"Warning: Could not initialize storage service: {e}")
+def _warm_services() -> None:
+    for factory in (get_generator, get_checker, get_db, get_tracker, get_news_service, get_storage_service):
+        factory()
+    db = get_db()
+    if db is not None:
+        try:
+            db.ping()
+        except Exception as exc:
+            service_init_errors["database"] = str(exc)
+            print(f"Warning: Database ping failed: {exc}")
 
 
 def _load_seed_topics(channel: str) -> List[Dict[str, Any]]:
-    cfg = generator.config or {}
+    cfg = get_generator().config or {}
     topics_cfg = cfg.get("channel_topics", {})
     return topics_cfg.get(channel, [])
 
 
 def _ensure_topics_seeded(channel: str) -> None:
+    db = get_db()
     existing = db.get_channel_topics(channel=channel, limit=8)
     if existing:
         return
-    seeds = news_service.get_live_channel_topics(channel=channel, count=8)
+    seeds = get_news_service().get_live_channel_topics(channel=channel, count=8)
     if not seeds:
         seeds = _load_seed_topics(channel)
     if seeds:
@@ -458,7 +743,12 @@ def _ensure_topics_seeded(channel: str) -> None:
 # REQUEST/RESPONSE MODELS
 # ========================================
 
+# Request bodies are read-only inputs: unknown fields are dropped and instances are immutable.
+REQUEST_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
 class GeneratePostRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     channel: str = Field("personal_career", description="Content channel (personal_career, goalpraxis_company)")
     pillar: str = Field(..., description="Content pillar (asset_management, technology, etc.)")
     format_type: str = Field(..., description="Post format (insight, story, data, question, contrarian)")
@@ -473,14 +763,22 @@ class GeneratePostRequest(BaseModel):
     provider: str = Field("gemini", description="AI provider (gemini, gpt4)")
 
 class BatchGenerateRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     count: int = Field(10, ge=1, le=50, description="Number of posts to generate")
     pillar_distribution: Optional[Dict[str, float]] = Field(None, description="Custom pillar distribution")
     provider: Optional[str] = Field(None, description="Force specific provider (or randomize)")
+    use_batch_api: bool = Field(False, description="Submit as an OpenAI Batch API job and return a job_id")
+    background: bool = Field(False, description="Run as a background job and return a job_id to poll instead of the posts")
 
 class CheckVoiceRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     text: str = Field(..., description="Post text to check")
 
 class UpdatePostRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     text: str = Field(..., description="Updated post text")
     hashtags: Optional[List[str]] = Field(None, description="Updated hashtags")
     status: Optional[str] = Field(None, description="Updated post status")
@@ -495,9 +793,11 @@ class PostResponse(BaseModel):
     hashtags: List[str]  # List of hashtag strings
     voice_score: Optional[float] = None
     length: int
-    created_at: Optional[str] = None
+    created_at: Optional[datetime] = None
     status: str = "draft"
 
+_POSTS_ADAPTER = TypeAdapter(List[PostResponse])
+
 class VoiceCheckResponse(BaseModel):
     score: float
     grade: str
@@ -535,15 +835,104 @@ class TopicSuggestion(BaseModel):
 class TopicsResponse(BaseModel):
     channel: str
     topics: List[TopicSuggestion]
-    updated_at: str
+    updated_at: datetime
 
 
-def _serialize_created_at(value: Any) -> Optional[str]:
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return str(value)
+def _batch_row(post_id: str, post: Dict[str, Any], score: float) -> Dict[str, Any]:
+    return {
+        "id": post_id,
+        "pillar": post["pillar"],
+        "format": post["format"],
+        "topic": post.get("topic"),
+        "text": post["text"],
+        "hashtags": post["hashtags"],
+        "voice_score": score,
+        "length": len(post["text"]),
+        "status": "draft"
+    }
+
+
+def _batch_summary(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "pillar": row["pillar"],
+        "format": row["format"],
+        "voice_score": row["voice_score"],
+        "length": row["length"],
+        "status": row["status"]
+    }
+
+
+def _batch_uuid4(count: int) -> List[str]:
+    """Generate `count` random (version 4) UUID strings from a single os.urandom call."""
+    raw = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * count, 16)]
+
+
+_POST_ROW_FIELDS = itemgetter(
+    "id", "channel", "pillar", "format", "topic", "text",
+    "hashtags", "voice_score", "length", "created_at", "status",
+)
+
+
+def _post_response(post: Dict[str, Any]) -> PostResponse:
+    """Build a PostResponse from a full posts row (one tuple unpack instead of per-field .get())."""
+    (post_id, channel, pillar, fmt, topic, text,
+     hashtags, voice_score, length, created_at, status) = _POST_ROW_FIELDS(post)
+    # Rows come from our own table, so skip field validation; only NUMERIC -> float needs converting
+    return PostResponse.model_construct(
+        id=post_id,
+        channel=channel or 'personal_career',
+        pillar=pillar,
+        format=fmt,
+        topic=topic,
+        text=text,
+        hashtags=hashtags or [],
+        voice_score=float(voice_score) if voice_score is not None else None,
+        length=length,
+        created_at=created_at,
+        status=status or 'draft'
+    )
+
+# Short-lived cache for the read-heavy aggregate endpoints (/stats, /dashboard).
+# Stale entries are served immediately while a background task recomputes them;
+# any post write clears the cache so the next read sees fresh numbers.
+AGGREGATE_CACHE_TTL_SECONDS = 60
+_aggregate_cache: Dict[str, Dict[str, Any]] = {}
+# One lock per key so a burst of cold requests computes the aggregate once
+_aggregate_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _invalidate_aggregate_cache() -> None:
+    _aggregate_cache.clear()
+
+
+def _refresh_aggregate(key: str, compute: Callable[[], Dict[str, Any]]) -> None:
+    try:
+        _aggregate_cache[key] = {"value": compute(), "ts": time.monotonic()}
+    except Exception as exc:
+        print(f"Warning: Could not refresh cached {key}: {exc}")
+        entry = _aggregate_cache.get(key)
+        if entry is not None:
+            entry["refreshing"] = False
+
+
+async def _cached_aggregate(key: str, compute: Callable[[], Dict[str, Any]], background_tasks: BackgroundTasks) -> Dict[str, Any]:
+    entry = _aggregate_cache.get(key)
+    if entry is not None:
+        if time.monotonic() - entry["ts"] > AGGREGATE_CACHE_TTL_SECONDS and not entry.get("refreshing"):
+            entry["refreshing"] = True
+            background_tasks.add_task(_refresh_aggregate, key, compute)
+        return entry["value"]
+
+    lock = _aggregate_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        entry = _aggregate_cache.get(key)
+        if entry is not None:
+            return entry["value"]
+        value = await asyncio.to_thread(compute)
+        _aggregate_cache[key] = {"value": value, "ts": time.monotonic()}
+        return value
 
 # ========================================
 # ENDPOINTS
@@ -558,20 +947,6 @@ async def root():
         "version": "1.0.0"
     }
 
-@app.get("/health")
-async def health_check():
-    """Detailed health check"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "services": {
-            "post_generator": "ready",
-            "voice_checker": "ready",
-            "content_tracker": "ready",
-            "database": "ready"
-        }
-    }
-
 @app.post("/articles/extract")
 async def extract_article(file: Optional[UploadFile] = File(None), text: Optional[str] = Form(None)):
     """
@@ -636,8 +1011,108 @@ async def extract_article(file: Optional[UploadFile] = File(None), text: Optiona
     }
 
 
+async def _grounded_source_context(request: GeneratePostRequest) -> Dict[str, Any]:
+    """Resolve the article evidence for a generate request (raises 422 when full text is unavailable)"""
+    # Strict grounding policy:
+    # - We must have full article text (manual upload/paste OR successful URL fetch)
+    # - We do NOT generate from summary-only or key-findings-only evidence
+    key_findings = request.key_findings
+    article_text = (request.article_text or "").strip()
+
+    if not article_text:
+        if not request.source_url or not str(request.source_url).startswith("http"):
+            raise HTTPException(
+                status_code=422,
+                detail=(
+                    "No valid article URL was available for this topic. "
+                    "Please open the article and paste it into 'Paste article text directly' "
+                    "or upload the article file before generating."
+                )
+            )
+
+        key_findings, article_text, fetch_error = await fetch_findings_for_url(
+            request.source_url, request.source_name or request.source_title or "source"
+        )
+        if not article_text:
+            raise HTTPException(
+                status_code=422,
+                detail=(
+                    (fetch_error + " ") if fetch_error else ""
+                ) + (
+                    "To keep source accuracy, generation is blocked without full article text. "
+                    "Please paste the article into 'Paste article text directly' or upload it, then retry."
+                )
+            )
+    elif not key_findings:
+        # Manual upload/paste path: derive findings from provided article text
+        key_findings = _extract_stat_sentences(
+            article_text[:8000],
+            request.source_name or request.source_title or "uploaded article"
+        )
+
+    return {
+        "source_name": request.source_name,
+        "source_title": request.source_title,
+        "source_url": request.source_url,
+        "source_summary": request.source_summary,
+        "key_findings": key_findings,
+        "article_text": article_text,
+    }
+
+
+def _require_generation_services(generator, checker, db) -> None:
+    if not generator or not checker or not db:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "message": "Post generation is temporarily unavailable because core services did not initialize.",
+                "services": service_init_errors,
+            },
+        )
+
+
+async def _check_and_save_post(post: Dict[str, Any], channel: str, checker: VoiceChecker, db: NeonDatabase) -> PostResponse:
+    """Voice-check a generated post, save it as a draft and build the API response"""
+    score, _ = await asyncio.to_thread(checker.check_post, post["text"])
+    post_id = str(uuid.uuid4())
+    
+    await asyncio.to_thread(db.save_post, {
+        "id": post_id,
+        "channel": channel,
+        "pillar": post["pillar"],
+        "format": post["format"],
+        "topic": post.get("topic", ""),
+        "text": post["text"],
+        "hashtags": post["hashtags"],
+        "voice_score": float(score),
+        "length": int(len(post["text"])),
+        "status": "draft"
+    })
+    await asyncio.to_thread(db.touch_channel_last_post, channel)
+    _invalidate_aggregate_cache()
+    
+    return PostResponse(
+        id=post_id,
+        channel=post.get("channel", channel),
+        pillar=post["pillar"],
+        format=post["format"],
+        topic=post.get("topic", ""),
+        text=post["text"],
+        hashtags=post["hashtags"],
+        voice_score=score,
+        length=len(post["text"]),
+        created_at=datetime.now(),
+        status="draft"
+    )
+
+
 @app.post("/posts/generate", response_model=PostResponse)
-async def generate_post(request: GeneratePostRequest):
+async def generate_post(
+    request: GeneratePostRequest,
+    generator: Optional[PostGenerator] = Depends(get_generator),
+    checker: Optional[VoiceChecker] = Depends(get_checker),
+    db: Optional[NeonDatabase] = Depends(get_db)
+):
     """
     Generate a single LinkedIn post
     
@@ -647,164 +1122,260 @@ async def generate_post(request: GeneratePostRequest):
     - **provider**: AI provider (claude, gpt4, gemini)
     """
     try:
-        if not generator or not checker or not db:
-            raise HTTPException(
-                status_code=503,
-                detail={
-                    "message": "Post generation is temporarily unavailable because core services did not initialize.",
-                    "services": service_init_errors,
-                },
-            )
+        _require_generation_services(generator, checker, db)
+        source_context = await _grounded_source_context(request)
 
-        # Strict grounding policy:
-        # - We must have full article text (manual upload/paste OR successful URL fetch)
-        # - We do NOT generate from summary-only or key-findings-only evidence
-        key_findings = request.key_findings
-        article_text = (request.article_text or "").strip()
-
-        if not article_text:
-            if not request.source_url or not str(request.source_url).startswith("http"):
-                raise HTTPException(
-                    status_code=422,
-                    detail=(
-                        "No valid article URL was available for this topic. "
-                        "Please open the article and paste it into 'Paste article text directly' "
-                        "or upload the article file before generating."
-                    )
-                )
-
-            key_findings, article_text, fetch_error = await fetch_findings_for_url(
-                request.source_url, request.source_name or request.source_title or "source"
-            )
-            if not article_text:
-                raise HTTPException(
-                    status_code=422,
-                    detail=(
-                        (fetch_error + " ") if fetch_error else ""
-                    ) + (
-                        "To keep source accuracy, generation is blocked without full article text. "
-                        "Please paste the article into 'Paste article text directly' or upload it, then retry."
-                    )
-                )
-        elif not key_findings:
-            # Manual upload/paste path: derive findings from provided article text
-            key_findings = _extract_stat_sentences(
-                article_text[:8000],
-                request.source_name or request.source_title or "uploaded article"
-            )
-
-        # Generate post
-        post = generator.generate_post(
+        # Generate post (provider SDKs are sync; generate_post_async keeps them off the event loop)
+        post = await generator.generate_post_async(
             pillar=request.pillar,
             format_type=request.format_type,
             topic=request.topic,
             channel=request.channel,
             language=request.language or "english",
             provider=request.provider,
-            source_context={
-                "source_name": request.source_name,
-                "source_title": request.source_title,
-                "source_url": request.source_url,
-                "source_summary": request.source_summary,
-                "key_findings": key_findings,
-                "article_text": article_text,
-            }
+            source_context=source_context
         )
         
-        # Check voice
-        score, issues = checker.check_post(post["text"])
-        
-        # Save to database
-        post_id = str(uuid.uuid4())
-        
-        # Store hashtags as comma-separated text for DB portability.
-        hashtags_list = post["hashtags"] if isinstance(post["hashtags"], list) else post["hashtags"].split()
-        hashtags_str = ",".join(hashtags_list)
-        
-        db.save_post({
-            "id": post_id,
-            "channel": request.channel,
-            "pillar": post["pillar"],
-            "format": post["format"],
-            "topic": post.get("topic", ""),
-            "text": post["text"],
-            "hashtags": hashtags_str,
-            "voice_score": float(score),
-            "length": int(len(post["text"])),
-            "status": "draft"
-        })
-        db.touch_channel_last_post(request.channel)
-        
-        return PostResponse(
-            id=post_id,
-            channel=post.get("channel", request.channel),
-            pillar=post["pillar"],
-            format=post["format"],
-            topic=post.get("topic", ""),
-            text=post["text"],
-            hashtags=hashtags_list,
-            voice_score=score,
-            length=len(post["text"]),
-            created_at=datetime.now().isoformat(),
-            status="draft"
-        )
+        # Check voice, save and build the response
+        return await _check_and_save_post(post, request.channel, checker, db)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
+@app.post("/posts/generate/stream")
+async def generate_post_stream(
+    request: GeneratePostRequest,
+    generator: Optional[PostGenerator] = Depends(get_generator),
+    checker: Optional[VoiceChecker] = Depends(get_checker),
+    db: Optional[NeonDatabase] = Depends(get_db)
+):
+    """
+    Generate a single LinkedIn post as Server-Sent Events
+    
+    Emits `data:` events with JSON-encoded text chunks as the model writes, then one
+    `event: final` carrying the saved post (same shape as /posts/generate).
+    """
+    _require_generation_services(generator, checker, db)
+    source_context = await _grounded_source_context(request)
+    language = request.language or "english"
+    prompt = await asyncio.to_thread(
+        generator.build_prompt,
+        request.pillar, request.format_type, request.topic, request.channel, language, source_context
+    )
+
+    async def events():
+        chunks: List[str] = []
+        try:
+            async for chunk in iterate_in_threadpool(generator.stream_completion(request.provider, prompt)):
+                chunks.append(chunk)
+                yield f"data: {orjson.dumps(chunk).decode()}\n\n"
+            post = generator.post_from_text(
+                "".join(chunks),
+                pillar=request.pillar,
+                format_type=request.format_type,
+                topic=request.topic,
+                channel=request.channel,
+                provider=request.provider,
+                source_context=source_context
+            )
+            saved = await _check_and_save_post(post, request.channel, checker, db)
+            yield f"event: final\ndata: {saved.model_dump_json()}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {orjson.dumps({'detail': f'Generation failed: {str(e)}'}).decode()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _generate_batch_rows(
+    specs: List[Dict[str, Any]],
+    generator: PostGenerator,
+    checker: VoiceChecker,
+    db: NeonDatabase,
+    job_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Generate and voice-check every spec concurrently, then bulk-save the drafts"""
+    semaphore = asyncio.Semaphore(BATCH_GENERATION_CONCURRENCY)
+
+    async def _generate_one(spec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Generation + voice check for one post; failures are skipped like the sequential path did
+        async with semaphore:
+            try:
+                post = await generator.generate_post_async(**spec)
+                score, _ = await asyncio.to_thread(checker.check_post, post["text"])
+            except Exception as e:
+                print(f"✗ Error generating {spec['pillar']} post: {e}")
+                if job_id:
+                    await asyncio.to_thread(db.record_batch_progress, job_id, False)
+                return None
+            if job_id:
+                await asyncio.to_thread(db.record_batch_progress, job_id, True)
+            return {"post": post, "score": score}
+
+    generated = await asyncio.gather(*(_generate_one(spec) for spec in specs))
+    
+    generated = [item for item in generated if item is not None]
+    post_ids = _batch_uuid4(len(generated))
+    
+    rows = [
+        _batch_row(post_id, item["post"], item["score"])
+        for post_id, item in zip(post_ids, generated)
+    ]
+    
+    # Save to database in one round-trip
+    await asyncio.to_thread(db.bulk_save_posts, rows)
+    _invalidate_aggregate_cache()
+    return rows
+
+
+async def _run_batch_job(
+    job_id: str,
+    specs: List[Dict[str, Any]],
+    generator: PostGenerator,
+    checker: VoiceChecker,
+    db: NeonDatabase
+) -> None:
+    try:
+        rows = await _generate_batch_rows(specs, generator, checker, db, job_id=job_id)
+        await asyncio.to_thread(db.finish_batch_job, job_id, "completed", [row["id"] for row in rows])
+    except Exception as e:
+        print(f"Warning: Batch job {job_id} failed: {e}")
+        await asyncio.to_thread(db.finish_batch_job, job_id, "failed", None, str(e))
+
+
 @app.post("/posts/batch")
-async def batch_generate(request: BatchGenerateRequest, background_tasks: BackgroundTasks):
+async def batch_generate(
+    request: BatchGenerateRequest,
+    background_tasks: BackgroundTasks,
+    generator: Optional[PostGenerator] = Depends(get_generator),
+    checker: Optional[VoiceChecker] = Depends(get_checker),
+    db: Optional[NeonDatabase] = Depends(get_db),
+    batch_llm: Optional[BatchLLMService] = Depends(get_batch_llm_service)
+):
     """
     Generate multiple posts in batch
     
     - **count**: Number of posts to generate (1-50)
     - **pillar_distribution**: Optional custom distribution
     - **provider**: Optional forced provider
+    - **use_batch_api**: Submit an OpenAI Batch job instead; poll GET /posts/batch/{job_id}
+    - **background**: Return a job_id to poll on GET /posts/batch/{job_id} instead of waiting for the posts
     """
+    _require_generation_services(generator, checker, db)
     try:
-        posts = generator.batch_generate(
+        specs = generator.plan_batch(
             count=request.count,
-            pillar_distribution=request.pillar_distribution
+            pillar_distribution=request.pillar_distribution,
+            provider=request.provider
         )
-        
-        results = []
-        for post in posts:
-            # Check voice
-            score, _ = checker.check_post(post["text"])
-            
-            # Save to database
-            post_id = str(uuid.uuid4())
-            db.save_post({
-                "id": post_id,
-                "pillar": post["pillar"],
-                "format": post["format"],
-                "topic": post.get("topic"),
-                "text": post["text"],
-                "hashtags": post["hashtags"],
-                "voice_score": score,
-                "length": len(post["text"]),
-                "status": "draft"
-            })
-            
-            results.append({
-                "id": post_id,
-                "pillar": post["pillar"],
-                "format": post["format"],
-                "voice_score": score,
-                "length": len(post["text"]),
-                "status": "draft"
-            })
-        
+
+        if request.use_batch_api:
+            if batch_llm is None:
+                raise HTTPException(status_code=503, detail="Batch API not available (OPENAI_API_KEY not configured)")
+            # custom_id carries the spec so results can be rebuilt without server-side job state
+            prompts = {
+                f"{idx}:{spec['pillar']}:{spec['format_type']}": generator.build_prompt(spec["pillar"], spec["format_type"])
+                for idx, spec in enumerate(specs)
+            }
+            job_id = await asyncio.to_thread(batch_llm.submit_batch, prompts, {"source": "posts_batch"})
+            return {"job_id": job_id, "status": "submitted", "count": len(prompts)}
+
+        if request.background:
+            job_id = str(uuid.uuid4())
+            await asyncio.to_thread(db.create_batch_job, job_id, len(specs))
+            background_tasks.add_task(_run_batch_job, job_id, specs, generator, checker, db)
+            return {"job_id": job_id, "status": "queued", "count": len(specs)}
+
+        rows = await _generate_batch_rows(specs, generator, checker, db)
         return {
-            "generated": len(results),
-            "posts": results
+            "generated": len(rows),
+            "posts": [_batch_summary(row) for row in rows]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch generation failed: {str(e)}")
 
+
+def _batch_results_to_rows(
+    job_id: str,
+    results: Dict[str, str],
+    generator: PostGenerator,
+    checker: VoiceChecker
+) -> List[Dict[str, Any]]:
+    rows = []
+    for custom_id, text in results.items():
+        _, pillar, format_type = custom_id.split(":", 2)
+        post = generator.post_from_text(text, pillar, format_type, provider="gpt4")
+        score, _ = checker.check_post(post["text"])
+        # Deterministic IDs make repeated polls (or several workers) upsert the same rows
+        post_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"openai-batch:{job_id}:{custom_id}"))
+        rows.append(_batch_row(post_id, post, score))
+    return rows
+
+
+@app.get("/posts/batch/{job_id}")
+async def get_batch_job(
+    job_id: str,
+    generator: Optional[PostGenerator] = Depends(get_generator),
+    checker: Optional[VoiceChecker] = Depends(get_checker),
+    db: Optional[NeonDatabase] = Depends(get_db),
+    batch_llm: Optional[BatchLLMService] = Depends(get_batch_llm_service)
+):
+    """
+    Poll a batch job
+    
+    Background jobs report {status, total, completed, failed, post_ids}. OpenAI Batch API
+    jobs (IDs starting with "batch_") are saved as drafts once the provider completes them;
+    the batch_jobs table records that, so every worker (and restart) sees it.
+    """
+    _require_generation_services(generator, checker, db)
+    if not job_id.startswith("batch_"):
+        job = await asyncio.to_thread(db.get_batch_job, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Batch job not found")
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "total": job["total"],
+            "completed": job["completed"],
+            "failed": job["failed"],
+            "post_ids": job.get("post_ids") or [],
+            "error": job.get("error")
+        }
+
+    if batch_llm is None:
+        raise HTTPException(status_code=503, detail="Batch API not available (OPENAI_API_KEY not configured)")
+    try:
+        job = await asyncio.to_thread(batch_llm.get_batch, job_id)
+        if job["status"] != "completed" or not job["output_file_id"]:
+            return job
+        
+        saved = await asyncio.to_thread(db.get_batch_job, job_id)
+        if saved and saved["status"] == "completed":
+            rows = await asyncio.to_thread(db.get_posts_by_ids, saved.get("post_ids") or [])
+        else:
+            results = await asyncio.to_thread(batch_llm.get_results, job["output_file_id"])
+            rows = await asyncio.to_thread(_batch_results_to_rows, job_id, results, generator, checker)
+            # Deterministic post IDs make a concurrent save by another worker an upsert
+            await asyncio.to_thread(db.bulk_save_posts, rows)
+            await asyncio.to_thread(db.create_batch_job, job_id, len(rows))
+            await asyncio.to_thread(db.finish_batch_job, job_id, "completed", [row["id"] for row in rows])
+            _invalidate_aggregate_cache()
+        
+        results = [_batch_summary(row) for row in rows]
+        return {**job, "generated": len(results), "posts": results}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get batch job: {str(e)}")
+
 @app.post("/posts/check-voice", response_model=VoiceCheckResponse)
-async def check_voice(request: CheckVoiceRequest):
+async def check_voice(request: CheckVoiceRequest, checker: Optional[VoiceChecker] = Depends(get_checker)):
     """
     Check voice authenticity of post text
     
@@ -824,7 +1395,8 @@ async def list_posts(
     status: Optional[str] = None,
     channel: Optional[str] = None,
     pillar: Optional[str] = None,
-    min_score: Optional[float] = None
+    min_score: Optional[float] = None,
+    db: Optional[NeonDatabase] = Depends(get_db)
 ):
     """
     List all posts with optional filters
@@ -835,40 +1407,25 @@ async def list_posts(
     - **min_score**: Filter by minimum voice score
     """
     try:
-        posts = db.get_posts(limit=limit, status=status, channel=channel)
-        
-        results = []
-        for post in posts:
-            # Apply filters
-            if pillar and post.get('pillar') != pillar:
-                continue
-            if min_score and (post.get('voice_score') is None or post.get('voice_score') < min_score):
-                continue
-            
-            # Parse hashtags
-            hashtags = post.get('hashtags', '').split(',') if post.get('hashtags') else []
-            
-            results.append(PostResponse(
-                id=post.get('id'),
-                channel=post.get('channel', 'personal_career'),
-                pillar=post.get('pillar'),
-                format=post.get('format'),
-                topic=post.get('topic'),
-                text=post.get('text'),
-                hashtags=hashtags,
-                voice_score=post.get('voice_score'),
-                length=post.get('length'),
-                created_at=_serialize_created_at(post.get('created_at')),
-                status=post.get('status', 'draft')
-            ))
-        
-        return results
+        posts = db.get_posts(
+            limit=limit,
+            status=status,
+            channel=channel,
+            pillar=pillar,
+            min_voice_score=min_score
+        )
+        # Serialize the whole list in one pydantic-core call; returning a Response skips
+        # FastAPI's per-item response_model re-validation (response_model still drives the docs).
+        return Response(
+            content=_POSTS_ADAPTER.dump_json([_post_response(post) for post in posts]),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list posts: {str(e)}")
 
 @app.get("/posts/{post_id}", response_model=PostResponse)
-async def get_post(post_id: str):
+async def get_post(post_id: str, db: Optional[NeonDatabase] = Depends(get_db)):
     """Get specific post by ID"""
     try:
         post = db.get_post(post_id)
@@ -876,21 +1433,7 @@ async def get_post(post_id: str):
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
         
-        hashtags = post.get('hashtags', '').split(',') if post.get('hashtags') else []
-        
-        return PostResponse(
-            id=post.get('id'),
-            channel=post.get('channel', 'personal_career'),
-            pillar=post.get('pillar'),
-            format=post.get('format'),
-            topic=post.get('topic'),
-            text=post.get('text'),
-            hashtags=hashtags,
-            voice_score=post.get('voice_score'),
-            length=post.get('length'),
-            created_at=_serialize_created_at(post.get('created_at')),
-            status=post.get('status', 'draft')
-        )
+        return _post_response(post)
         
     except HTTPException:
         raise
@@ -898,18 +1441,18 @@ async def get_post(post_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to get post: {str(e)}")
 
 @app.put("/posts/{post_id}", response_model=PostResponse)
-async def update_post(post_id: str, request: UpdatePostRequest):
+async def update_post(
+    post_id: str,
+    request: UpdatePostRequest,
+    checker: Optional[VoiceChecker] = Depends(get_checker),
+    db: Optional[NeonDatabase] = Depends(get_db)
+):
     """Update post text and/or hashtags"""
     try:
-        # Get existing post
-        post = db.get_post(post_id)
-        if not post:
-            raise HTTPException(status_code=404, detail="Post not found")
-        
         # Check new voice score
         score, _ = checker.check_post(request.text)
         
-        # Update post
+        # Update post; the DB returns the updated row, so no pre-read is needed
         update_data = {
             "text": request.text,
             "voice_score": score,
@@ -917,27 +1460,16 @@ async def update_post(post_id: str, request: UpdatePostRequest):
         }
         
         if request.hashtags:
-            update_data["hashtags"] = ",".join(request.hashtags)
+            update_data["hashtags"] = request.hashtags
         if request.status:
             update_data["status"] = request.status
         
-        db.update_post(post_id, **update_data)
-        
-        hashtags = request.hashtags or post.get('hashtags', '').split(',')
+        post = db.update_post(post_id, **update_data)
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        _invalidate_aggregate_cache()
         
-        return PostResponse(
-            id=post_id,
-            channel=post.get('channel', 'personal_career'),
-            pillar=post.get('pillar'),
-            format=post.get('format'),
-            topic=post.get('topic'),
-            text=request.text,
-            hashtags=hashtags,
-            voice_score=score,
-            length=len(request.text),
-            created_at=_serialize_created_at(post.get('created_at')),
-            status=request.status or post.get('status', 'draft')
-        )
+        return _post_response(post)
         
     except HTTPException:
         raise
@@ -945,24 +1477,28 @@ async def update_post(post_id: str, request: UpdatePostRequest):
         raise HTTPException(status_code=500, detail=f"Failed to update post: {str(e)}")
 
 @app.delete("/posts/{post_id}")
-async def delete_post(post_id: str):
+async def delete_post(post_id: str, db: Optional[NeonDatabase] = Depends(get_db)):
     """Delete post by ID"""
     try:
         db.delete_post(post_id)
+        _invalidate_aggregate_cache()
         return {"message": f"Post {post_id} deleted successfully"}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete post: {str(e)}")
 
 @app.get("/dashboard", response_model=DashboardResponse)
-async def get_dashboard():
+async def get_dashboard(
+    background_tasks: BackgroundTasks,
+    tracker: Optional[ContentTracker] = Depends(get_tracker)
+):
     """
     Get content health dashboard
     
     Returns overall health score, pillar balance, posting cadence, and recommendations
     """
     try:
-        dashboard = tracker.get_dashboard()
+        dashboard = await _cached_aggregate("dashboard", tracker.get_dashboard, background_tasks)
         
         return DashboardResponse(**dashboard)
         
@@ -970,46 +1506,51 @@ async def get_dashboard():
         raise HTTPException(status_code=500, detail=f"Failed to get dashboard: {str(e)}")
 
 @app.get("/recommendations/next-pillar")
-async def get_next_pillar():
+async def get_next_pillar(tracker: Optional[ContentTracker] = Depends(get_tracker)):
     """Get recommended pillar for next post"""
     try:
         next_pillar = tracker.get_next_pillar_needed()
         
         return {
             "recommended_pillar": next_pillar,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": CURRENT_ISO
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get recommendation: {str(e)}")
 
+def _compute_stats() -> Dict[str, Any]:
+    tracker = get_tracker()
+    db = get_db()
+    # Reuse the dashboard computed by /dashboard when it is still cached
+    cached_dashboard = _aggregate_cache.get("dashboard")
+    if cached_dashboard is not None:
+        dashboard = cached_dashboard["value"]
+    else:
+        dashboard = tracker.get_dashboard()
+        _aggregate_cache["dashboard"] = {"value": dashboard, "ts": time.monotonic()}
+    aggregates = db.get_post_aggregates()
+    
+    return {
+        "total_posts": aggregates["total"],
+        "published": aggregates["published"],
+        "drafts": aggregates["drafts"],
+        "avg_voice_score": round(aggregates["avg_voice_score"], 1),
+        "health": {
+            "score": dashboard["overall_health"],
+            "grade": dashboard["health_grade"]
+        },
+        "posting": {
+            "posts_per_week": dashboard["posting_cadence"]["posts_per_week"],
+            "consistency": dashboard["posting_cadence"]["consistency"]
+        }
+    }
+
 @app.get("/stats")
-async def get_stats():
+async def get_stats(background_tasks: BackgroundTasks):
     """Get overall statistics"""
     try:
-        dashboard = tracker.get_dashboard()
-        posts = db.get_posts(limit=1000)
-        
-        # Calculate stats
-        total_posts = len(posts)
-        avg_score = sum(p.get('voice_score', 0) for p in posts if p.get('voice_score')) / total_posts if total_posts > 0 else 0
-        published = sum(1 for p in posts if p.get('status') == "published")
-        drafts = sum(1 for p in posts if p.get('status') == "draft")
-        
-        return {
-            "total_posts": total_posts,
-            "published": published,
-            "drafts": drafts,
-            "avg_voice_score": round(avg_score, 1),
-            "health": {
-                "score": dashboard["overall_health"],
-                "grade": dashboard["health_grade"]
-            },
-            "posting": {
-                "posts_per_week": dashboard["posting_cadence"]["posts_per_week"],
-                "consistency": dashboard["posting_cadence"]["consistency"]
-            }
-        }
+        return await _cached_aggregate("stats", _compute_stats, background_tasks)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
@@ -1020,7 +1561,9 @@ async def get_stats():
 # ============================================
 
 class CodeImageRequest(BaseModel):
-    code: str
+    model_config = REQUEST_MODEL_CONFIG
+
+    code: str = Field(..., max_length=16_384)
     language: str = "python"
     theme: str = "monokai"
     title: Optional[str] = None
@@ -1028,14 +1571,20 @@ class CodeImageRequest(BaseModel):
     save_to_storage: bool = True
 
 class ChartRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     chart_type: str  # bar, line, pie, scatter, area, funnel
     data: Dict
     title: str
     theme: str = "plotly_dark"
+    # False returns the Plotly figure JSON for client-side rendering instead of a PNG
+    render_png: bool = True
     post_id: Optional[str] = None
     save_to_storage: bool = True
 
 class InfographicRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     title: str
     stats: List[Dict[str, str]]
     brand_color: str = "#4a9eff"
@@ -1043,13 +1592,17 @@ class InfographicRequest(BaseModel):
     save_to_storage: bool = True
 
 class QRCodeRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     url: str
     logo_path: Optional[str] = None
     post_id: Optional[str] = None
     save_to_storage: bool = True
 
 class CarouselRequest(BaseModel):
-    slides: List[Dict[str, str]]
+    model_config = REQUEST_MODEL_CONFIG
+
+    slides: List[Dict[str, str]] = Field(..., max_length=30)
     title: str
     style: str = "professional"  # professional, relaxed, corporate, creative, minimal
     content_pillar: Optional[str] = None
@@ -1057,209 +1610,502 @@ class CarouselRequest(BaseModel):
     save_to_storage: bool = True
 
 class AIImageRequest(BaseModel):
-    prompt: str
+    model_config = REQUEST_MODEL_CONFIG
+
+    prompt: str = Field(..., max_length=4000)
     style: str = "professional"
     post_id: Optional[str] = None
     save_to_storage: bool = True
 
 class InteractiveRequest(BaseModel):
-    prompt: str
+    model_config = REQUEST_MODEL_CONFIG
+
+    prompt: str = Field(..., max_length=4000)
     title: str
     post_id: Optional[str] = None
     save_to_storage: bool = True
 
+class PresignRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
+    # Both end up in the object key ({post_id}/{media_type}_...), so no separators or dots
+    post_id: str = Field(..., pattern=r"^[A-Za-z0-9_-]{1,64}$")
+    media_type: str = Field(..., pattern=r"^[A-Za-z0-9_-]{1,64}$",
+                            description="Media kind used in the object name (chart, image, ...)")
+    extension: str = Field("png", pattern=r"^[A-Za-z0-9]{1,8}$")
+
 
 # ============================================
 # MEDIA GENERATION ENDPOINTS
 # ============================================
 
-@app.post("/media/generate-interactive")
-async def generate_interactive(request: InteractiveRequest):
-    """Generate interactive HTML demo"""
-    if not MEDIA_ENABLED:
-        raise HTTPException(status_code=501, detail="Media generation not available")
+# CPU-bound renderers (PIL, Pygments, Plotly, qrcode) run in worker processes so
+# they do not block the event loop or contend for the GIL. Each worker is a full
+# interpreter with the media stack loaded, and os.cpu_count() reports the host's CPUs
+# inside containers, so the pool stays small unless MEDIA_WORKERS raises it.
+MEDIA_WORKERS = max(1, int(os.getenv("MEDIA_WORKERS", str(min(2, os.cpu_count() or 1)))))
+media_executor: Optional[ProcessPoolExecutor] = None
+
+# Chunk size used when streaming large binary assets (carousel PDFs) to the client.
+STREAM_CHUNK_SIZE = 64 * 1024
+# Carousel PDFs are rendered into a spooled temp file: kept in memory up to this size,
+# rolled over to disk beyond it, then streamed from there.
+CAROUSEL_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Anything that is not a word character or '-' is dropped from download filenames
+# (one pass strips '&', whitespace and header-unsafe characters like quotes).
+_FILENAME_UNSAFE = re.compile(r'[^\w-]', re.ASCII)
+
+
+def start_media_executor() -> None:
+    global media_executor
+    if MEDIA_ENABLED:
+        # Each worker does throwaway renders on spawn, paying library cold-start once
+        media_executor = ProcessPoolExecutor(max_workers=MEDIA_WORKERS, initializer=media_generator.warm_up)
+
+
+async def warm_media_workers() -> None:
+    """Spawn every pool worker at startup instead of on the first real render."""
+    if media_executor is None:
+        return
+    loop = asyncio.get_running_loop()
     try:
-        html_bytes = await media_generator.generate_interactive_html(
-            prompt=request.prompt,
-            title=request.title
-        )
-        
-        url = None
-        if request.save_to_storage and storage_service and request.post_id:
-            try:
-                url = storage_service.upload_media(
-                    html_bytes,
-                    request.post_id,
-                    "interactive",
-                    "html"
-                )
-            except Exception as e:
-                print(f"Storage upload failed: {e}")
-        
-        if not url:
-            url = to_data_uri(html_bytes, "text/html")
+        await asyncio.gather(*(loop.run_in_executor(media_executor, os.getpid) for _ in range(MEDIA_WORKERS)))
+    except Exception as exc:
+        logger.warning("Media worker warm-up failed: %s", exc)
 
-        return {"success": True, "url": url, "type": "interactive"}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating interactive demo: {str(e)}")
 
-@app.post("/media/generate-code-image")
-async def generate_code_image(request: CodeImageRequest):
-    """Generate beautiful code snippet image"""
-    if not MEDIA_ENABLED:
-        raise HTTPException(status_code=501, detail="Media generation not available")
+def stop_media_executor() -> None:
+    if media_executor is not None:
+        media_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_file_chunks(f: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a rendered file in fixed-size chunks, closing it once fully sent."""
     try:
-        img_bytes = media_generator.generate_code_image(
-            code=request.code,
-            language=request.language,
-            theme=request.theme,
-            title=request.title
-        )
-        
-        url = None
-        if request.save_to_storage and storage_service and request.post_id:
-            try:
-                url = storage_service.upload_media(
-                    img_bytes,
-                    request.post_id,
-                    "code",
-                    "png"
-                )
-            except Exception as e:
-                print(f"Storage upload failed: {e}")
-        
-        if not url:
-            url = to_data_uri(img_bytes, "image/png")
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
 
-        return {"success": True, "url": url, "type": "code"}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating code image: {str(e)}")
 
+async def _render_media(func: Callable[..., bytes], **kwargs) -> bytes:
+    """Run a synchronous media_generator method in the process pool."""
+    return await asyncio.get_running_loop().run_in_executor(media_executor, partial(func, **kwargs))
 
-@app.post("/media/generate-chart")
-async def generate_chart(request: ChartRequest):
-    """Generate interactive-style chart"""
-    if not MEDIA_ENABLED:
-        raise HTTPException(status_code=501, detail="Media generation not available")
+
+def _file_mtime(path: Optional[str]) -> Optional[float]:
+    """Modification time for cache keys over file inputs (None when missing)"""
+    if not path:
+        return None
     try:
-        img_bytes = media_generator.generate_chart(
-            chart_type=request.chart_type,
-            data=request.data,
-            title=request.title,
-            theme=request.theme
-        )
-        
-        url = None
-        if request.save_to_storage and storage_service and request.post_id:
-            try:
-                url = storage_service.upload_media(
-                    img_bytes,
-                    request.post_id,
-                    "chart",
-                    "png"
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+# Cache key -> render task, so concurrent identical requests share a single render
+_media_in_flight: Dict[str, "asyncio.Task[bytes]"] = {}
+
+
+async def _render_and_cache(key: str, ext: str, func: Callable[..., bytes], kwargs: Dict[str, Any]) -> bytes:
+    data = await _render_media(func, **kwargs)
+    await asyncio.to_thread(media_cache.set, key, ext, data)
+    return data
+
+
+async def _render_media_cached(kind: str, func: Callable[..., bytes], ext: str = "png",
+                               key_extra: Optional[Dict[str, Any]] = None, **kwargs) -> bytes:
+    """
+    _render_media for deterministic renderers: identical inputs are served from media_cache.
+    key_extra holds inputs that affect the render but are not arguments (e.g. a file's mtime).
+    """
+    key = media_cache.make_key(kind, **kwargs, **(key_extra or {}))
+    data = media_cache.get_memory(key)
+    if data is None:
+        data = await asyncio.to_thread(media_cache.get_disk, key, ext)
+    if data is not None:
+        return data
+
+    task = _media_in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_render_and_cache(key, ext, func, kwargs))
+        _media_in_flight[key] = task
+        task.add_done_callback(lambda _: _media_in_flight.pop(key, None))
+    # Shielded: a disconnecting caller must not cancel the render other callers await
+    return await asyncio.shield(task)
+
+
+# Admission control for media endpoints: each kind holds at most N renders in
+# flight, so peak memory is bounded by limit * asset size instead of request rate.
+# Created at import time, which relies on Python 3.10+ asyncio primitives binding to
+# the running loop on first use (hence requires-python >= 3.10).
+MEDIA_SEMAPHORES: Dict[str, asyncio.Semaphore] = {
+    "carousel": asyncio.Semaphore(2),
+    "ai_image": asyncio.Semaphore(2),
+    "chart": asyncio.Semaphore(4),
+    "infographic": asyncio.Semaphore(4),
+    "code_image": asyncio.Semaphore(4),
+    "interactive": asyncio.Semaphore(8),
+    "qrcode": asyncio.Semaphore(8),
+}
+
+
+def media_slot(kind: str) -> Callable:
+    """Route dependency that holds a MEDIA_SEMAPHORES slot for the duration of the request."""
+    async def _acquire():
+        async with MEDIA_SEMAPHORES[kind]:
+            yield
+    return _acquire
+
+
+# Carousel storage uploads run on a bounded queue drained by UPLOAD_WORKERS tasks, so the
+# PDF download starts as soon as it is rendered instead of waiting on the storage round-trip.
+# JSON media endpoints return the storage URL itself, so they upload inline (see _media_urls).
+UPLOAD_QUEUE_MAXSIZE = 256
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "4"))
+UPLOAD_MAX_ATTEMPTS = 3
+FAILED_UPLOADS_MAX_POSTS = 256
+upload_queue: Optional[asyncio.Queue] = None
+_upload_worker_tasks: List[asyncio.Task] = []
+# post_id -> object paths queued or uploading, reported by /media/list/{post_id}
+pending_uploads: Dict[str, Dict[str, str]] = {}
+# post_id -> object paths whose queued upload gave up, also reported by /media/list/{post_id}
+failed_uploads: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+# Recent render and upload durations (seconds), for sizing the upload pipeline
+_pipeline_timings: Dict[str, "deque[float]"] = {"render": deque(maxlen=200), "upload": deque(maxlen=200)}
+
+
+async def _upload_with_retries(storage_service: "StorageService", data: bytes, post_id: str, media_type: str,
+                               extension: str, file_path: str) -> str:
+    """Upload to storage, retrying with backoff; raises the last error after UPLOAD_MAX_ATTEMPTS."""
+    for attempt in range(UPLOAD_MAX_ATTEMPTS):
+        try:
+            started = time.perf_counter()
+            url = await asyncio.to_thread(
+                storage_service.upload_media, data, post_id, media_type, extension, file_path
+            )
+            _pipeline_timings["upload"].append(time.perf_counter() - started)
+            return url
+        except Exception:
+            if attempt == UPLOAD_MAX_ATTEMPTS - 1:
+                logger.warning(
+                    "Storage upload failed after %d attempts (post_id=%s, path=%s)",
+                    UPLOAD_MAX_ATTEMPTS, post_id, file_path,
+                    extra={"post_id": post_id, "media_type": media_type}, exc_info=True
                 )
-            except Exception as e:
-                print(f"Storage upload failed: {e}")
-        
-        if not url:
-            url = to_data_uri(img_bytes, "image/png")
+                raise
+            await asyncio.sleep(2 ** attempt)
 
-        return {"success": True, "url": url, "type": "chart"}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating chart: {str(e)}")
 
+def _record_failed_upload(post_id: str, file_path: str, media_type: str) -> None:
+    failed_uploads.setdefault(post_id, {})[file_path] = media_type
+    failed_uploads.move_to_end(post_id)
+    while len(failed_uploads) > FAILED_UPLOADS_MAX_POSTS:
+        failed_uploads.popitem(last=False)
 
-@app.post("/media/generate-infographic")
-async def generate_infographic(request: InfographicRequest):
-    """Generate infographic with statistics"""
-    if not MEDIA_ENABLED:
-        raise HTTPException(status_code=501, detail="Media generation not available")
-    try:
-        img_bytes = media_generator.generate_infographic(
-            title=request.title,
-            stats=request.stats,
-            brand_color=request.brand_color
+
+async def _upload_worker() -> None:
+    while True:
+        storage_service, data, post_id, media_type, extension, file_path = await upload_queue.get()
+        try:
+            await _upload_with_retries(storage_service, data, post_id, media_type, extension, file_path)
+            paths = failed_uploads.get(post_id)
+            if paths is not None:
+                paths.pop(file_path, None)
+        except Exception:
+            _record_failed_upload(post_id, file_path, media_type)
+        finally:
+            paths = pending_uploads.get(post_id)
+            if paths is not None:
+                paths.pop(file_path, None)
+                if not paths:
+                    del pending_uploads[post_id]
+            upload_queue.task_done()
+
+
+def start_upload_workers() -> None:
+    global upload_queue
+    upload_queue = asyncio.Queue(maxsize=UPLOAD_QUEUE_MAXSIZE)
+    _upload_worker_tasks[:] = [asyncio.create_task(_upload_worker()) for _ in range(UPLOAD_WORKERS)]
+
+
+async def stop_upload_workers(timeout: float = 10.0) -> None:
+    """Give queued uploads a short grace period, then cancel the workers."""
+    if upload_queue is not None:
+        try:
+            await asyncio.wait_for(upload_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%d storage uploads dropped at shutdown", upload_queue.qsize())
+    for task in _upload_worker_tasks:
+        task.cancel()
+    _upload_worker_tasks.clear()
+
+
+async def _queue_media_upload(storage_service: "StorageService", data: bytes, post_id: str, media_type: str,
+                              extension: str) -> None:
+    """Queue a storage upload; its progress and failures show up in /media/list/{post_id}."""
+    file_path = storage_service.media_path(post_id, media_type, extension)
+    pending_uploads.setdefault(post_id, {})[file_path] = media_type
+    await upload_queue.put((storage_service, data, post_id, media_type, extension, file_path))
+
+
+# Generated assets that are not saved to storage are kept here briefly and served from
+# /media/tmp/{token}, instead of being inlined as base64 data URIs. The store is per process,
+# so these links are short-lived previews: anything that must outlive the response (or be
+# fetched through another worker) should be saved to storage, whose URL is returned instead.
+TEMP_MEDIA_TTL_SECONDS = 300
+TEMP_MEDIA_MAX_BYTES = int(os.getenv("TEMP_MEDIA_MAX_BYTES", str(64 * 1024 * 1024)))
+_temp_media: "OrderedDict[str, Tuple[float, bytes, str]]" = OrderedDict()
+_temp_media_bytes = 0
+
+
+def _store_temp_media(data: bytes, mime_type: str) -> str:
+    global _temp_media_bytes
+    now = time.monotonic()
+    token = hashlib.blake2b(data, digest_size=16).hexdigest()
+    previous = _temp_media.pop(token, None)
+    if previous is not None:
+        _temp_media_bytes -= len(previous[1])
+    while _temp_media:
+        oldest_token, (stored_at, oldest_data, _) = next(iter(_temp_media.items()))
+        if (_temp_media_bytes + len(data) <= TEMP_MEDIA_MAX_BYTES
+                and now - stored_at <= TEMP_MEDIA_TTL_SECONDS):
+            break
+        del _temp_media[oldest_token]
+        _temp_media_bytes -= len(oldest_data)
+    _temp_media[token] = (now, data, mime_type)
+    _temp_media_bytes += len(data)
+    return token
+
+
+# ?inline=true data URIs are limited to thumbnail-sized assets; anything larger is served
+# as raw bytes from /media/tmp/{token} rather than base64-inflated into the JSON body.
+INLINE_MEDIA_MAX_BYTES = int(os.getenv("INLINE_MEDIA_MAX_BYTES", str(256 * 1024)))
+# Below this size encoding inline is cheaper than a thread hop.
+INLINE_ENCODE_THREAD_THRESHOLD = 32 * 1024
+
+
+async def _media_urls(http_request: Request, request: BaseModel, storage_service: Optional["StorageService"],
+                      data: bytes, mime_type: str, media_type: str, extension: str,
+                      inline: bool = False) -> Tuple[str, Optional[str]]:
+    """
+    Return (url, storage_url) for a rendered asset.
+
+    When the request saves to storage, url is the durable storage URL. Otherwise it is a
+    data URI (when requested and small) or a short-lived /media/tmp link.
+    """
+    if request.save_to_storage and storage_service and request.post_id:
+        # Uploaded before responding, so the returned URL always resolves
+        file_path = storage_service.media_path(request.post_id, media_type, extension)
+        storage_url = await _upload_with_retries(
+            storage_service, data, request.post_id, media_type, extension, file_path
         )
-        
-        url = None
-        if request.save_to_storage and storage_service and request.post_id:
-            try:
-                url = storage_service.upload_media(
-                    img_bytes,
-                    request.post_id,
-                    "infographic",
-                    "png"
-                )
-            except Exception as e:
-                print(f"Storage upload failed: {e}")
-        
-        if not url:
-            url = to_data_uri(img_bytes, "image/png")
+        return storage_url, storage_url
 
-        return {"success": True, "url": url, "type": "infographic"}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating infographic: {str(e)}")
+    if inline and len(data) <= INLINE_MEDIA_MAX_BYTES:
+        if len(data) > INLINE_ENCODE_THREAD_THRESHOLD:
+            url = await asyncio.to_thread(to_data_uri, data, mime_type)
+        else:
+            url = to_data_uri(data, mime_type)
+    else:
+        token = _store_temp_media(data, mime_type)
+        url = str(http_request.url_for("get_temp_media", token=token))
+    return url, None
 
 
-@app.post("/media/generate-qrcode")
-async def generate_qrcode(request: QRCodeRequest):
-    """Generate QR code"""
-    if not MEDIA_ENABLED:
-        raise HTTPException(status_code=501, detail="Media generation not available")
+# Tokens are content hashes, so the bytes behind one never change, but the entry itself
+# only lives for TEMP_MEDIA_TTL_SECONDS in this process: don't let clients cache it longer.
+TEMP_MEDIA_CACHE_CONTROL = f"private, max-age={TEMP_MEDIA_TTL_SECONDS}"
+
+
+@app.get("/media/tmp/{token}")
+async def get_temp_media(token: str, http_request: Request):
+    """Serve a recently generated asset that was not saved to storage"""
+    etag = f'"{token}"'
+    cache_headers = {"ETag": etag, "Cache-Control": TEMP_MEDIA_CACHE_CONTROL}
+    # The token is the content hash, so a matching validator needs no lookup at all
+    if etag in (tag.strip() for tag in http_request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=cache_headers)
+
+    entry = _temp_media.get(token)
+    if entry is None or time.monotonic() - entry[0] > TEMP_MEDIA_TTL_SECONDS:
+        raise HTTPException(status_code=404, detail="Media not found or expired")
+    _, data, mime_type = entry
+    return Response(content=data, media_type=mime_type, headers=cache_headers)
+
+
+def json_body(model: Type[BaseModel]) -> Callable:
+    """
+    Body dependency that validates the raw JSON bytes in one pydantic-core pass
+    (model_validate_json) instead of json.loads into a dict and validating that.
+    """
+    async def _parse(request: Request) -> BaseModel:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+    return _parse
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting a json_body() request body"""
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": model.model_json_schema()}}}}
+
+
+# The generate-* routes live on their own router, included only when the media services
+# imported, so a disabled deployment never runs (or branches inside) these handlers.
+media_router = APIRouter(prefix="/media")
+
+
+async def _handle_media(render: Awaitable[bytes], *, kind: str, extension: str, mime_type: str, label: str,
+                        request: BaseModel, http_request: Request,
+                        storage_service: Optional["StorageService"], inline: bool) -> Dict[str, Any]:
+    """Shared body of the JSON media endpoints: render, resolve URLs (uploading when saving), respond."""
+    try:
+        started = time.perf_counter()
+        data = await render
+        _pipeline_timings["render"].append(time.perf_counter() - started)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating {label}: {str(e)}")
     try:
-        img_bytes = media_generator.generate_qr_code(
-            url=request.url,
-            logo_path=request.logo_path
+        url, storage_url = await _media_urls(
+            http_request, request, storage_service, data, mime_type, kind, extension, inline
         )
-        
-        url = None
-        if request.save_to_storage and storage_service and request.post_id:
-            try:
-                url = storage_service.upload_media(
-                    img_bytes,
-                    request.post_id,
-                    "qrcode",
-                    "png"
-                )
-            except Exception as e:
-                print(f"Storage upload failed: {e}")
-        
-        if not url:
-            url = to_data_uri(img_bytes, "image/png")
-
-        return {"success": True, "url": url, "type": "qrcode"}
-        
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating QR code: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"Error saving {label} to storage: {str(e)}")
+    return {"success": True, "url": url, "storage_url": storage_url, "type": kind}
 
 
-@app.post("/media/generate-carousel")
-async def generate_carousel(request: CarouselRequest):
+@media_router.post("/generate-interactive", dependencies=[Depends(media_slot("interactive"))], openapi_extra=json_body_openapi(InteractiveRequest))
+async def generate_interactive(
+    http_request: Request,
+    request: InteractiveRequest = Depends(json_body(InteractiveRequest)),
+    inline: bool = False,
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
+    """Generate interactive HTML demo"""
+    return await _handle_media(
+        media_generator.generate_interactive_html(prompt=request.prompt, title=request.title),
+        kind="interactive", extension="html", mime_type="text/html", label="interactive demo",
+        request=request, http_request=http_request, storage_service=storage_service, inline=inline
+    )
+
+
+@media_router.post("/generate-code-image", dependencies=[Depends(media_slot("code_image"))], openapi_extra=json_body_openapi(CodeImageRequest))
+async def generate_code_image(
+    http_request: Request,
+    request: CodeImageRequest = Depends(json_body(CodeImageRequest)),
+    inline: bool = False,
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
+    """Generate beautiful code snippet image"""
+    return await _handle_media(
+        _render_media_cached(
+            "code", media_generator.generate_code_image,
+            code=request.code, language=request.language, theme=request.theme, title=request.title
+        ),
+        kind="code", extension="png", mime_type="image/png", label="code image",
+        request=request, http_request=http_request, storage_service=storage_service, inline=inline
+    )
+
+
+@media_router.post("/generate-chart", dependencies=[Depends(media_slot("chart"))], openapi_extra=json_body_openapi(ChartRequest))
+async def generate_chart(
+    http_request: Request,
+    request: ChartRequest = Depends(json_body(ChartRequest)),
+    inline: bool = False,
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
+    """Generate interactive-style chart"""
+    if not request.render_png:
+        try:
+            spec = await _render_media(
+                media_generator.generate_chart_spec,
+                chart_type=request.chart_type, data=request.data, title=request.title, theme=request.theme
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error generating chart: {str(e)}")
+        # The figure JSON is spliced in as-is rather than parsed and re-serialized
+        return Response(
+            content=b'{"success":true,"type":"chart","spec":' + spec.encode() + b'}',
+            media_type="application/json"
+        )
+    return await _handle_media(
+        _render_media_cached(
+            "chart", media_generator.generate_chart,
+            chart_type=request.chart_type, data=request.data, title=request.title, theme=request.theme
+        ),
+        kind="chart", extension="png", mime_type="image/png", label="chart",
+        request=request, http_request=http_request, storage_service=storage_service, inline=inline
+    )
+
+
+@media_router.post("/generate-infographic", dependencies=[Depends(media_slot("infographic"))], openapi_extra=json_body_openapi(InfographicRequest))
+async def generate_infographic(
+    http_request: Request,
+    request: InfographicRequest = Depends(json_body(InfographicRequest)),
+    inline: bool = False,
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
+    """Generate infographic with statistics"""
+    return await _handle_media(
+        _render_media_cached(
+            "infographic", media_generator.generate_infographic,
+            title=request.title, stats=request.stats, brand_color=request.brand_color
+        ),
+        kind="infographic", extension="png", mime_type="image/png", label="infographic",
+        request=request, http_request=http_request, storage_service=storage_service, inline=inline
+    )
+
+
+@media_router.post("/generate-qrcode", dependencies=[Depends(media_slot("qrcode"))], openapi_extra=json_body_openapi(QRCodeRequest))
+async def generate_qrcode(
+    http_request: Request,
+    request: QRCodeRequest = Depends(json_body(QRCodeRequest)),
+    inline: bool = False,
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
+    """Generate QR code"""
+    return await _handle_media(
+        _render_media_cached(
+            "qrcode", media_generator.generate_qr_code,
+            key_extra={"logo_mtime": _file_mtime(request.logo_path)},
+            url=request.url, logo_path=request.logo_path
+        ),
+        kind="qrcode", extension="png", mime_type="image/png", label="QR code",
+        request=request, http_request=http_request, storage_service=storage_service, inline=inline
+    )
+
+
+@media_router.post("/generate-carousel", dependencies=[Depends(media_slot("carousel"))], openapi_extra=json_body_openapi(CarouselRequest))
+async def generate_carousel(
+    request: CarouselRequest = Depends(json_body(CarouselRequest)),
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
     """Generate PDF carousel - returns raw PDF bytes"""
-    if not MEDIA_ENABLED:
-        raise HTTPException(status_code=501, detail="Media generation not available")
+    pdf_file = tempfile.SpooledTemporaryFile(max_size=CAROUSEL_SPOOL_MAX_BYTES)
     try:
-        pdf_bytes = media_generator.generate_carousel_pdf(
+        # Carousel generation waits on Imagen/Gemini calls, so keep it off the event loop.
+        # The PDF is written straight into pdf_file rather than returned as a bytes copy.
+        await asyncio.to_thread(
+            media_generator.generate_carousel_pdf,
             slides=request.slides,
             title=request.title,
-            style=request.style
+            style=request.style,
+            sink=pdf_file
         )
-        
-        # Also upload to storage if configured
+        pdf_size = pdf_file.tell()
+        pdf_file.seek(0)
+
+        # Also upload to storage if configured (queued; status shows in /media/list/{post_id})
         if request.save_to_storage and storage_service and request.post_id:
-            try:
-                storage_service.upload_media(
-                    pdf_bytes,
-                    request.post_id,
-                    "carousel",
-                    "pdf"
-                )
-            except Exception as e:
-                print(f"Storage upload failed: {e}")
+            pdf_bytes = pdf_file.read()
+            pdf_file.seek(0)
+            await _queue_media_upload(storage_service, pdf_bytes, request.post_id, "carousel", "pdf")
 
         # Build filename with convention: IndepthCarousel_{Pillar}_{MonthDay}.pdf
         from datetime import datetime as dt
@@ -1269,7 +2115,7 @@ async def generate_carousel(request: CarouselRequest):
         # Extract pillar name from content_pillar field
         pillar = request.content_pillar or 'General'
         # Clean pillar: remove '&', spaces, special chars -> CamelCase
-        pillar_clean = pillar.replace('&', '').replace(' ', '')
+        pillar_clean = _FILENAME_UNSAFE.sub('', pillar)
         # Map common pillar names
         pillar_map = {
             'AIInnovation': 'AIInnovation',
@@ -1281,52 +2127,60 @@ async def generate_carousel(request: CarouselRequest):
         pillar_label = pillar_map.get(pillar_clean, pillar_clean)
         
         filename = f"IndepthCarousel_{pillar_label}_{month_day}.pdf"
-        return Response(
-            content=pdf_bytes,
+        return StreamingResponse(
+            _iter_file_chunks(pdf_file),
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Content-Length": str(pdf_size)
             }
         )
         
     except Exception as e:
+        pdf_file.close()
         raise HTTPException(status_code=500, detail=f"Error generating carousel: {str(e)}")
 
 
-@app.post("/media/generate-ai-image")
-async def generate_ai_image(request: AIImageRequest):
+@media_router.post("/generate-ai-image", dependencies=[Depends(media_slot("ai_image"))], openapi_extra=json_body_openapi(AIImageRequest))
+async def generate_ai_image(
+    http_request: Request,
+    request: AIImageRequest = Depends(json_body(AIImageRequest)),
+    inline: bool = False,
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
     """Generate AI-powered image"""
-    if not MEDIA_ENABLED:
-        raise HTTPException(status_code=501, detail="Media generation not available")
+    return await _handle_media(
+        media_generator.generate_ai_image(prompt=request.prompt, style=request.style),
+        kind="ai-image", extension="png", mime_type="image/png", label="AI image",
+        request=request, http_request=http_request, storage_service=storage_service, inline=inline
+    )
+
+
+if MEDIA_ENABLED:
+    app.include_router(media_router)
+
+
+@app.post("/media/presign")
+async def presign_media_upload(
+    request: PresignRequest,
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
+    """Signed direct-to-storage upload URL for client-side media (bytes never pass through the API)"""
+    if not storage_service:
+        raise HTTPException(status_code=501, detail="Media storage not configured")
     try:
-        img_bytes = await media_generator.generate_ai_image(
-            prompt=request.prompt,
-            style=request.style
+        return await asyncio.to_thread(
+            storage_service.create_upload_url, request.post_id, request.media_type, request.extension
         )
-        
-        url = None
-        if request.save_to_storage and storage_service and request.post_id:
-            try:
-                url = storage_service.upload_media(
-                    img_bytes,
-                    request.post_id,
-                    "ai-image",
-                    "png"
-                )
-            except Exception as e:
-                print(f"Storage upload failed: {e}")
-        
-        if not url:
-            url = to_data_uri(img_bytes, "image/png")
-
-        return {"success": True, "url": url, "type": "ai-image"}
-        
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating AI image: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error creating upload URL: {str(e)}")
 
 
 @app.get("/media/list/{post_id}")
-async def list_post_media(post_id: str):
+async def list_post_media(
+    post_id: str,
+    storage_service: Optional["StorageService"] = Depends(get_storage_service)
+):
     """List all media assets for a post"""
     if not MEDIA_ENABLED:
         return {"media": []}
@@ -1334,8 +2188,15 @@ async def list_post_media(post_id: str):
         if not storage_service:
             return {"media": []}
         
-        files = storage_service.list_post_media(post_id)
-        return {"post_id": post_id, "media": files}
+        files = await asyncio.to_thread(storage_service.list_post_media, post_id)
+        pending = [
+            {"name": path, "media_type": media_type, "status": "uploading"}
+            for path, media_type in pending_uploads.get(post_id, {}).items()
+        ] + [
+            {"name": path, "media_type": media_type, "status": "failed"}
+            for path, media_type in failed_uploads.get(post_id, {}).items()
+        ]
+        return {"post_id": post_id, "media": files, "pending": pending}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing media: {str(e)}")
@@ -1345,27 +2206,62 @@ async def list_post_media(post_id: str):
 # NEWS & TRENDING ENDPOINTS
 # ============================================
 
+# get_trending_articles is an LLM call; results are kept per (category, count) for
+# NEWS_CACHE_TTL_SECONDS (matching the endpoint's Cache-Control max-age). The response is
+# stored already serialized, so cache hits skip JSON encoding entirely.
+NEWS_CACHE_TTL_SECONDS = 300
+NEWS_CACHE_MAX_ITEMS = 64
+_news_cache: "OrderedDict[Tuple[str, int], Tuple[float, bytes]]" = OrderedDict()
+
+
 @app.get("/news/trending")
-async def get_trending_news(category: str = "technology", count: int = 15):
+async def get_trending_news(
+    category: str = "technology",
+    count: int = 15,
+    news_service: Optional[NewsService] = Depends(get_news_service)
+):
     """
     Get trending news articles for content generation
     
     - **category**: News category (technology, ai, business, leadership)
     - **count**: Number of articles to return (default: 15)
     """
+    key = (category, count)
+    entry = _news_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] <= NEWS_CACHE_TTL_SECONDS:
+        _news_cache.move_to_end(key)
+        return Response(content=entry[1], media_type="application/json")
     try:
-        articles = news_service.get_trending_articles(category=category, count=count)
-        return {
+        articles = await asyncio.to_thread(news_service.get_trending_articles, category=category, count=count)
+        body = orjson.dumps({
             "articles": articles,
             "count": len(articles),
             "category": category
-        }
+        })
+        _news_cache[key] = (time.monotonic(), body)
+        _news_cache.move_to_end(key)
+        while len(_news_cache) > NEWS_CACHE_MAX_ITEMS:
+            _news_cache.popitem(last=False)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch trending news: {str(e)}")
 
 
+@app.post("/news/invalidate")
+async def invalidate_news_cache():
+    """Drop cached /news/trending results so the next request regenerates them"""
+    cleared = len(_news_cache)
+    _news_cache.clear()
+    return {"success": True, "cleared": cleared}
+
+
 @app.get("/topics/trending", response_model=TopicsResponse)
-async def get_trending_topics(channel: str = "personal_career", refresh: bool = False):
+async def get_trending_topics(
+    channel: str = "personal_career",
+    refresh: bool = False,
+    db: Optional[NeonDatabase] = Depends(get_db),
+    news_service: Optional[NewsService] = Depends(get_news_service)
+):
     """
     Get top topic suggestions for a channel.
 
@@ -1374,7 +2270,7 @@ async def get_trending_topics(channel: str = "personal_career", refresh: bool =
     """
     try:
         if refresh:
-            seeds = news_service.get_live_channel_topics(channel=channel, count=8)
+            seeds = await news_service.get_live_channel_topics_async(channel=channel, count=8)
             if not seeds:
                 seeds = _load_seed_topics(channel)
             if not seeds:
@@ -1404,7 +2300,7 @@ async def get_trending_topics(channel: str = "personal_career", refresh: bool =
                 )
                 for idx, item in enumerate(topics)
             ],
-            updated_at=datetime.now().isoformat(),
+            updated_at=datetime.now(),
         )
     except HTTPException:
         raise
@@ -0,0 +1,104 @@
+"""
+Provider Batch API Service
+Submits bulk post prompts as a single OpenAI Batch job (half the per-token cost,
+results within the completion window) and reads the finished outputs back.
+"""
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+import openai
+
+# Child of the API's "post_factory" logger, so records go through its queue handler (api.main)
+logger = logging.getLogger("post_factory.batch_llm")
+
+
+class BatchLLMService:
+    """Submit and collect OpenAI Batch API jobs for /posts/batch"""
+
+    ENDPOINT = "/v1/chat/completions"
+    COMPLETION_WINDOW = "24h"
+
+    def __init__(self, model: str = "gpt-4o", system_prompt: Optional[str] = None):
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not set")
+        self.client = openai.OpenAI(api_key=api_key)
+        self.model = model
+        self.system_prompt = system_prompt
+
+    def submit_batch(self, prompts: Dict[str, str], metadata: Optional[Dict[str, str]] = None) -> str:
+        """
+        Upload prompts as a JSONL batch input file and create the batch job
+
+        Args:
+            prompts: Mapping of custom_id -> prompt (custom_id comes back with each result)
+            metadata: Optional job metadata (string values)
+
+        Returns:
+            Batch job ID
+        """
+        lines = []
+        for custom_id, prompt in prompts.items():
+            messages = [{"role": "user", "content": prompt}]
+            if self.system_prompt:
+                messages.insert(0, {"role": "system", "content": self.system_prompt})
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": self.ENDPOINT,
+                "body": {
+                    "model": self.model,
+                    "messages": messages,
+                    "max_tokens": 1024,
+                    "temperature": 0.7
+                }
+            }))
+
+        input_file = self.client.files.create(
+            file=("posts_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self.ENDPOINT,
+            completion_window=self.COMPLETION_WINDOW,
+            metadata=metadata
+        )
+        return batch.id
+
+    def get_batch(self, job_id: str) -> Dict:
+        """Get job status and request counts"""
+        batch = self.client.batches.retrieve(job_id)
+        counts = batch.request_counts
+        return {
+            "job_id": batch.id,
+            "status": batch.status,
+            "output_file_id": batch.output_file_id,
+            "request_counts": {
+                "total": counts.total if counts else 0,
+                "completed": counts.completed if counts else 0,
+                "failed": counts.failed if counts else 0
+            }
+        }
+
+    def get_results(self, output_file_id: str) -> Dict[str, str]:
+        """Download a completed job's output file and return custom_id -> completion text"""
+        content = self.client.files.content(output_file_id).text
+        results: Dict[str, str] = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(
+                    "Batch request %s failed: %s", item.get("custom_id"), item.get("error"),
+                    extra={"custom_id": item.get("custom_id")}
+                )
+                continue
+            choices = response.get("body", {}).get("choices") or []
+            if choices:
+                results[item["custom_id"]] = choices[0]["message"]["content"]
+        return results
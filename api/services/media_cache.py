@@ -0,0 +1,191 @@
+"""
+Media Render Cache
+Content-addressable cache for deterministic renders (QR codes, code images, charts):
+an in-memory LRU tier in front of {version}/{key}.{ext} files on disk, keyed on a hash of
+the render inputs plus the generator source, so editing the generator invalidates old entries.
+The disk tier is capped by size (least recently used files go first) and directories left
+behind by other versions are removed on the first write.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+
+def source_version(path: Path) -> str:
+    """Short hash of a source file (empty if it cannot be read)"""
+    try:
+        return hashlib.blake2b(path.read_bytes(), digest_size=8).hexdigest()
+    except OSError:
+        return ""
+
+
+class MediaCache:
+    """Thread-safe two-tier byte cache (renders and disk I/O run in worker threads)"""
+
+    def __init__(self, cache_dir: Optional[str], max_memory_bytes: int = 64 * 1024 * 1024, version: str = "",
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        self.root_dir = Path(cache_dir) if cache_dir else None
+        self.cache_dir = self.root_dir / (version or "default") if self.root_dir else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.version = version
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        # Bytes on disk for this version; None until the first write scans the directory
+        self._disk_bytes: Optional[int] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def make_key(self, kind: str, **params: Any) -> str:
+        """blake2b over the canonical (sorted-key) JSON of the render inputs"""
+        payload = orjson.dumps(
+            {"kind": kind, "params": params, "version": self.version},
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        )
+        return hashlib.blake2b(payload, digest_size=20).hexdigest()
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+            return data
+
+    def get_disk(self, key: str, ext: str) -> Optional[bytes]:
+        """Read a persisted entry and promote it to the memory tier"""
+        if self.cache_dir is None:
+            self.misses += 1
+            return None
+        path = self.cache_dir / f"{key}.{ext}"
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mtime doubles as the disk tier's LRU clock
+        except OSError:
+            pass
+        self.disk_hits += 1
+        self._remember(key, data)
+        return data
+
+    def set(self, key: str, ext: str, data: bytes) -> None:
+        """Store in memory and, when a cache directory is configured, atomically on disk"""
+        self._remember(key, data)
+        if self.cache_dir is None or len(data) > self.max_disk_bytes:
+            return
+        try:
+            with self._disk_lock:
+                if self._disk_bytes is None:
+                    self._remove_stale_versions()
+                    self.cache_dir.mkdir(parents=True, exist_ok=True)
+                    self._disk_bytes = sum(entry.stat().st_size for entry in self._disk_entries())
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_dir / f"{key}.{ext}")
+        except OSError as e:
+            print(f"Warning: Could not persist media cache entry: {e}")
+            return
+        with self._disk_lock:
+            self._disk_bytes += len(data)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+
+    def _disk_entries(self) -> List[os.DirEntry]:
+        with os.scandir(self.cache_dir) as entries:
+            return [entry for entry in entries if entry.is_file() and not entry.name.endswith(".tmp")]
+
+    def _remove_stale_versions(self) -> None:
+        """Delete entries written under other versions (the cache owns everything under root_dir)"""
+        if not self.root_dir.is_dir():
+            return
+        for entry in os.scandir(self.root_dir):
+            if entry.path == str(self.cache_dir):
+                continue
+            try:
+                if entry.is_dir():
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _prune_disk(self) -> None:
+        """Drop least recently used files until the disk tier is back under 90% of its cap"""
+        entries = []
+        for entry in self._disk_entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._entries[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_items": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "cache_dir": str(self.cache_dir) if self.cache_dir else None,
+                "version": self.version
+            }
+
+
+# Shared instance; MEDIA_CACHE_DIR="" keeps the cache memory-only
+media_cache = MediaCache(
+    cache_dir=os.getenv("MEDIA_CACHE_DIR", str(Path(__file__).resolve().parents[2] / "cache" / "media")),
+    max_memory_bytes=int(os.getenv("MEDIA_CACHE_MAX_MB", "64")) * 1024 * 1024,
+    max_disk_bytes=int(os.getenv("MEDIA_CACHE_MAX_DISK_MB", "512")) * 1024 * 1024,
+    version=source_version(Path(__file__).with_name("media_generator.py"))
+)
+
+# Imagen outputs by prompt, so regenerating a carousel does not re-bill identical images.
+# Versioned on the model rather than the generator source: code edits keep the entries.
+imagen_cache = MediaCache(
+    cache_dir=os.getenv("IMAGEN_CACHE_DIR", str(Path(__file__).resolve().parents[2] / "cache" / "imagen")),
+    max_memory_bytes=int(os.getenv("IMAGEN_CACHE_MAX_MB", "128")) * 1024 * 1024,
+    max_disk_bytes=int(os.getenv("IMAGEN_CACHE_MAX_DISK_MB", "1024")) * 1024 * 1024,
+    version="imagen-3.0-generate-001"
+)
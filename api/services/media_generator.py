@@ -3,10 +3,22 @@ Media Asset Generation Service
 Generates stunning visual assets for LinkedIn posts
 """
 import io
+import os
+import re
+import atexit
 import base64
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Tuple
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+# Keep matplotlib's font cache in the persistent cache dir (must be set before import)
+os.environ.setdefault("MPLCONFIGDIR", str(Path(__file__).resolve().parents[2] / "cache" / "matplotlib"))
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, ImageEnhance
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
 import matplotlib.pyplot as plt
@@ -16,14 +28,293 @@ from pygments import highlight
 from pygments.lexers import get_lexer_by_name, guess_lexer
 from pygments.formatters import ImageFormatter
 from pygments.styles import get_style_by_name
+import kaleido
 import qrcode
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
 import google.generativeai as genai
-import os
+
+from core.llm_cache import LLMCache
+from api.services.media_cache import imagen_cache
+
+
+_kaleido_server_started = False
+
+
+def _ensure_kaleido_server() -> None:
+    """
+    Keep one headless Chrome per process for Plotly PNG export. Without the sync
+    server every fig.to_image() launches and tears down its own browser (~seconds).
+    Started lazily so only processes that actually render charts (pool workers) own one.
+    """
+    global _kaleido_server_started
+    if _kaleido_server_started:
+        return
+    _kaleido_server_started = True
+    try:
+        kaleido.start_sync_server(silence_warnings=True)
+        atexit.register(kaleido.stop_sync_server, silence_warnings=True)
+    except Exception as e:
+        print(f"Warning: Could not start persistent Kaleido server, charts will export per call "
+              f"(if Chrome is missing, run `kaleido_get_chrome` at build time): {e}")
+
+
+@lru_cache(maxsize=None)
+def _carousel_pool(name: str, workers: int) -> ThreadPoolExecutor:
+    """
+    Process-wide carousel thread pool, created on first use. Module level rather than
+    on MediaGenerator so the instance stays picklable for the render process pool.
+    Sharing the Imagen pool also keeps concurrent carousels inside one quota budget.
+    """
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"carousel-{name}")
+
+
+@lru_cache(maxsize=32)
+def _font(name: str, size: int) -> ImageFont.ImageFont:
+    """Parsed TrueType font shared across renders; PIL's default font when it is not installed"""
+    try:
+        return ImageFont.truetype(name, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=None)
+def _char_widths(font_name: str) -> Dict[str, int]:
+    """
+    Advance widths (1/1000 em) of a standard PDF font's printable WinAnsi characters
+    (cp1252: Latin-1 plus the bullet, smart quotes and dashes LLM text is full of)
+    """
+    widths = pdfmetrics.getFont(font_name).widths
+    table = {}
+    for code in range(32, 256):
+        try:
+            table[bytes([code]).decode('cp1252')] = widths[code]
+        except UnicodeDecodeError:
+            continue
+    return table
+
+
+@lru_cache(maxsize=2048)
+def _text_width(text: str, font_name: str, font_size: float) -> float:
+    """
+    stringWidth via a per-font table lookup, memoized per (text, font, size) since the
+    same titles, bullets and words are measured on every render; other characters use
+    ReportLab's full path
+    """
+    table = _char_widths(font_name)
+    try:
+        return sum(table[ch] for ch in text) * font_size / 1000
+    except KeyError:
+        return pdfmetrics.stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=8)
+def _qr_logo(path: str, mtime: float, size: int) -> Image.Image:
+    """Decoded, LANCZOS-downscaled RGBA logo; mtime in the key picks up replaced files"""
+    logo = Image.open(path).convert('RGBA')
+    logo.thumbnail((size, size), Image.Resampling.LANCZOS)
+    return logo
+
+
+@lru_cache(maxsize=1)
+def _vertex_credentials():
+    """
+    Vertex AI credentials and project id, loaded once per process.
+    Sources: GCP_CREDENTIALS_JSON_B64 (same as vertex_wrapper.py), then
+    GOOGLE_APPLICATION_CREDENTIALS, then application default credentials.
+    """
+    import json
+    from google.oauth2 import service_account
+    
+    project_id = os.getenv('GCP_PROJECT_ID', 'linkedin-post-factory')
+    credentials = None
+    creds_b64 = os.getenv('GCP_CREDENTIALS_JSON_B64')
+    
+    if creds_b64:
+        print(f"   Using credentials from GCP_CREDENTIALS_JSON_B64")
+        creds_data = json.loads(base64.b64decode(creds_b64).decode('utf-8'))
+        
+        if creds_data.get('type', '') == 'service_account':
+            credentials = service_account.Credentials.from_service_account_info(
+                creds_data,
+                scopes=['https://www.googleapis.com/auth/cloud-platform']
+            )
+            # Use project from credentials if not set
+            if not os.getenv('GCP_PROJECT_ID'):
+                project_id = creds_data.get('project_id', project_id)
+        else:
+            from google.oauth2.credentials import Credentials
+            credentials = Credentials(
+                token=None,
+                refresh_token=creds_data.get('refresh_token'),
+                token_uri='https://oauth2.googleapis.com/token',
+                client_id=creds_data.get('client_id'),
+                client_secret=creds_data.get('client_secret'),
+                scopes=['https://www.googleapis.com/auth/cloud-platform']
+            )
+    else:
+        # Fallback: try GOOGLE_APPLICATION_CREDENTIALS file path
+        creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+        if creds_path and os.path.exists(creds_path):
+            print(f"   Using credentials from: {creds_path}")
+            credentials = service_account.Credentials.from_service_account_file(
+                creds_path,
+                scopes=['https://www.googleapis.com/auth/cloud-platform']
+            )
+        else:
+            print(f"   Using default credentials (ADC)")
+            from google.auth import default
+            credentials, _ = default(scopes=['https://www.googleapis.com/auth/cloud-platform'])
+    
+    if not credentials:
+        raise Exception("No credentials available for Vertex AI")
+    return credentials, project_id
+
+
+@lru_cache(maxsize=1)
+def _vertex_session():
+    """Shared requests.Session so Gemini/Imagen calls and token refreshes reuse TLS connections"""
+    import requests
+    return requests.Session()
+
+
+# Serializes token refresh between concurrent Gemini/Imagen workers
+_vertex_token_lock = threading.Lock()
+
+
+def _vertex_access_token() -> Tuple[str, str]:
+    """Bearer token and project id; the token is refreshed only when missing or near expiry"""
+    from google.auth.transport.requests import Request
+    credentials, project_id = _vertex_credentials()
+    with _vertex_token_lock:
+        if not credentials.valid:
+            credentials.refresh(Request(session=_vertex_session()))
+        return credentials.token, project_id
+
+# Encoded Imagen failure placeholder (see MediaGenerator._imagen_placeholder)
+_imagen_placeholder_png: Optional[bytes] = None
+
+
+class _ReusableImageFormatter(ImageFormatter):
+    """ImageFormatter that can be cached: format() accumulates drawables, so clear them per call"""
+
+    def format(self, tokensource, outfile):
+        self.drawables = []
+        return super().format(tokensource, outfile)
+
+
+# Lexer, style and formatter resolution (including the formatter's font lookup) are
+# slow relative to highlighting a snippet, so instances are shared across renders.
+@lru_cache(maxsize=32)
+def _lexer(language: str):
+    return get_lexer_by_name(language, stripall=True)
+
+
+@lru_cache(maxsize=32)
+def _code_formatter(theme: str, font_size: int, line_pad: int) -> ImageFormatter:
+    return _ReusableImageFormatter(
+        style=get_style_by_name(theme),
+        line_numbers=True,
+        font_size=font_size,
+        line_pad=line_pad
+    )
+
+
+# Gemini title work reused across carousels: English -> Spanish translations and
+# condensed titles
+_title_cache = LLMCache(
+    max_items=int(os.getenv("TITLE_TRANSLATION_CACHE_ITEMS", "4096")),
+    ttl_seconds=int(os.getenv("TITLE_TRANSLATION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+)
+
+
+def _title_key(kind: str, text: str, **params) -> str:
+    """Key on whitespace-normalized text, so re-spaced or re-wrapped copies of a title hit"""
+    return _title_cache.make_key(kind=kind, text=' '.join(text.split()), **params)
+
+
+# Leading labels Gemini sometimes puts before a translation ("Spanish translation: ...")
+_TRANSLATION_LABEL_RE = re.compile(
+    r'^(?:\s*(?:Spanish translation|Spanish Options|Spanish|Translation|Translated|most common|direct first|[()])\s*:?)+\s*',
+    re.IGNORECASE
+)
+
+
+# Carousel color schemes per style (module level: shared by every generate_carousel_pdf call)
+_CAROUSEL_STYLES = {
+    "professional": {
+        "bg": (0.12, 0.12, 0.12),
+        "accent": (0.29, 0.62, 1.0),  # Blue
+        "text": (1, 1, 1),
+        "secondary": (0.8, 0.8, 0.8)
+    },
+    "relaxed": {
+        "bg": (0.95, 0.94, 0.92),
+        "accent": (0.4, 0.7, 0.5),  # Green
+        "text": (0.2, 0.2, 0.2),
+        "secondary": (0.4, 0.4, 0.4)
+    },
+    "corporate": {
+        "bg": (0.05, 0.08, 0.15),
+        "accent": (0.0, 0.4, 0.7),  # Navy
+        "text": (1, 1, 1),
+        "secondary": (0.7, 0.7, 0.7)
+    },
+    "creative": {
+        "bg": (0.15, 0.05, 0.2),
+        "accent": (0.9, 0.3, 0.6),  # Pink
+        "text": (1, 1, 1),
+        "secondary": (0.9, 0.9, 0.9)
+    },
+    "minimal": {
+        "bg": (1, 1, 1),
+        "accent": (0, 0, 0),
+        "text": (0, 0, 0),
+        "secondary": (0.5, 0.5, 0.5)
+    }
+}
+
+# Image prompt vocabulary per style
+_STYLE_DESCRIPTORS = {
+    'professional': 'clean, modern, professional business',
+    'relaxed': 'warm, natural, organic',
+    'corporate': 'sleek, corporate, executive',
+    'creative': 'vibrant, artistic, creative',
+    'minimal': 'minimalist, simple, clean'
+}
+
+# Color/tone guidance so images melt with slide backgrounds
+_STYLE_COLOR_TONES = {
+    'professional': 'dark navy and deep blue tones, cool shadows, subtle blue highlights, low-key moody lighting',
+    'relaxed': 'warm earth tones, golden hour lighting, amber and brown hues, soft warm glow',
+    'corporate': 'cool grey and silver tones, sharp contrast, steel blue accents, polished executive lighting',
+    'creative': 'rich purple and magenta tones, dramatic colorful lighting, vibrant pink and violet hues',
+    'minimal': 'high-key bright whites and soft greys, clean even lighting, muted neutral palette'
+}
+
+# Lighting/mood vocabulary for the scene-description prompt
+_STYLE_VISUAL_TONES = {
+    'professional': 'cinematic, dramatic lighting, high contrast, moody and authoritative',
+    'relaxed': 'warm natural light, candid, earthy tones, approachable',
+    'corporate': 'sleek, polished, sharp executive feel, cool blue tones',
+    'creative': 'bold colors, dynamic angles, vibrant and energetic',
+    'minimal': 'clean, airy, high-key light, understated'
+}
+
+# Composition cycled across slides so images differ
+_VARIATION_LENSES = (
+    "wide composition, environmental context",
+    "mid-shot with human activity and hands-on action",
+    "close-up texture and details",
+    "dynamic perspective with depth and motion cues",
+    "structured geometric composition",
+    "natural lighting with high contrast silhouettes",
+    "top-down operational arrangement"
+)
 
 
 class MediaGenerator:
@@ -32,6 +323,32 @@ class MediaGenerator:
     def __init__(self):
         self.base_width = 1200
         self.base_height = 630  # LinkedIn optimal image size
+        # Carousel concurrency: scene refinement, title condensing and translation fallbacks
+        # are cheap Gemini text calls; Imagen stays sequential (1) by default to respect
+        # its per-minute quota.
+        self.carousel_scene_workers = int(os.getenv("CAROUSEL_SCENE_WORKERS", "4"))
+        self.carousel_image_workers = int(os.getenv("CAROUSEL_IMAGE_WORKERS", "1"))
+
+    def warm_up(self) -> None:
+        """
+        Throwaway renders so fonts, lexers, plotly and reportlab initialize before real
+        requests. Charts only build a figure: the headless Chrome behind PNG export is
+        started on the first real chart, so idle workers never hold a browser.
+        """
+        renders = (
+            ("code image", lambda: self.generate_code_image("print('warm')", language="python")),
+            ("chart", lambda: self._chart_figure("bar", {"x": ["a"], "y": [1]}, "warm", "plotly_dark")),
+            ("infographic", lambda: self.generate_infographic("warm", [{"label": "a", "value": "1"}])),
+            ("qr code", lambda: self.generate_qr_code("https://example.com")),
+            # generate_ai_image is async, so only its fonts are loaded here
+            ("ai image fonts", lambda: (_font("arial.ttf", 24), _font("arialbd.ttf", 32))),
+            ("pdf", lambda: canvas.Canvas(io.BytesIO(), pagesize=A4).save()),
+        )
+        for label, render in renders:
+            try:
+                render()
+            except Exception as e:
+                print(f"Warning: Media warm-up ({label}) failed: {e}")
         
     def generate_code_image(
         self,
@@ -53,17 +370,12 @@ class MediaGenerator:
             PNG image bytes
         """
         try:
-            lexer = get_lexer_by_name(language, stripall=True)
+            lexer = _lexer(language)
         except:
             lexer = guess_lexer(code)
         
         # Generate code image with syntax highlighting
-        formatter = ImageFormatter(
-            style=theme,
-            line_numbers=True,
-            font_size=16,
-            line_pad=6
-        )
+        formatter = _code_formatter(theme, 16, 6)
         
         code_img_data = highlight(code, lexer, formatter)
         code_img = Image.open(io.BytesIO(code_img_data))
@@ -75,20 +387,12 @@ class MediaGenerator:
         canvas_height = code_img.height + (padding * 2) + title_height
         
         # Create gradient background
-        canvas_img = Image.new('RGB', (canvas_width, canvas_height), '#1e1e1e')
+        canvas_img = self._vertical_gradient(canvas_width, canvas_height, (30, 30, 30), (20, 20, 20))
         draw = ImageDraw.Draw(canvas_img)
         
-        # Add gradient effect
-        for y in range(canvas_height):
-            color_val = int(30 + (y / canvas_height) * 20)
-            draw.line([(0, y), (canvas_width, y)], fill=(color_val, color_val, color_val))
-        
         # Add title if provided
         if title:
-            try:
-                font = ImageFont.truetype("arial.ttf", 32)
-            except:
-                font = ImageFont.load_default()
+            font = _font("arial.ttf", 32)
             
             draw.text(
                 (padding, padding // 2),
@@ -133,6 +437,26 @@ class MediaGenerator:
         Returns:
             PNG image bytes
         """
+        fig = self._chart_figure(chart_type, data, title, theme)
+        # Convert to image bytes (through the process's persistent Chrome)
+        _ensure_kaleido_server()
+        return fig.to_image(format="png")
+
+    def generate_chart_spec(
+        self,
+        chart_type: str,
+        data: Dict,
+        title: str,
+        theme: str = "plotly_dark"
+    ) -> str:
+        """
+        Same chart as generate_chart, as Plotly figure JSON for rendering with
+        Plotly.js in the browser (skips the Kaleido rasterization entirely)
+        """
+        return self._chart_figure(chart_type, data, title, theme).to_json()
+
+    def _chart_figure(self, chart_type: str, data: Dict, title: str, theme: str) -> go.Figure:
+        """Build the styled Plotly figure shared by PNG and JSON chart output"""
         fig = None
         
         if chart_type == "bar":
@@ -213,10 +537,7 @@ class MediaGenerator:
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(30,30,30,1)'
             )
-            
-            # Convert to image bytes
-            img_bytes = fig.to_image(format="png", engine="kaleido")
-            return img_bytes
+            return fig
         
         raise ValueError(f"Unsupported chart type: {chart_type}")
     
@@ -237,25 +558,13 @@ class MediaGenerator:
         Returns:
             PNG image bytes
         """
-        img = Image.new('RGB', (self.base_width, self.base_height), '#1e1e1e')
-        draw = ImageDraw.Draw(img)
-        
         # Gradient background
-        for y in range(self.base_height):
-            factor = y / self.base_height
-            r = int(30 + factor * 20)
-            g = int(30 + factor * 20)
-            b = int(50 + factor * 30)
-            draw.line([(0, y), (self.base_width, y)], fill=(r, g, b))
+        img = self._vertical_gradient(self.base_width, self.base_height, (30, 30, 50), (20, 20, 30))
+        draw = ImageDraw.Draw(img)
         
-        try:
-            title_font = ImageFont.truetype("arialbd.ttf", 48)
-            label_font = ImageFont.truetype("arial.ttf", 28)
-            value_font = ImageFont.truetype("arialbd.ttf", 42)
-        except:
-            title_font = ImageFont.load_default()
-            label_font = ImageFont.load_default()
-            value_font = ImageFont.load_default()
+        title_font = _font("arialbd.ttf", 48)
+        label_font = _font("arial.ttf", 28)
+        value_font = _font("arialbd.ttf", 42)
         
         # Draw title
         draw.text((60, 50), title, fill='#ffffff', font=title_font)
@@ -287,15 +596,14 @@ class MediaGenerator:
             value = stat.get('value', '')
             label = stat.get('label', '')
             
-            value_bbox = draw.textbbox((0, 0), value, font=value_font)
-            value_width = value_bbox[2] - value_bbox[0]
-            value_x = x + (stat_width - 40 - value_width) // 2
+            # getlength() is the advance width only, much cheaper than a full textbbox
+            value_width = value_font.getlength(value)
+            value_x = x + int(stat_width - 40 - value_width) // 2
             draw.text((value_x, y + 40), value, fill=brand_color, font=value_font)
             
             # Draw label (small)
-            label_bbox = draw.textbbox((0, 0), label, font=label_font)
-            label_width = label_bbox[2] - label_bbox[0]
-            label_x = x + (stat_width - 40 - label_width) // 2
+            label_width = label_font.getlength(label)
+            label_x = x + int(stat_width - 40 - label_width) // 2
             draw.text((label_x, y + 110), label, fill='#cccccc', font=label_font)
         
         # Convert to bytes
@@ -330,14 +638,11 @@ class MediaGenerator:
         img = qr.make_image(fill_color="#000000", back_color="#ffffff")
         img = img.convert('RGB')
         
-        # Add logo if provided
+        # Add logo if provided (alpha-masked, so transparent logos keep their shape)
         if logo_path and os.path.exists(logo_path):
-            logo = Image.open(logo_path)
-            logo_size = img.size[0] // 4
-            logo = logo.resize((logo_size, logo_size))
-            
-            logo_pos = ((img.size[0] - logo_size) // 2, (img.size[1] - logo_size) // 2)
-            img.paste(logo, logo_pos)
+            logo = _qr_logo(logo_path, os.path.getmtime(logo_path), img.size[0] // 4)
+            logo_pos = ((img.size[0] - logo.width) // 2, (img.size[1] - logo.height) // 2)
+            img.paste(logo, logo_pos, mask=logo)
         
         # Convert to bytes
         output = io.BytesIO()
@@ -348,50 +653,20 @@ class MediaGenerator:
         self,
         slides: List[Dict[str, str]],
         title: str,
-        style: str = "professional"
-    ) -> bytes:
+        style: str = "professional",
+        sink: Optional[BinaryIO] = None
+    ) -> Optional[bytes]:
         """
         Generate multi-page PDF carousel with AI images and bilingual content
         
         Styles: professional, relaxed, corporate, creative, minimal
+        
+        When sink is given the PDF is written into it and None is returned;
+        otherwise the PDF bytes are returned.
         """
         print(f"DEBUG: Generating PDF for title '{title}' with {len(slides)} slides, style: {style}")
         
-        # Define color schemes for each style
-        styles = {
-            "professional": {
-                "bg": (0.12, 0.12, 0.12),
-                "accent": (0.29, 0.62, 1.0),  # Blue
-                "text": (1, 1, 1),
-                "secondary": (0.8, 0.8, 0.8)
-            },
-            "relaxed": {
-                "bg": (0.95, 0.94, 0.92),
-                "accent": (0.4, 0.7, 0.5),  # Green
-                "text": (0.2, 0.2, 0.2),
-                "secondary": (0.4, 0.4, 0.4)
-            },
-            "corporate": {
-                "bg": (0.05, 0.08, 0.15),
-                "accent": (0.0, 0.4, 0.7),  # Navy
-                "text": (1, 1, 1),
-                "secondary": (0.7, 0.7, 0.7)
-            },
-            "creative": {
-                "bg": (0.15, 0.05, 0.2),
-                "accent": (0.9, 0.3, 0.6),  # Pink
-                "text": (1, 1, 1),
-                "secondary": (0.9, 0.9, 0.9)
-            },
-            "minimal": {
-                "bg": (1, 1, 1),
-                "accent": (0, 0, 0),
-                "text": (0, 0, 0),
-                "secondary": (0.5, 0.5, 0.5)
-            }
-        }
-        
-        color_scheme = styles.get(style, styles["professional"])
+        color_scheme = _CAROUSEL_STYLES.get(style, _CAROUSEL_STYLES["professional"])
         
         # Cap at 5 content slides so total PDF pages = 6 (cover + 5 slides)
         if len(slides) > 5:
@@ -405,24 +680,8 @@ class MediaGenerator:
         # PHASE 1: Generate ALL images in PARALLEL (before PDF assembly)
         # This avoids Render's 30s timeout by running Imagen calls concurrently
         # ====================================================================
-        style_descriptors = {
-            'professional': 'clean, modern, professional business',
-            'relaxed': 'warm, natural, organic',
-            'corporate': 'sleek, corporate, executive',
-            'creative': 'vibrant, artistic, creative',
-            'minimal': 'minimalist, simple, clean'
-        }
-        style_desc = style_descriptors.get(style, 'professional')
-        
-        # Color/tone guidance so images melt with slide backgrounds
-        style_color_tone = {
-            'professional': 'dark navy and deep blue tones, cool shadows, subtle blue highlights, low-key moody lighting',
-            'relaxed': 'warm earth tones, golden hour lighting, amber and brown hues, soft warm glow',
-            'corporate': 'cool grey and silver tones, sharp contrast, steel blue accents, polished executive lighting',
-            'creative': 'rich purple and magenta tones, dramatic colorful lighting, vibrant pink and violet hues',
-            'minimal': 'high-key bright whites and soft greys, clean even lighting, muted neutral palette'
-        }
-        color_tone = style_color_tone.get(style, style_color_tone['professional'])
+        style_desc = _STYLE_DESCRIPTORS.get(style, 'professional')
+        color_tone = _STYLE_COLOR_TONES.get(style, _STYLE_COLOR_TONES['professional'])
         
         # Build prompts for ALL images: cover + every slide
         # CRITICAL: Do NOT pass title text to Imagen — it renders it as visible text in the image.
@@ -432,14 +691,7 @@ class MediaGenerator:
         
         # Reasoning-first scene generation: feed full slide content so Gemini
         # identifies the specific claim/action/result before describing a scene.
-        style_visual_tone = {
-            'professional': 'cinematic, dramatic lighting, high contrast, moody and authoritative',
-            'relaxed': 'warm natural light, candid, earthy tones, approachable',
-            'corporate': 'sleek, polished, sharp executive feel, cool blue tones',
-            'creative': 'bold colors, dynamic angles, vibrant and energetic',
-            'minimal': 'clean, airy, high-key light, understated'
-        }
-        visual_tone = style_visual_tone.get(style, style_visual_tone['professional'])
+        visual_tone = _STYLE_VISUAL_TONES.get(style, _STYLE_VISUAL_TONES['professional'])
 
         # Build structured slide input — full content, not truncated
         all_topics = []
@@ -503,50 +755,35 @@ class MediaGenerator:
         )
         
         # Build slide prompts
-        variation_lenses = [
-            "wide composition, environmental context",
-            "mid-shot with human activity and hands-on action",
-            "close-up texture and details",
-            "dynamic perspective with depth and motion cues",
-            "structured geometric composition",
-            "natural lighting with high contrast silhouettes",
-            "top-down operational arrangement"
+        slide_texts = [
+            (
+                (slide.get('title', '') or '').strip(),
+                (slide.get('content_en', '') or slide.get('content', '') or slide.get('content_es', '')).strip()
+            )
+            for slide in slides
         ]
+
+        # Scene refinement is one or two Gemini text calls per slide; run the slides
+        # concurrently so this phase costs one slide's latency instead of N. The same
+        # pool serves the per-slide title condensing and translation calls below.
+        def refine(idx: int) -> str:
+            slide_title, slide_body = slide_texts[idx]
+            return self._refine_slide_scene(
+                idx,
+                scene_descriptions.get(idx + 2, "a realistic operational industrial environment showing measurable work in progress"),
+                slide_title, slide_body, title, style, visual_tone, color_tone
+            )
+
+        text_pool = _carousel_pool("text", max(1, self.carousel_scene_workers))
+        slide_scenes = list(text_pool.map(refine, range(len(slides))))
+
         for idx, slide in enumerate(slides):
-            slide_title = (slide.get('title', '') or '').strip()
-            slide_body = (slide.get('content_en', '') or slide.get('content', '') or slide.get('content_es', '')).strip()
-            slide_scene = scene_descriptions.get(idx + 2, "a realistic operational industrial environment showing measurable work in progress")
+            slide_title, slide_body = slide_texts[idx]
+            slide_scene = slide_scenes[idx]
             intent_hint = self._derive_intent_visual_hint(slide_title, slide_body)
             visual_mode = self._choose_visual_mode(slide_title, slide_body)
 
-            # Enforce meaning alignment: if scene is generic, regenerate with
-            # slide-specific context until we reach a minimum relevance score.
-            score, reasons = self._scene_relevance_score(slide_scene, slide_title, slide_body)
-            if score < 0.45:
-                print(f"DEBUG: Slide {idx+1} scene low relevance ({score:.2f}) -> {reasons}; regenerating")
-                for regen_attempt in range(2):
-                    try:
-                        improved = self._generate_scene_for_single_slide(
-                            post_title=title,
-                            style=style,
-                            visual_tone=visual_tone,
-                            color_tone=color_tone,
-                            slide_title=slide_title,
-                            slide_body=slide_body,
-                            previous_scene=slide_scene,
-                        )
-                        new_score, new_reasons = self._scene_relevance_score(improved, slide_title, slide_body)
-                        print(f"DEBUG: Slide {idx+1} regenerated scene attempt {regen_attempt+1}: score={new_score:.2f}")
-                        if new_score > score:
-                            slide_scene = improved
-                            score = new_score
-                            reasons = new_reasons
-                        if score >= 0.45:
-                            break
-                    except Exception as regen_err:
-                        print(f"DEBUG: Slide {idx+1} scene regeneration failed: {regen_err}")
-
-            lens = variation_lenses[idx % len(variation_lenses)]
+            lens = _VARIATION_LENSES[idx % len(_VARIATION_LENSES)]
             if visual_mode == 'symbolic':
                 image_prompts[f'slide_{idx}'] = (
                     f"Minimal, premium conceptual illustration with one central symbol representing this idea: {intent_hint}. "
@@ -575,56 +812,52 @@ class MediaGenerator:
                     f"{no_text_instruction}"
                 )
         
-        # Generate ALL images in parallel using 2 concurrent workers
-        # 2 workers avoids Google Imagen per-second burst limits while
-        # Generate images SEQUENTIALLY — one at a time with 2s gap
+        # Generate images SEQUENTIALLY by default — one at a time with 2s gap.
         # This is the ONLY reliable way to avoid Google Imagen QPM quota:
         # Each image takes ~10s + 2s gap = 12s between requests = 5 QPM max
         # Total for 7 images: ~84s (well within Render's 100-min timeout)
-        print(f"DEBUG: Generating {len(image_prompts)} photorealistic images SEQUENTIALLY via Imagen 3...")
+        # Projects with a higher Imagen quota can raise CAROUSEL_IMAGE_WORKERS.
+        # Images are produced in the background: title translation and page layout
+        # proceed meanwhile, and each page waits only for its own image.
         import time as _time
         img_start = _time.time()
-        generated_images = {}  # key -> PIL Image
         
         items = list(image_prompts.items())
-        for img_idx, (key, prompt) in enumerate(items):
-            print(f"  [{img_idx+1}/{len(items)}] Generating '{key}'...")
-            
-            success = False
-            for attempt in range(3):  # 3 attempts with escalating backoff
-                try:
-                    img_bytes = self.generate_realistic_image(prompt)
-                    img = Image.open(io.BytesIO(img_bytes))
-                    generated_images[key] = img
-                    success = True
-                    print(f"  [{img_idx+1}/{len(items)}] ✅ '{key}' generated ({len(img_bytes)} bytes)")
-                    break
-                except Exception as e:
-                    err_str = str(e)
-                    if ('429' in err_str or 'quota' in err_str.lower()) and attempt < 2:
-                        wait = 15 * (attempt + 1)  # 15s, then 30s
-                        print(f"  [{img_idx+1}/{len(items)}] ⚠️ '{key}' rate-limited (attempt {attempt+1}), retry in {wait}s...")
-                        _time.sleep(wait)
-                    else:
-                        print(f"  [{img_idx+1}/{len(items)}] ❌ '{key}' failed after {attempt+1} attempts: {e}")
-                        break
-            
-            if not success:
-                print(f"  [{img_idx+1}/{len(items)}] '{key}' will use gradient fallback")
-            
-            # 2s delay between images to stay well under QPM limit
-            if img_idx < len(items) - 1:
+        sequential = self.carousel_image_workers <= 1
+        workers = max(1, self.carousel_image_workers)
+        print(f"DEBUG: Generating {len(image_prompts)} photorealistic images via Imagen 3 ({workers} workers)...")
+
+        def gen_image(img_idx: int, key: str, prompt: str) -> Optional[Image.Image]:
+            # 2s delay between sequential images to stay well under QPM limit
+            if sequential and img_idx:
                 _time.sleep(2)
-        
-        img_elapsed = _time.time() - img_start
-        print(f"DEBUG: {len(generated_images)}/{len(image_prompts)} images generated in {img_elapsed:.1f}s")
+            img = self._generate_carousel_image(key, prompt, f"[{img_idx+1}/{len(items)}]")
+            if img is None:
+                return None
+            # Fit and tint here rather than in the page loop: PIL releases the GIL, so this
+            # overlaps the remaining Imagen calls and the pages only have to place the image.
+            # Sizing comes first so the blend and enhance passes run on page-sized pixels;
+            # slides use BILINEAR (visually equivalent at print size), the cover keeps LANCZOS
+            page_w, page_h = letter
+            if key == 'cover':
+                img.thumbnail((int(page_w * 0.85), int(page_h * 0.4)), Image.Resampling.LANCZOS)
+            else:
+                img.thumbnail((int(page_w * 0.65), int(page_h * 0.28)), Image.Resampling.BILINEAR)
+            return self._harmonize_image_with_style(img, style)
+
+        image_pool = _carousel_pool("imagen", workers)
+        image_futures = {
+            key: image_pool.submit(gen_image, img_idx, key, prompt)
+            for img_idx, (key, prompt) in enumerate(items)
+        }
         
         # ====================================================================
         # PHASE 2: Batch-translate titles in a single API call
         # ====================================================================
         
-        buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
+        buffer = sink if sink is not None else io.BytesIO()
+        # Compressed page streams: several times smaller for the text-heavy pages
+        c = canvas.Canvas(buffer, pagesize=letter, pageCompression=1)
         width, height = letter
         
         # Generate cover page
@@ -639,126 +872,117 @@ class MediaGenerator:
         
         # Wrap title to fit page width
         max_width = width - 100
-        title_lines = self._wrap_title(cover_title, "Helvetica-Bold", 36, max_width, c)
+        title_lines = self._wrap_title(cover_title, "Helvetica-Bold", 36, max_width)
         
         y_pos = height - 120
         for line in title_lines:
-            line_width = c.stringWidth(line, "Helvetica-Bold", 36)
+            line_width = _text_width(line, "Helvetica-Bold", 36)
             x_pos = (width - line_width) / 2
             c.drawString(x_pos, y_pos, line)
             y_pos -= 45
         
         # Pre-compute display titles first so translations match what is actually rendered.
-        normalized_slide_titles = []
-        for slide in slides:
+        # Long or missing titles are condensed together in a single Gemini call.
+        def title_source(slide: Dict) -> str:
             candidate_title = (slide.get('title', '') or '').strip()
-            content_en = slide.get('content_en', '')
-            content_fallback = slide.get('content', '')
-
             if not candidate_title or candidate_title.startswith('Key Point'):
-                content_preview = content_en or content_fallback
-                candidate_title = self._create_summary_title(content_preview, max_chars=65)
-            elif len(candidate_title) > 65:
-                candidate_title = self._create_summary_title(candidate_title, max_chars=65)
+                return slide.get('content_en', '') or slide.get('content', '')
+            return candidate_title
 
-            normalized_slide_titles.append(candidate_title)
+        normalized_slide_titles = self._create_summary_titles([title_source(slide) for slide in slides], max_chars=65)
 
-        # Pre-translate all titles in a SINGLE API call (instead of per-slide)
+        # Pre-translate all titles in a SINGLE API call (instead of per-slide).
+        # Titles already translated for earlier carousels come from _title_cache;
+        # only the rest are sent, and the call is skipped when nothing is left.
         slide_titles_es = {}
         cover_title_es = ""
         if is_bilingual_carousel:
             import re as _re
+            cover_title_es = _title_cache.get(_title_key("title_es", cover_title)) or ""
+            for idx, t in enumerate(normalized_slide_titles):
+                cached = _title_cache.get(_title_key("title_es", t)) if t else None
+                if cached:
+                    slide_titles_es[idx] = cached
+            
             # Build numbered list for reliable parsing
             all_titles_to_translate = []
             title_key_map = {}  # number -> ('cover' or slide idx)
             
             num = 1
-            all_titles_to_translate.append(f"{num}. {cover_title}")
-            title_key_map[num] = 'cover'
-            num += 1
+            if not cover_title_es:
+                all_titles_to_translate.append(f"{num}. {cover_title}")
+                title_key_map[num] = 'cover'
+                num += 1
             
             for idx, t in enumerate(normalized_slide_titles):
-                if t:
+                if t and idx not in slide_titles_es:
                     all_titles_to_translate.append(f"{num}. {t}")
                     title_key_map[num] = idx
                     num += 1
             
             try:
-                batch_prompt = (
-                    "You are translating LinkedIn carousel slide titles for a professional post about mining, technology, or business.\n"
-                    "RULES:\n"
-                    "1. Write NATURAL, idiomatic Spanish — do NOT translate word-for-word. Restructure phrases so they sound like a native Spanish speaker wrote them.\n"
-                    "2. KEEP company names, brand names, product names, and proper nouns EXACTLY as they appear in English (e.g. 'Applied Intuition', 'Heidelberg Materials', 'AI', 'SAP', 'Komatsu' stay unchanged).\n"
-                    "3. If a title is a short fragment or incomplete phrase, complete it naturally in Spanish so it reads as a coherent title.\n"
-                    "4. Prefer active, concise phrasing — avoid long literal translations.\n"
-                    "5. Return ONLY the numbered lines in the EXACT same numbered format. No explanations, no extra text.\n\n"
-                    "Translate each numbered line below:\n"
-                    + "\n".join(all_titles_to_translate)
-                )
-                batch_result = self._call_gemini(batch_prompt)
+                if all_titles_to_translate:
+                    batch_prompt = (
+                        "You are translating LinkedIn carousel slide titles for a professional post about mining, technology, or business.\n"
+                        "RULES:\n"
+                        "1. Write NATURAL, idiomatic Spanish — do NOT translate word-for-word. Restructure phrases so they sound like a native Spanish speaker wrote them.\n"
+                        "2. KEEP company names, brand names, product names, and proper nouns EXACTLY as they appear in English (e.g. 'Applied Intuition', 'Heidelberg Materials', 'AI', 'SAP', 'Komatsu' stay unchanged).\n"
+                        "3. If a title is a short fragment or incomplete phrase, complete it naturally in Spanish so it reads as a coherent title.\n"
+                        "4. Prefer active, concise phrasing — avoid long literal translations.\n"
+                        "5. Return ONLY the numbered lines in the EXACT same numbered format. No explanations, no extra text.\n\n"
+                        "Translate each numbered line below:\n"
+                        + "\n".join(all_titles_to_translate)
+                    )
+                    batch_result = self._call_gemini(batch_prompt)
                 
-                # Parse numbered responses robustly
-                print(f"DEBUG: Raw Gemini translation response: {repr(batch_result[:500])}")
-                for line in batch_result.strip().split('\n'):
-                    line = line.strip()
-                    # Strip markdown bold formatting (**text**)
-                    line = _re.sub(r'\*\*', '', line)
-                    if not line:
-                        continue
-                    match = _re.match(r'(\d+)[\.\)\-]\s*(.+)', line)
-                    if match:
-                        line_num = int(match.group(1))
-                        translation = match.group(2).strip()
-                        # Remove any quotes Gemini might add
-                        translation = translation.strip('"\'\'\u201c\u201d')
-                        key = title_key_map.get(line_num)
-                        if key == 'cover':
-                            cover_title_es = translation
-                            print(f"DEBUG: Cover title ES = {translation}")
-                        elif key is not None:  # slide index
-                            slide_titles_es[key] = translation
-                            print(f"DEBUG: Slide {key} title ES = {translation}")
+                    # Parse numbered responses robustly
+                    print(f"DEBUG: Raw Gemini translation response: {repr(batch_result[:500])}")
+                    for line in batch_result.strip().split('\n'):
+                        line = line.strip()
+                        # Strip markdown bold formatting (**text**)
+                        line = _re.sub(r'\*\*', '', line)
+                        if not line:
+                            continue
+                        match = _re.match(r'(\d+)[\.\)\-]\s*(.+)', line)
+                        if match:
+                            line_num = int(match.group(1))
+                            translation = match.group(2).strip()
+                            # Remove any quotes Gemini might add
+                            translation = translation.strip('"\'\'\u201c\u201d')
+                            key = title_key_map.get(line_num)
+                            if key == 'cover':
+                                cover_title_es = translation
+                                print(f"DEBUG: Cover title ES = {translation}")
+                            elif key is not None:  # slide index
+                                slide_titles_es[key] = translation
+                                print(f"DEBUG: Slide {key} title ES = {translation}")
                 
                 # Fallback: if cover wasn't parsed, use English
                 if not cover_title_es:
                     cover_title_es = cover_title
                 
-                # Fallback: translate any missing slide titles individually
-                for idx, t in enumerate(normalized_slide_titles):
-                    if t and idx not in slide_titles_es:
-                        try:
-                            individual = self._call_gemini(
-                                f"Translate this LinkedIn carousel slide title from English to natural Spanish.\nRULES: Keep company/brand names in English. Write idiomatic Spanish, not word-for-word. Return ONLY the Spanish title, nothing else.\nTitle: {t}"
-                            )
-                            cleaned = individual.strip().strip('"\'\'\u201c\u201d')
-                            if self._looks_untranslated(t, cleaned):
-                                retry = self._call_gemini(
-                                    f"Rewrite this as a natural Spanish LinkedIn carousel title. Keep proper nouns in English. Return only the Spanish title: {t}"
-                                )
-                                cleaned = retry.strip().strip('"\'\'\u201c\u201d')
-                            slide_titles_es[idx] = cleaned if cleaned else t
-                            print(f"DEBUG: Slide {idx} individually translated: {slide_titles_es[idx]}")
-                        except:
-                            slide_titles_es[idx] = t  # Last resort: English
+                # Fallback: translate any missing slide titles individually (concurrently)
+                missing = [idx for idx, t in enumerate(normalized_slide_titles) if t and idx not in slide_titles_es]
+                for idx, es in zip(missing, text_pool.map(self._translate_title_individually,
+                                                          [normalized_slide_titles[i] for i in missing])):
+                    slide_titles_es[idx] = es
+                    print(f"DEBUG: Slide {idx} individually translated: {es}")
                 
                 print(f"DEBUG: Batch-translated titles. slide_titles_es = {slide_titles_es}")
             except Exception as e:
                 print(f"Batch translation failed: {e}")
-                cover_title_es = cover_title  # Fallback: use English
+                cover_title_es = cover_title_es or cover_title  # Fallback: use English
                 # Even if batch fails, try translating individually
-                for idx, t in enumerate(normalized_slide_titles):
-                    if t:
-                        try:
-                            individual = self._call_gemini(f"Translate this LinkedIn carousel slide title from English to natural Spanish.\nRULES: Keep company/brand names in English. Write idiomatic Spanish, not word-for-word. Return ONLY the Spanish title, nothing else.\nTitle: {t}")
-                            cleaned = individual.strip().strip('"\'\'\u201c\u201d')
-                            if self._looks_untranslated(t, cleaned):
-                                retry = self._call_gemini(
-                                    f"Rewrite this as a natural Spanish LinkedIn carousel title. Keep proper nouns in English. Return only the Spanish title: {t}"
-                                )
-                                cleaned = retry.strip().strip('"\'\'\u201c\u201d')
-                            slide_titles_es[idx] = cleaned if cleaned else t
-                        except:
-                            slide_titles_es[idx] = t
+                missing = [idx for idx, t in enumerate(normalized_slide_titles) if t and idx not in slide_titles_es]
+                for idx, es in zip(missing, text_pool.map(self._translate_title_individually,
+                                                          [normalized_slide_titles[i] for i in missing])):
+                    slide_titles_es[idx] = es
+
+            # Remember real translations (not English fallbacks) for later carousels
+            for key, es in [('cover', cover_title_es)] + list(slide_titles_es.items()):
+                en = cover_title if key == 'cover' else normalized_slide_titles[key]
+                if es and es != en:
+                    _title_cache.set(_title_key("title_es", en), es)
 
         # Draw cover Spanish title if bilingual
         if is_bilingual_carousel and cover_title_es:
@@ -766,67 +990,38 @@ class MediaGenerator:
             c.setFillColorRGB(*color_scheme["secondary"])
             c.setFont("Helvetica-Oblique", 18)
             
-            # Wrap Spanish title if too long (max width 550px)
+            # Wrap Spanish title if too long (max width 550px); at most two lines,
+            # with everything past the first line on the second
             max_es_width = 550
-            if c.stringWidth(cover_title_es, "Helvetica-Oblique", 18) > max_es_width:
-                # Split into multiple lines
-                words = cover_title_es.split()
-                line1_words = []
-                line2_words = []
-                
-                for i, word in enumerate(words):
-                    test_line = ' '.join(line1_words + [word])
-                    if c.stringWidth(test_line, "Helvetica-Oblique", 18) <= max_es_width:
-                        line1_words.append(word)
-                    else:
-                        line2_words = words[i:]
-                        break
-                
-                # Draw line 1
-                line1 = ' '.join(line1_words)
-                if line1:
-                    title_width_es = c.stringWidth(line1, "Helvetica-Oblique", 18)
+            es_lines = self._wrap_title(cover_title_es, "Helvetica-Oblique", 18, max_es_width)
+            if len(es_lines) > 1:
+                for line in (es_lines[0], ' '.join(es_lines[1:])):
+                    title_width_es = _text_width(line, "Helvetica-Oblique", 18)
                     x_pos_es = (width - title_width_es) / 2
-                    c.drawString(x_pos_es, y_pos, line1)
-                    y_pos -= 24
-                
-                # Draw line 2
-                line2 = ' '.join(line2_words)
-                if line2:
-                    title_width_es = c.stringWidth(line2, "Helvetica-Oblique", 18)
-                    x_pos_es = (width - title_width_es) / 2
-                    c.drawString(x_pos_es, y_pos, line2)
+                    c.drawString(x_pos_es, y_pos, line)
                     y_pos -= 24
             else:
                 # Single line
-                title_width_es = c.stringWidth(cover_title_es, "Helvetica-Oblique", 18)
+                title_width_es = _text_width(cover_title_es, "Helvetica-Oblique", 18)
                 x_pos_es = (width - title_width_es) / 2
                 c.drawString(x_pos_es, y_pos, cover_title_es)
                 y_pos -= 28
         
         # Generate cover image using pre-generated AI image
         try:
-            cover_img = generated_images.get('cover')
+            cover_img = image_futures['cover'].result()
             if not cover_img:
-                # Fallback to gradient if Imagen failed for cover
-                cover_img = self._generate_cover_gradient(style, int(width * 0.85), int(height * 0.38))
+                # Fallback to a vector gradient panel if Imagen failed for cover
+                cover_w, cover_h = int(width * 0.85), int(height * 0.38)
+                self._draw_cover_gradient(c, style, (width - cover_w) / 2, y_pos - cover_h - 40, cover_w, cover_h)
             else:
-                cover_img = self._harmonize_image_with_style(cover_img, style)
-            
-            # Size for cover (fit within page)
-            cover_max_h = height * 0.4
-            cover_max_w = width * 0.85
-            cover_img.thumbnail((int(cover_max_w), int(cover_max_h)), Image.Resampling.LANCZOS)
-            
-            cover_buffer = io.BytesIO()
-            cover_img.save(cover_buffer, format='PNG')
-            cover_buffer.seek(0)
-            
-            img_x = (width - cover_img.width) / 2
-            img_y = y_pos - cover_img.height - 40
-            
-            c.drawImage(ImageReader(cover_buffer), img_x, img_y,
-                       width=cover_img.width, height=cover_img.height, mask='auto')
+                # Already fitted and tinted by the image worker
+                img_x = (width - cover_img.width) / 2
+                img_y = y_pos - cover_img.height - 40
+                
+                # ImageReader takes the PIL image directly; no PNG encode/decode round trip
+                c.drawImage(ImageReader(cover_img), img_x, img_y,
+                           width=cover_img.width, height=cover_img.height, mask='auto')
         except Exception as e:
             print(f"Cover image generation failed: {e}")
         
@@ -866,29 +1061,11 @@ class MediaGenerator:
             max_title_width = 520
             
             # Wrap title intelligently if needed
-            title_lines = []
-            if c.stringWidth(slide_title, "Helvetica-Bold", 20) > max_title_width:
-                # Split into lines that fit
-                words = slide_title.split()
-                current_line = []
-                
-                for word in words:
-                    test_line = ' '.join(current_line + [word])
-                    if c.stringWidth(test_line, "Helvetica-Bold", 20) <= max_title_width:
-                        current_line.append(word)
-                    else:
-                        if current_line:
-                            title_lines.append(' '.join(current_line))
-                        current_line = [word]
-                
-                if current_line:
-                    title_lines.append(' '.join(current_line))
-            else:
-                title_lines = [slide_title]
+            title_lines = self._wrap_title(slide_title, "Helvetica-Bold", 20, max_title_width)
             
             # Draw title lines (max 2 lines)
             for line in title_lines[:2]:
-                title_width = c.stringWidth(line, "Helvetica-Bold", 20)
+                title_width = _text_width(line, "Helvetica-Bold", 20)
                 title_x = (width - title_width) / 2
                 c.drawString(title_x, title_y, line)
                 title_y -= 26
@@ -899,7 +1076,7 @@ class MediaGenerator:
                 
                 c.setFillColorRGB(*color_scheme["secondary"])
                 c.setFont("Helvetica-Oblique", 14)
-                title_width_es = c.stringWidth(slide_title_es, "Helvetica-Oblique", 14)
+                title_width_es = _text_width(slide_title_es, "Helvetica-Oblique", 14)
                 title_x_es = (width - title_width_es) / 2
                 c.drawString(title_x_es, title_y, slide_title_es)
                 title_y -= 25
@@ -909,26 +1086,19 @@ class MediaGenerator:
             
             # Use pre-generated AI image for this slide
             try:
-                slide_img = generated_images.get(f'slide_{idx}')
+                slide_img = image_futures[f'slide_{idx}'].result()
                 if not slide_img:
-                    # Fallback to gradient if Imagen failed for this slide
-                    slide_img = self._generate_themed_gradient(style, int(width * 0.65), int(height * 0.28))
+                    # Fallback to a vector gradient panel if Imagen failed for this slide
+                    panel_w, panel_h = int(width * 0.65), int(height * 0.28)
+                    img_y = image_start_y - panel_h
+                    self._draw_themed_gradient(c, style, (width - panel_w) / 2, img_y, panel_w, panel_h)
                 else:
-                    # Resize AI image to fit slide area
-                    slide_img.thumbnail((int(width * 0.65), int(height * 0.28)), Image.Resampling.LANCZOS)
-                    slide_img = self._harmonize_image_with_style(slide_img, style)
-                
-                # Save to temp buffer
-                img_buffer = io.BytesIO()
-                slide_img.save(img_buffer, format='PNG')
-                img_buffer.seek(0)
-                
-                # Position image centered below title
-                img_x = (width - slide_img.width) / 2
-                img_y = image_start_y - slide_img.height
-                
-                c.drawImage(ImageReader(img_buffer), img_x, img_y, 
-                           width=slide_img.width, height=slide_img.height, mask='auto')
+                    # Position image centered below title
+                    img_x = (width - slide_img.width) / 2
+                    img_y = image_start_y - slide_img.height
+                    
+                    c.drawImage(ImageReader(slide_img), img_x, img_y, 
+                               width=slide_img.width, height=slide_img.height, mask='auto')
                 
                 content_start_y = img_y - 50
             except Exception as e:
@@ -995,7 +1165,7 @@ class MediaGenerator:
                 for bullet in bullets[:10]:
                     # Center each bullet
                     bullet_text = f"• {bullet}"
-                    text_width = c.stringWidth(bullet_text, "Helvetica", 13)
+                    text_width = _text_width(bullet_text, "Helvetica", 13)
                     x_pos = (width - text_width) / 2
                     c.drawString(x_pos, y_pos, bullet_text)
                     y_pos -= 22
@@ -1008,12 +1178,14 @@ class MediaGenerator:
             c.showPage()
         
         c.save()
+        generated = sum(1 for future in image_futures.values() if not future.exception() and future.result() is not None)
+        print(f"DEBUG: {generated}/{len(image_prompts)} images generated; carousel done in {_time.time() - img_start:.1f}s")
+        if sink is not None:
+            return None
         return buffer.getvalue()
     
     def _call_gemini(self, prompt_text: str, max_tokens: int = 500) -> str:
         """Call Gemini API with Vertex AI fallback for cloud environments"""
-        import json
-        
         is_cloud = os.getenv("RENDER") or os.getenv("RAILWAY_ENVIRONMENT")
         
         # Try consumer API first (only works locally, not on cloud)
@@ -1028,31 +1200,12 @@ class MediaGenerator:
             except Exception as e:
                 print(f"Consumer Gemini failed: {e}, trying Vertex AI...")
         
-        # Use Vertex AI (works on cloud servers)
-        import requests
-        from google.auth.transport.requests import Request
-        from google.oauth2 import service_account
-        
-        PROJECT_ID = os.getenv('GCP_PROJECT_ID', 'linkedin-post-factory')
+        # Use Vertex AI (works on cloud servers); credentials, token and connection
+        # are shared with Imagen and reused across calls
         LOCATION = 'us-central1'
         MODEL_ID = 'gemini-2.5-flash'
         
-        creds_b64 = os.getenv('GCP_CREDENTIALS_JSON_B64')
-        if not creds_b64:
-            raise Exception("No GCP_CREDENTIALS_JSON_B64 env var for Vertex AI")
-        
-        creds_json = base64.b64decode(creds_b64).decode('utf-8')
-        creds_data = json.loads(creds_json)
-        
-        credentials = service_account.Credentials.from_service_account_info(
-            creds_data,
-            scopes=['https://www.googleapis.com/auth/cloud-platform']
-        )
-        if not os.getenv('GCP_PROJECT_ID'):
-            PROJECT_ID = creds_data.get('project_id', PROJECT_ID)
-        
-        auth_req = Request()
-        credentials.refresh(auth_req)
+        access_token, PROJECT_ID = _vertex_access_token()
         
         url = f"https://{LOCATION}-aiplatform.googleapis.com/v1/projects/{PROJECT_ID}/locations/{LOCATION}/publishers/google/models/{MODEL_ID}:generateContent"
         
@@ -1061,10 +1214,10 @@ class MediaGenerator:
             "generationConfig": {"temperature": 0.7, "maxOutputTokens": max_tokens}
         }
         
-        response = requests.post(
+        response = _vertex_session().post(
             url,
             headers={
-                'Authorization': f'Bearer {credentials.token}',
+                'Authorization': f'Bearer {access_token}',
                 'Content-Type': 'application/json'
             },
             json=data,
@@ -1081,6 +1234,22 @@ class MediaGenerator:
         
         raise Exception(f"Vertex AI returned {response.status_code}: {response.text[:200]}")
 
+    def _translate_title_individually(self, title: str) -> str:
+        """Single-title translation fallback; returns the English title if Gemini fails"""
+        try:
+            individual = self._call_gemini(
+                f"Translate this LinkedIn carousel slide title from English to natural Spanish.\nRULES: Keep company/brand names in English. Write idiomatic Spanish, not word-for-word. Return ONLY the Spanish title, nothing else.\nTitle: {title}"
+            )
+            cleaned = individual.strip().strip('"\'\'\u201c\u201d')
+            if self._looks_untranslated(title, cleaned):
+                retry = self._call_gemini(
+                    f"Rewrite this as a natural Spanish LinkedIn carousel title. Keep proper nouns in English. Return only the Spanish title: {title}"
+                )
+                cleaned = retry.strip().strip('"\'\'\u201c\u201d')
+            return cleaned if cleaned else title
+        except Exception:
+            return title  # Last resort: English
+
     def _translate_to_spanish(self, english_text: str) -> str:
         """Translate English text to proper Spanish using Gemini API (with Vertex AI fallback)"""
         try:
@@ -1096,19 +1265,9 @@ Spanish:"""
             
             spanish_text = self._call_gemini(prompt_text)
             
-            # Clean up any markdown, labels, or extra formatting
+            # Clean up any markdown, then the labels Gemini might put in front
             spanish_text = spanish_text.replace('**', '').replace('*', '').strip()
-            
-            # Remove common prefixes that Gemini might add
-            prefixes_to_remove = [
-                'Spanish:', 'Translation:', 'Spanish translation:', 
-                'Translated:', 'Spanish Options', 'most common',
-                'direct first', '(', ')'
-            ]
-            for prefix in prefixes_to_remove:
-                if spanish_text.startswith(prefix):
-                    spanish_text = spanish_text[len(prefix):].strip()
-                spanish_text = spanish_text.replace(prefix + ':', '').strip()
+            spanish_text = _TRANSLATION_LABEL_RE.sub('', spanish_text, count=1).strip()
             
             # Remove any text after a colon (usually explanations)
             if ':' in spanish_text and spanish_text.index(':') < 30:
@@ -1234,6 +1393,66 @@ Spanish:"""
 
         return 'photo'
 
+    def _refine_slide_scene(
+        self,
+        idx: int,
+        slide_scene: str,
+        slide_title: str,
+        slide_body: str,
+        post_title: str,
+        style: str,
+        visual_tone: str,
+        color_tone: str,
+    ) -> str:
+        """Regenerate a generic slide scene (up to 2 tries) until it reaches a minimum relevance score"""
+        score, reasons = self._scene_relevance_score(slide_scene, slide_title, slide_body)
+        if score >= 0.45:
+            return slide_scene
+        print(f"DEBUG: Slide {idx+1} scene low relevance ({score:.2f}) -> {reasons}; regenerating")
+        for regen_attempt in range(2):
+            try:
+                improved = self._generate_scene_for_single_slide(
+                    post_title=post_title,
+                    style=style,
+                    visual_tone=visual_tone,
+                    color_tone=color_tone,
+                    slide_title=slide_title,
+                    slide_body=slide_body,
+                    previous_scene=slide_scene,
+                )
+                new_score, new_reasons = self._scene_relevance_score(improved, slide_title, slide_body)
+                print(f"DEBUG: Slide {idx+1} regenerated scene attempt {regen_attempt+1}: score={new_score:.2f}")
+                if new_score > score:
+                    slide_scene = improved
+                    score = new_score
+                if score >= 0.45:
+                    break
+            except Exception as regen_err:
+                print(f"DEBUG: Slide {idx+1} scene regeneration failed: {regen_err}")
+        return slide_scene
+
+    def _generate_carousel_image(self, key: str, prompt: str, label: str) -> Optional[Image.Image]:
+        """Generate one carousel image with 429/quota backoff; None means use the gradient fallback"""
+        import time as _time
+        print(f"  {label} Generating '{key}'...")
+        for attempt in range(3):  # 3 attempts with escalating backoff
+            try:
+                img_bytes = self.generate_realistic_image(prompt)
+                img = Image.open(io.BytesIO(img_bytes))
+                print(f"  {label} ✅ '{key}' generated ({len(img_bytes)} bytes)")
+                return img
+            except Exception as e:
+                err_str = str(e)
+                if ('429' in err_str or 'quota' in err_str.lower()) and attempt < 2:
+                    wait = 15 * (attempt + 1)  # 15s, then 30s
+                    print(f"  {label} ⚠️ '{key}' rate-limited (attempt {attempt+1}), retry in {wait}s...")
+                    _time.sleep(wait)
+                else:
+                    print(f"  {label} ❌ '{key}' failed after {attempt+1} attempts: {e}")
+                    break
+        print(f"  {label} '{key}' will use gradient fallback")
+        return None
+
     def _generate_scene_for_single_slide(
         self,
         post_title: str,
@@ -1289,6 +1508,11 @@ Spanish:"""
         if len(text.strip()) <= max_chars:
             return text.strip()
         
+        cache_key = _title_key("summary", text, max_chars=max_chars)
+        cached = _title_cache.get(cache_key)
+        if cached:
+            return cached
+        
         # Use Gemini to intelligently condense while keeping meaning
         try:
             prompt_text = f"""Condense this text into a short, compelling title (max {max_chars} characters).
@@ -1299,27 +1523,9 @@ Text: {text}
 
 Condensed title:"""
             
-            condensed = self._call_gemini(prompt_text)
-            
-            # Clean up
-            condensed = condensed.replace('**', '').replace('*', '').strip()
-            for prefix in ['Title:', 'Condensed:', 'Condensed title:']:
-                if condensed.startswith(prefix):
-                    condensed = condensed[len(prefix):].strip()
-            
-            # If still too long, truncate intelligently
-            if len(condensed) > max_chars:
-                words = condensed.split()
-                result = []
-                length = 0
-                for word in words:
-                    if length + len(word) + 1 <= max_chars:
-                        result.append(word)
-                        length += len(word) + 1
-                    else:
-                        break
-                condensed = ' '.join(result)
-            
+            condensed = self._clean_condensed_title(self._call_gemini(prompt_text), max_chars)
+            if condensed:
+                _title_cache.set(cache_key, condensed)
             return condensed
         except:
             # Fallback: take first sentence/phrase
@@ -1329,6 +1535,65 @@ Condensed title:"""
                 return ' '.join(words)
             return first_sentence
     
+    def _clean_condensed_title(self, condensed: str, max_chars: int) -> str:
+        """Strip markdown and label prefixes from a Gemini title, truncating on word boundaries"""
+        condensed = condensed.replace('**', '').replace('*', '').strip()
+        for prefix in ['Title:', 'Condensed:', 'Condensed title:']:
+            if condensed.startswith(prefix):
+                condensed = condensed[len(prefix):].strip()
+        
+        # If still too long, truncate intelligently
+        if len(condensed) > max_chars:
+            words = condensed.split()
+            result = []
+            length = 0
+            for word in words:
+                if length + len(word) + 1 <= max_chars:
+                    result.append(word)
+                    length += len(word) + 1
+                else:
+                    break
+            condensed = ' '.join(result)
+        
+        return condensed
+    
+    def _create_summary_titles(self, texts: List[str], max_chars: int = 60) -> List[str]:
+        """
+        _create_summary_title for many texts: every uncached text that needs condensing
+        goes into one numbered Gemini prompt (like the carousel title translation batch).
+        Lines missing from the reply fall back to concurrent per-text calls.
+        """
+        titles = [self._create_summary_title(text, max_chars) if len((text or '').strip()) <= max_chars
+                  else _title_cache.get(_title_key("summary", text, max_chars=max_chars))
+                  for text in texts]
+        pending = [i for i, t in enumerate(titles) if t is None]
+        if len(pending) > 1:
+            prompt_text = (
+                f"Condense each numbered text below into a short, compelling title (max {max_chars} characters).\n"
+                "Keep the core meaning but make it concise and punchy.\n"
+                "Return ONLY the condensed titles as numbered lines in the EXACT same numbered format. No explanations.\n\n"
+                + "\n".join(f"{num}. {' '.join(texts[i].split())}" for num, i in enumerate(pending, 1))
+            )
+            try:
+                import re as _re
+                for line in self._call_gemini(prompt_text, max_tokens=max(500, 100 * len(pending))).strip().split('\n'):
+                    match = _re.match(r'(\d+)[\.\)\-]\s*(.+)', _re.sub(r'\*\*', '', line.strip()))
+                    if match and 1 <= int(match.group(1)) <= len(pending):
+                        condensed = self._clean_condensed_title(match.group(2).strip('"\'\u201c\u201d'), max_chars)
+                        if condensed:
+                            i = pending[int(match.group(1)) - 1]
+                            titles[i] = condensed
+                            _title_cache.set(_title_key("summary", texts[i], max_chars=max_chars), condensed)
+            except Exception as e:
+                print(f"Batch title condensing failed: {e}")
+        
+        missing = [i for i, t in enumerate(titles) if t is None]
+        if missing:
+            pool = _carousel_pool("text", max(1, self.carousel_scene_workers))
+            for i, condensed in zip(missing, pool.map(lambda i: self._create_summary_title(texts[i], max_chars), missing)):
+                titles[i] = condensed
+        return titles
+    
     def _format_as_bullets(self, text: str) -> List[str]:
         """Convert text into bullet points, ensuring each ends with period"""
         if not text.strip():
@@ -1348,20 +1613,26 @@ Condensed title:"""
         
         return bullets[:10]  # Max 10 bullets per slide
     
-    def _wrap_title(self, text: str, font_name: str, font_size: int, max_width: float, canvas_obj) -> List[str]:
-        """Wrap title text to fit within max width"""
-        words = text.split()
+    def _wrap_title(self, text: str, font_name: str, font_size: int, max_width: float) -> List[str]:
+        """
+        Wrap title text to fit within max width. Measures each word once and keeps a
+        running line width (standard PDF font widths are additive) instead of
+        re-measuring the whole candidate line for every word.
+        """
+        space_width = _text_width(' ', font_name, font_size)
         lines = []
         current_line = []
+        current_width = 0.0
         
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            if canvas_obj.stringWidth(test_line, font_name, font_size) <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
+        for word in text.split():
+            word_width = _text_width(word, font_name, font_size)
+            if current_line and current_width + space_width + word_width > max_width:
+                lines.append(' '.join(current_line))
                 current_line = [word]
+                current_width = word_width
+            else:
+                current_width += (space_width if current_line else 0) + word_width
+                current_line.append(word)
         
         if current_line:
             lines.append(' '.join(current_line))
@@ -1369,105 +1640,45 @@ Condensed title:"""
         return lines if lines else [text]
     
     def _wrap_text(self, text: str, max_chars_per_line: int) -> List[str]:
-        """Helper to wrap text into lines"""
-        lines = []
-        
+        """Helper to wrap text into lines (blank source lines become " ")"""
         if not text.strip():
             return [" "]
         
+        # A line of words plus its trailing separator must fit max_chars_per_line
+        wrapper = textwrap.TextWrapper(
+            width=max(1, max_chars_per_line - 1),
+            break_long_words=False,
+            break_on_hyphens=False
+        )
+        lines = []
         for raw_line in text.split('\n'):
-            words = raw_line.split()
-            if not words:
-                lines.append(" ")
-                continue
-                
-            current_line = ""
-            for word in words:
-                if len(current_line) + len(word) + 1 <= max_chars_per_line:
-                    current_line += (word + " ")
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word + " "
-            if current_line:
-                lines.append(current_line)
+            lines.extend(wrapper.wrap(' '.join(raw_line.split())) or [" "])
         
         return lines
     
     def generate_realistic_image(self, prompt: str) -> bytes:
-        """Generate photorealistic image using Vertex AI Imagen 3"""
+        """Generate photorealistic image using Vertex AI Imagen 3 (cached by prompt)"""
+        # Only real Imagen output is cached; the gradient placeholder below never is
+        cache_key = imagen_cache.make_key("realistic", prompt=prompt)
+        cached = imagen_cache.get_memory(cache_key) or imagen_cache.get_disk(cache_key, "png")
+        if cached is not None:
+            print(f"♻️ Imagen cache hit ({len(cached)} bytes)")
+            return cached
+        
         try:
-            import requests
-            import json
-            from google.auth.transport.requests import Request
-            from google.oauth2 import service_account
-            
             # Vertex AI configuration - use new clean project
-            PROJECT_ID = os.getenv('GCP_PROJECT_ID', 'linkedin-post-factory')
             LOCATION = 'us-central1'
             MODEL_NAME = 'imagen-3.0-generate-001'
             
+            # Access token (refreshed only when missing or expired)
+            access_token, PROJECT_ID = _vertex_access_token()
             print(f"🎨 Generating image via Vertex AI Imagen 3...")
             print(f"   Project: {PROJECT_ID}")
             print(f"   Prompt: {prompt[:80]}...")
             
-            # Load credentials from GCP_CREDENTIALS_JSON_B64 (same as vertex_wrapper.py)
-            credentials = None
-            creds_b64 = os.getenv('GCP_CREDENTIALS_JSON_B64')
-            
-            if creds_b64:
-                print(f"   Using credentials from GCP_CREDENTIALS_JSON_B64")
-                creds_json = base64.b64decode(creds_b64).decode('utf-8')
-                creds_data = json.loads(creds_json)
-                
-                cred_type = creds_data.get('type', '')
-                if cred_type == 'service_account':
-                    credentials = service_account.Credentials.from_service_account_info(
-                        creds_data,
-                        scopes=['https://www.googleapis.com/auth/cloud-platform']
-                    )
-                    # Use project from credentials if not set
-                    if not os.getenv('GCP_PROJECT_ID'):
-                        PROJECT_ID = creds_data.get('project_id', PROJECT_ID)
-                else:
-                    from google.oauth2.credentials import Credentials
-                    credentials = Credentials(
-                        token=None,
-                        refresh_token=creds_data.get('refresh_token'),
-                        token_uri='https://oauth2.googleapis.com/token',
-                        client_id=creds_data.get('client_id'),
-                        client_secret=creds_data.get('client_secret'),
-                        scopes=['https://www.googleapis.com/auth/cloud-platform']
-                    )
-            else:
-                # Fallback: try GOOGLE_APPLICATION_CREDENTIALS file path
-                creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-                if creds_path and os.path.exists(creds_path):
-                    print(f"   Using credentials from: {creds_path}")
-                    credentials = service_account.Credentials.from_service_account_file(
-                        creds_path,
-                        scopes=['https://www.googleapis.com/auth/cloud-platform']
-                    )
-                else:
-                    print(f"   Using default credentials (ADC)")
-                    from google.auth import default
-                    credentials, project = default(
-                        scopes=['https://www.googleapis.com/auth/cloud-platform']
-                    )
-            
-            if not credentials:
-                raise Exception("No credentials available for Vertex AI")
-            
-            # Get access token
-            auth_req = Request()
-            credentials.refresh(auth_req)
-            access_token = credentials.token
-            
             if not access_token:
                 raise Exception("Failed to get OAuth2 access token")
             
-            print(f"   ✅ Access token obtained")
-            
             # Build the Vertex AI endpoint URL
             url = f"https://{LOCATION}-aiplatform.googleapis.com/v1/projects/{PROJECT_ID}/locations/{LOCATION}/publishers/google/models/{MODEL_NAME}:predict"
             
@@ -1481,8 +1692,8 @@ Condensed title:"""
                 }
             }
             
-            # Make request with OAuth2 Bearer token
-            response = requests.post(
+            # Make request with OAuth2 Bearer token (pooled keep-alive connection)
+            response = _vertex_session().post(
                 url,
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -1501,6 +1712,7 @@ Condensed title:"""
                     if base64_image:
                         image_bytes = base64.b64decode(base64_image)
                         print(f"✅ Generated {len(image_bytes)} bytes via Vertex AI Imagen 3")
+                        imagen_cache.set(cache_key, "png", image_bytes)
                         return image_bytes
             
             # If we got here, something went wrong
@@ -1522,37 +1734,40 @@ Condensed title:"""
             print(f"   Falling back to clean gradient placeholder")
             
             # Fallback: Clean professional gradient (no text overlay)
-            img = Image.new('RGB', (1200, 675), (15, 20, 30))
-            draw = ImageDraw.Draw(img)
-            
-            # Multi-layer gradient for depth
-            for y in range(675):
-                factor = y / 675
-                r = int(15 + 45 * factor)
-                g = int(20 + 120 * factor)
-                b = int(30 + 180 * factor)
-                draw.line([(0, y), (1200, y)], fill=(r, g, b))
-            
-            # Add geometric overlay for visual interest
-            overlay = Image.new('RGBA', (1200, 675), (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            
-            # Diagonal lines pattern
-            for i in range(0, 1400, 100):
-                overlay_draw.line([(i-200, 0), (i, 675)], fill=(255, 255, 255, 8), width=2)
-            
-            # Subtle circle accents
-            for cx, cy, r in [(200, 200, 120), (900, 400, 160), (600, 100, 80)]:
-                overlay_draw.ellipse(
-                    [(cx-r, cy-r), (cx+r, cy+r)],
-                    outline=(255, 255, 255, 15), width=2
-                )
-            
-            img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
-            
-            output = io.BytesIO()
-            img.save(output, format='PNG', quality=95)
-            return output.getvalue()
+            return self._imagen_placeholder()
+    
+    def _imagen_placeholder(self) -> bytes:
+        """
+        Gradient placeholder PNG for failed Imagen calls. Its inputs are constant, so it
+        is rendered and encoded once per process and reused for every later failure.
+        """
+        global _imagen_placeholder_png
+        if _imagen_placeholder_png is not None:
+            return _imagen_placeholder_png
+        
+        img = self._vertical_gradient(1200, 675, (15, 20, 30), (45, 120, 180))
+        
+        # Add geometric overlay for visual interest
+        overlay = Image.new('RGBA', (1200, 675), (0, 0, 0, 0))
+        overlay_draw = ImageDraw.Draw(overlay)
+        
+        # Diagonal lines pattern
+        for i in range(0, 1400, 100):
+            overlay_draw.line([(i-200, 0), (i, 675)], fill=(255, 255, 255, 8), width=2)
+        
+        # Subtle circle accents
+        for cx, cy, r in [(200, 200, 120), (900, 400, 160), (600, 100, 80)]:
+            overlay_draw.ellipse(
+                [(cx-r, cy-r), (cx+r, cy+r)],
+                outline=(255, 255, 255, 15), width=2
+            )
+        
+        img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+        
+        output = io.BytesIO()
+        img.save(output, format='PNG', quality=95)
+        _imagen_placeholder_png = output.getvalue()
+        return _imagen_placeholder_png
     
     def _get_bg_color(self, style: str) -> Tuple[int, int, int]:
         """Get background color for style"""
@@ -1576,8 +1791,32 @@ Condensed title:"""
         }
         return colors.get(style, (74, 158, 255))
     
-    def _generate_themed_gradient(self, style: str, width: int, height: int) -> Image.Image:
-        """Generate a professional themed gradient image matching carousel style"""
+    def _vertical_gradient(self, width: int, height: int, top: Tuple[int, int, int],
+                           delta: Tuple[int, int, int]) -> Image.Image:
+        """Top-to-bottom gradient (row y = top + delta * y / height) built as one array, not per-row draws"""
+        factor = np.arange(height, dtype=np.float64)[:, None] / height
+        rows = (np.asarray(top, dtype=np.float64) + factor * np.asarray(delta, dtype=np.float64)).astype(np.uint8)
+        return Image.fromarray(np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3))), 'RGB')
+
+    @staticmethod
+    def _pdf_rgb(rgb: Tuple[int, int, int]) -> Tuple[float, float, float]:
+        return (rgb[0] / 255, rgb[1] / 255, rgb[2] / 255)
+
+    def _draw_vertical_shading(self, c, x: float, y: float, width: float, height: float,
+                               stops: List[Tuple[int, int, int]]) -> None:
+        """Native PDF linear shading clipped to the box, first stop at the top"""
+        path = c.beginPath()
+        path.rect(x, y, width, height)
+        c.clipPath(path, stroke=0, fill=0)
+        c.linearGradient(
+            x, y + height, x, y,
+            [colors.Color(*self._pdf_rgb(stop)) for stop in stops],
+            [i / (len(stops) - 1) for i in range(len(stops))],
+            extend=False
+        )
+
+    def _draw_themed_gradient(self, c, style: str, x: float, y: float, width: float, height: float) -> None:
+        """Draw a professional themed gradient panel (slide image fallback) as vector PDF content"""
         import random
         
         # Style-specific gradient colors (start_rgb, end_rgb, accent_rgb)
@@ -1590,49 +1829,36 @@ Condensed title:"""
         }
         
         start, end, accent = gradients.get(style, gradients["professional"])
+        top = y + height
         
-        # Create gradient
-        img = Image.new('RGB', (width, height), start)
-        draw = ImageDraw.Draw(img)
-        
-        for y in range(height):
-            factor = y / height
-            r = int(start[0] + (end[0] - start[0]) * factor)
-            g = int(start[1] + (end[1] - start[1]) * factor)
-            b = int(start[2] + (end[2] - start[2]) * factor)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
+        c.saveState()
+        self._draw_vertical_shading(c, x, y, width, height, [start, end])
         
-        # Add subtle geometric overlay
-        overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        
-        # Diagonal lines
-        for i in range(0, width + height, 60):
-            overlay_draw.line([(i - height, 0), (i, height)], fill=(255, 255, 255, 6), width=1)
+        # Subtle geometric overlay: diagonal lines
+        c.setLineWidth(1)
+        c.setStrokeColorRGB(1, 1, 1, alpha=6 / 255)
+        for i in range(0, int(width + height), 60):
+            c.line(x + i - height, top, x + i, y)
         
         # Accent circles
         random.seed(hash(style))  # Deterministic per style
+        c.setLineWidth(2)
+        c.setStrokeColorRGB(*self._pdf_rgb(accent), alpha=25 / 255)
         for _ in range(3):
             cx = random.randint(int(width * 0.1), int(width * 0.9))
             cy = random.randint(int(height * 0.1), int(height * 0.9))
             r = random.randint(30, 80)
-            overlay_draw.ellipse(
-                [(cx - r, cy - r), (cx + r, cy + r)],
-                outline=(*accent, 25), width=2
-            )
+            c.circle(x + cx, top - cy, r, stroke=1, fill=0)
         
         # Horizontal accent line
-        line_y = height // 2
-        overlay_draw.line(
-            [(int(width * 0.15), line_y), (int(width * 0.85), line_y)],
-            fill=(*accent, 20), width=1
-        )
-        
-        img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
-        return img
+        c.setLineWidth(1)
+        c.setStrokeColorRGB(*self._pdf_rgb(accent), alpha=20 / 255)
+        line_y = top - height / 2
+        c.line(x + width * 0.15, line_y, x + width * 0.85, line_y)
+        c.restoreState()
 
-    def _generate_cover_gradient(self, style: str, width: int, height: int) -> Image.Image:
-        """Generate a premium cover gradient image with more visual richness than slide gradients"""
+    def _draw_cover_gradient(self, c, style: str, x: float, y: float, width: float, height: float) -> None:
+        """Draw a premium cover gradient panel (cover image fallback) as vector PDF content"""
         import random, math
         
         # Richer gradient palettes for covers (primary, secondary, highlight, accent)
@@ -1645,78 +1871,54 @@ Condensed title:"""
         }
         
         p1, p2, p3, accent = palettes.get(style, palettes["professional"])
+        accent_rgb = self._pdf_rgb(accent)
+        top = y + height
         
-        # Create multi-stop vertical gradient (fast line-based)
-        img = Image.new('RGB', (width, height), p1)
-        draw = ImageDraw.Draw(img)
-        
-        for y in range(height):
-            factor = y / height
-            if factor < 0.5:
-                t = factor * 2
-                r = int(p1[0] + (p2[0] - p1[0]) * t)
-                g = int(p1[1] + (p2[1] - p1[1]) * t)
-                b = int(p1[2] + (p2[2] - p1[2]) * t)
-            else:
-                t = (factor - 0.5) * 2
-                r = int(p2[0] + (p3[0] - p2[0]) * t)
-                g = int(p2[1] + (p3[1] - p2[1]) * t)
-                b = int(p2[2] + (p3[2] - p2[2]) * t)
-            draw.line([(0, y), (width, y)], fill=(min(255, r), min(255, g), min(255, b)))
-        
-        # Apply slight blur for smoothness
-        img = img.filter(ImageFilter.GaussianBlur(radius=2))
-        
-        # Rich overlay with geometric design
-        overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
+        # Multi-stop vertical gradient; a PDF shading is already smooth, no blur pass needed
+        c.saveState()
+        self._draw_vertical_shading(c, x, y, width, height, [p1, p2, p3])
         
         # Grid of subtle dots
         dot_spacing = 40
-        for x in range(0, width, dot_spacing):
-            for y in range(0, height, dot_spacing):
-                overlay_draw.ellipse(
-                    [(x - 1, y - 1), (x + 1, y + 1)],
-                    fill=(255, 255, 255, 8)
-                )
+        c.setFillColorRGB(1, 1, 1, alpha=8 / 255)
+        for dx in range(0, int(width), dot_spacing):
+            for dy in range(0, int(height), dot_spacing):
+                c.circle(x + dx, top - dy, 1, stroke=0, fill=1)
         
         # Flowing curves
         random.seed(hash(style) + 42)
+        c.setLineWidth(2)
+        c.setStrokeColorRGB(*accent_rgb, alpha=18 / 255)
         for curve_idx in range(3):
-            points = []
             base_y = height * (0.25 + curve_idx * 0.25)
-            for x in range(0, width, 4):
-                y_offset = math.sin(x / 80 + curve_idx * 2) * 30 + math.cos(x / 120) * 15
-                points.append((x, int(base_y + y_offset)))
-            if len(points) > 1:
-                overlay_draw.line(points, fill=(*accent, 18), width=2)
+            path = c.beginPath()
+            for i, dx in enumerate(range(0, int(width), 4)):
+                y_offset = math.sin(dx / 80 + curve_idx * 2) * 30 + math.cos(dx / 120) * 15
+                point = (x + dx, top - (base_y + y_offset))
+                if i == 0:
+                    path.moveTo(*point)
+                else:
+                    path.lineTo(*point)
+            c.drawPath(path, stroke=1, fill=0)
         
         # Large accent circles (glass-like)
         for _ in range(5):
-            cx = random.randint(0, width)
-            cy = random.randint(0, height)
+            cx = random.randint(0, int(width))
+            cy = random.randint(0, int(height))
             radius = random.randint(40, 120)
-            overlay_draw.ellipse(
-                [(cx - radius, cy - radius), (cx + radius, cy + radius)],
-                outline=(*accent, 15), width=2
-            )
+            c.setLineWidth(2)
+            c.setStrokeColorRGB(*accent_rgb, alpha=15 / 255)
+            c.circle(x + cx, top - cy, radius, stroke=1, fill=0)
             # Inner ring
-            inner_r = int(radius * 0.7)
-            overlay_draw.ellipse(
-                [(cx - inner_r, cy - inner_r), (cx + inner_r, cy + inner_r)],
-                outline=(255, 255, 255, 8), width=1
-            )
+            c.setLineWidth(1)
+            c.setStrokeColorRGB(1, 1, 1, alpha=8 / 255)
+            c.circle(x + cx, top - cy, int(radius * 0.7), stroke=1, fill=0)
         
         # Bottom accent bar
         bar_height = 4
-        overlay_draw.rectangle(
-            [(int(width * 0.1), height - bar_height - 10),
-             (int(width * 0.9), height - 10)],
-            fill=(*accent, 40)
-        )
-        
-        img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
-        return img
+        c.setFillColorRGB(*accent_rgb, alpha=40 / 255)
+        c.rect(x + width * 0.1, y + 10, width * 0.8, bar_height, stroke=0, fill=1)
+        c.restoreState()
 
     async def generate_interactive_html(
         self,
@@ -1772,12 +1974,8 @@ Requirements:
         img = Image.new('RGB', (self.base_width, self.base_height), '#1e1e1e')
         draw = ImageDraw.Draw(img)
         
-        try:
-            font = ImageFont.truetype("arial.ttf", 24)
-            title_font = ImageFont.truetype("arialbd.ttf", 32)
-        except:
-            font = ImageFont.load_default()
-            title_font = ImageFont.load_default()
+        font = _font("arial.ttf", 24)
+        title_font = _font("arialbd.ttf", 32)
         
         draw.text((60, 100), "AI Image Generation", fill='#4a9eff', font=title_font)
         draw.text((60, 180), "Prompt:", fill='#ffffff', font=font)
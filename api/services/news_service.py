@@ -2,6 +2,7 @@
 News and Trending Topics Service
 Fetches trending news articles and live channel topics for LinkedIn post generation.
 """
+import asyncio
 import json
 import os
 import re
@@ -11,6 +12,7 @@ from urllib.parse import quote_plus
 from xml.etree import ElementTree as ET
 
 import google.generativeai as genai
+import httpx
 import requests
 try:
     from core.vertex_wrapper import VertexWrapper
@@ -132,7 +134,17 @@ class NewsService:
     NORTH_AMERICA_TERMS = ["canada", "usa", "united states", "north america", "americas"]
     SOUTH_AFRICA_AUSTRALIA_TERMS = ["south africa", "australia", "queensland", "western australia"]
     
+    RSS_TIMEOUT_SECONDS = 15
+
     def __init__(self):
+        # Shared HTTP clients keep connections to news.google.com alive between fetches
+        self.session = requests.Session()
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=self.RSS_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+
         # Initialize Vertex AI (Enterprise)
         if VertexWrapper:
             self.vertex = VertexWrapper()
@@ -326,9 +338,27 @@ class NewsService:
         # Return requested count
         return articles[:count]
 
+    async def aclose(self) -> None:
+        """Close the shared HTTP clients."""
+        await self.client.aclose()
+        self.session.close()
+
     def get_live_channel_topics(self, channel: str, count: int = 8) -> List[Dict]:
         """Get live hottest topics for a channel using current news/web signals."""
         articles = self._get_live_articles_for_channel(channel, per_query=6)
+        return self._topics_from_articles(channel, articles, count)
+
+    async def get_live_channel_topics_async(self, channel: str, count: int = 8) -> List[Dict]:
+        """Async variant of get_live_channel_topics: RSS queries are fetched concurrently."""
+        queries = self.CHANNEL_QUERY_MAP.get(channel, self.CHANNEL_QUERY_MAP["other"])
+        results = await asyncio.gather(
+            *(self._fetch_google_news_rss_async(query, limit=6) for query in queries)
+        )
+        articles = self._dedupe_articles(results)
+        # Ranking may call Gemini/Vertex synchronously, so keep it off the event loop
+        return await asyncio.to_thread(self._topics_from_articles, channel, articles, count)
+
+    def _topics_from_articles(self, channel: str, articles: List[Dict], count: int) -> List[Dict]:
         if not articles:
             return self._fallback_live_topics(channel, count)
 
@@ -337,11 +367,17 @@ class NewsService:
 
     def _get_live_articles_for_channel(self, channel: str, per_query: int = 6) -> List[Dict]:
         queries = self.CHANNEL_QUERY_MAP.get(channel, self.CHANNEL_QUERY_MAP["other"])
+        return self._dedupe_articles(
+            self._fetch_google_news_rss(query, limit=per_query) for query in queries
+        )
+
+    @staticmethod
+    def _dedupe_articles(article_lists) -> List[Dict]:
         articles: List[Dict] = []
         seen_links = set()
 
-        for query in queries:
-            for article in self._fetch_google_news_rss(query, limit=per_query):
+        for batch in article_lists:
+            for article in batch:
                 link = article.get("url")
                 if not link or link in seen_links:
                     continue
@@ -350,39 +386,55 @@ class NewsService:
 
         return articles
 
+    @staticmethod
+    def _google_news_rss_url(query: str) -> str:
+        return f"https://news.google.com/rss/search?q={quote_plus(query)}&hl=en-US&gl=US&ceid=US:en"
+
     def _fetch_google_news_rss(self, query: str, limit: int = 6) -> List[Dict]:
-        rss_url = f"https://news.google.com/rss/search?q={quote_plus(query)}&hl=en-US&gl=US&ceid=US:en"
         try:
-            response = requests.get(rss_url, timeout=15)
+            response = self.session.get(self._google_news_rss_url(query), timeout=self.RSS_TIMEOUT_SECONDS)
             response.raise_for_status()
-            root = ET.fromstring(response.text)
-            items = root.findall(".//item")
-            results = []
-            for item in items[:limit]:
-                title = (item.findtext("title") or "").strip()
-                link = (item.findtext("link") or "").strip()
-                pub_date = (item.findtext("pubDate") or "").strip()
-                source = "Google News"
-
-                if " - " in title:
-                    title_parts = title.rsplit(" - ", 1)
-                    if len(title_parts) == 2:
-                        title, source = title_parts[0].strip(), title_parts[1].strip()
-
-                results.append(
-                    {
-                        "title": title,
-                        "url": link,
-                        "source": source,
-                        "published_at": pub_date,
-                        "query": query,
-                    }
-                )
-            return results
+            return self._parse_google_news_rss(response.text, query, limit)
         except Exception as e:
             print(f"Warning: RSS fetch failed for query '{query}': {e}")
             return []
 
+    async def _fetch_google_news_rss_async(self, query: str, limit: int = 6) -> List[Dict]:
+        try:
+            response = await self.client.get(self._google_news_rss_url(query))
+            response.raise_for_status()
+            return self._parse_google_news_rss(response.text, query, limit)
+        except Exception as e:
+            print(f"Warning: RSS fetch failed for query '{query}': {e}")
+            return []
+
+    @staticmethod
+    def _parse_google_news_rss(xml_text: str, query: str, limit: int) -> List[Dict]:
+        root = ET.fromstring(xml_text)
+        items = root.findall(".//item")
+        results = []
+        for item in items[:limit]:
+            title = (item.findtext("title") or "").strip()
+            link = (item.findtext("link") or "").strip()
+            pub_date = (item.findtext("pubDate") or "").strip()
+            source = "Google News"
+
+            if " - " in title:
+                title_parts = title.rsplit(" - ", 1)
+                if len(title_parts) == 2:
+                    title, source = title_parts[0].strip(), title_parts[1].strip()
+
+            results.append(
+                {
+                    "title": title,
+                    "url": link,
+                    "source": source,
+                    "published_at": pub_date,
+                    "query": query,
+                }
+            )
+        return results
+
     def _rank_topics_from_articles(self, channel: str, articles: List[Dict], count: int) -> List[Dict]:
         scored = self._score_articles(channel, articles)
         scored_sorted = sorted(scored, key=lambda x: x.get("trend_score", 0), reverse=True)
@@ -2,7 +2,7 @@
 Supabase Storage Service
 Handles media upload/download to Supabase Storage
 """
-from supabase import Client
+from supabase import Client, create_client
 from typing import Optional
 import os
 import uuid
@@ -17,6 +17,15 @@ class StorageService:
         self.bucket_name = "post-media"
         self._ensure_bucket_exists()
     
+    @classmethod
+    def from_env(cls) -> "StorageService":
+        """Build the service on its own Supabase client (SUPABASE_URL + SUPABASE_SERVICE_KEY/SUPABASE_KEY)"""
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_SERVICE_KEY") or os.getenv("SUPABASE_KEY")
+        if not url or not key:
+            raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY (or SUPABASE_KEY) must be set")
+        return cls(create_client(url, key))
+
     def _ensure_bucket_exists(self):
         """Create bucket if it doesn't exist"""
         try:
@@ -32,12 +41,23 @@ class StorageService:
             except Exception as e:
                 print(f"Bucket creation info: {e}")
     
+    def media_path(self, post_id: str, media_type: str, file_extension: str = "png") -> str:
+        """Unique object path for a new media file"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        unique_id = str(uuid.uuid4())[:8]
+        return f"{post_id}/{media_type}_{timestamp}_{unique_id}.{file_extension}"
+
+    def public_url(self, file_path: str) -> str:
+        """Public URL of an object path (no network call; valid once the upload lands)"""
+        return self.client.storage.from_(self.bucket_name).get_public_url(file_path)
+
     def upload_media(
         self,
         file_bytes: bytes,
         post_id: str,
         media_type: str,
-        file_extension: str = "png"
+        file_extension: str = "png",
+        file_path: Optional[str] = None
     ) -> str:
         """
         Upload media file to Supabase Storage
@@ -47,14 +67,12 @@ class StorageService:
             post_id: Associated post ID
             media_type: Type of media (code, chart, infographic, etc.)
             file_extension: File extension (png, pdf, jpg)
+            file_path: Object path reserved earlier via media_path (generated if omitted)
             
         Returns:
             Public URL of uploaded file
         """
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
-        filename = f"{post_id}/{media_type}_{timestamp}_{unique_id}.{file_extension}"
+        filename = file_path or self.media_path(post_id, media_type, file_extension)
         
         # Upload file
         try:
@@ -64,13 +82,29 @@ class StorageService:
                 {"content-type": self._get_content_type(file_extension)}
             )
             
-            # Get public URL
-            public_url = self.client.storage.from_(self.bucket_name).get_public_url(filename)
-            return public_url
+            return self.public_url(filename)
             
         except Exception as e:
-            print(f"Upload error: {e}")
-            raise Exception(f"Failed to upload media: {str(e)}")
+            # Logged (with traceback) by the caller's upload worker
+            raise Exception(f"Failed to upload media: {str(e)}") from e
+    
+    def create_upload_url(self, post_id: str, media_type: str, file_extension: str = "png") -> dict:
+        """
+        Reserve an object path and sign a one-time upload URL for it, so a client can
+        upload directly to storage without proxying the bytes through the API
+        
+        Returns:
+            Dict with upload_url, token, path and the eventual public_url
+        """
+        filename = self.media_path(post_id, media_type, file_extension)
+        signed = self.client.storage.from_(self.bucket_name).create_signed_upload_url(filename)
+        return {
+            "upload_url": signed["signed_url"],
+            "token": signed["token"],
+            "path": filename,
+            "public_url": self.public_url(filename),
+            "content_type": self._get_content_type(file_extension)
+        }
     
     def delete_media(self, file_path: str) -> bool:
         """
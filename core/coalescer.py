@@ -0,0 +1,72 @@
+"""
+Prompt Coalescer
+Groups prompts that arrive within a short window into one multi-prompt LLM call
+and fans the answers back to each waiting caller.
+"""
+import asyncio
+from typing import Callable, List, Optional, Tuple
+
+
+class PromptCoalescer:
+    """Micro-batch concurrent completions for one provider"""
+
+    def __init__(self,
+                 complete_batch: Callable[[List[str]], List[str]],
+                 max_batch: int = 8,
+                 window_seconds: float = 0.03):
+        """
+        Args:
+            complete_batch: Sync function mapping a list of prompts to a list of completions
+            max_batch: Flush as soon as this many prompts are waiting
+            window_seconds: Max time the first prompt waits for companions
+        """
+        self.complete_batch = complete_batch
+        self.max_batch = max_batch
+        self.window_seconds = window_seconds
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, prompt: str) -> str:
+        """Queue a prompt and wait for its completion"""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def _drain(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window_seconds
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._drain()
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.complete_batch, prompts)
+                if len(results) != len(prompts):
+                    raise ValueError(f"Batch returned {len(results)} completions for {len(prompts)} prompts")
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def aclose(self) -> None:
+        """Stop the background worker"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
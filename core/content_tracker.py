@@ -25,7 +25,8 @@ class ContentTracker:
         allowed_statuses = set(allowed_statuses or [])
 
         if self.db_client is not None:
-            posts = self.db_client.get_posts(limit=1000)
+            # The date window is applied in the database; only recent rows come back
+            posts = self.db_client.get_posts_by_date_range(cutoff.isoformat())
             filtered_posts = []
 
             for post in posts:
@@ -33,10 +34,13 @@ class ContentTracker:
                 if not created_at_raw:
                     continue
 
-                try:
-                    created_at = datetime.fromisoformat(created_at_raw.replace("Z", "+00:00"))
-                except ValueError:
-                    continue
+                if isinstance(created_at_raw, datetime):
+                    created_at = created_at_raw
+                else:
+                    try:
+                        created_at = datetime.fromisoformat(created_at_raw.replace("Z", "+00:00"))
+                    except ValueError:
+                        continue
 
                 if created_at.tzinfo is not None:
                     created_at = created_at.replace(tzinfo=None)
@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional
 import os
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 
 
 class NeonDatabase:
@@ -21,6 +21,11 @@ class NeonDatabase:
     def _connect(self):
         return psycopg2.connect(self.database_url)
 
+    def ping(self) -> None:
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+
     def init_database(self) -> None:
         with self._connect() as conn:
             with conn.cursor() as cur:
@@ -34,16 +39,28 @@ class NeonDatabase:
                         topic TEXT,
                         text TEXT NOT NULL,
                         image_path TEXT,
-                        hashtags TEXT,
+                        hashtags TEXT[],
                         created_at TIMESTAMPTZ DEFAULT NOW(),
                         status TEXT DEFAULT 'draft',
                         voice_score NUMERIC,
                         length INTEGER
                     );
 
+                    DO $$
+                    BEGIN
+                        IF (SELECT data_type FROM information_schema.columns
+                            WHERE table_name = 'posts' AND column_name = 'hashtags') = 'text' THEN
+                            ALTER TABLE posts ALTER COLUMN hashtags TYPE TEXT[]
+                            USING regexp_split_to_array(NULLIF(btrim(hashtags), ''), '[,[:space:]]+');
+                        END IF;
+                    END $$;
+
                     CREATE INDEX IF NOT EXISTS idx_posts_channel ON posts(channel);
                     CREATE INDEX IF NOT EXISTS idx_posts_status ON posts(status);
                     CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at DESC);
+                    DROP INDEX IF EXISTS idx_posts_pillar_voice_score;
+                    CREATE INDEX IF NOT EXISTS idx_posts_status_pillar_score_created
+                    ON posts(status, pillar, voice_score DESC, created_at DESC);
 
                     CREATE TABLE IF NOT EXISTS engagement (
                         id SERIAL PRIMARY KEY,
@@ -88,6 +105,18 @@ class NeonDatabase:
                     CREATE INDEX IF NOT EXISTS idx_channel_topics_channel_rank
                     ON channel_topics(channel, rank);
 
+                    CREATE TABLE IF NOT EXISTS batch_jobs (
+                        id TEXT PRIMARY KEY,
+                        status TEXT NOT NULL DEFAULT 'queued',
+                        total INTEGER NOT NULL,
+                        completed INTEGER NOT NULL DEFAULT 0,
+                        failed INTEGER NOT NULL DEFAULT 0,
+                        post_ids TEXT[],
+                        error TEXT,
+                        created_at TIMESTAMPTZ DEFAULT NOW(),
+                        updated_at TIMESTAMPTZ DEFAULT NOW()
+                    );
+
                     CREATE TABLE IF NOT EXISTS channel_cadence (
                         channel VARCHAR(50) PRIMARY KEY,
                         target_posts_per_week INTEGER NOT NULL,
@@ -109,6 +138,23 @@ class NeonDatabase:
                     """
                 )
 
+    @staticmethod
+    def _post_row(post_data: Dict[str, Any]) -> tuple:
+        return (
+            post_data["id"],
+            post_data.get("channel", "personal_career"),
+            post_data["pillar"],
+            post_data.get("format"),
+            post_data.get("topic"),
+            post_data["text"],
+            post_data.get("image_path"),
+            post_data.get("hashtags") or [],
+            post_data.get("status", "draft"),
+            post_data.get("voice_score"),
+            post_data.get("length"),
+            post_data.get("created_at"),
+        )
+
     def save_post(self, post_data: Dict[str, Any]) -> str:
         with self._connect() as conn:
             with conn.cursor() as cur:
@@ -129,23 +175,40 @@ class NeonDatabase:
                         voice_score = EXCLUDED.voice_score,
                         length = EXCLUDED.length
                     """,
-                    (
-                        post_data["id"],
-                        post_data.get("channel", "personal_career"),
-                        post_data["pillar"],
-                        post_data.get("format"),
-                        post_data.get("topic"),
-                        post_data["text"],
-                        post_data.get("image_path"),
-                        post_data.get("hashtags", ""),
-                        post_data.get("status", "draft"),
-                        post_data.get("voice_score"),
-                        post_data.get("length"),
-                        post_data.get("created_at"),
-                    ),
+                    self._post_row(post_data),
                 )
         return post_data["id"]
 
+    def bulk_save_posts(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Insert many posts in a single statement (one round-trip)."""
+        if not rows:
+            return []
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO posts
+                    (id, channel, pillar, format, topic, text, image_path, hashtags, status, voice_score, length, created_at)
+                    VALUES %s
+                    ON CONFLICT (id) DO UPDATE SET
+                        channel = EXCLUDED.channel,
+                        pillar = EXCLUDED.pillar,
+                        format = EXCLUDED.format,
+                        topic = EXCLUDED.topic,
+                        text = EXCLUDED.text,
+                        image_path = EXCLUDED.image_path,
+                        hashtags = EXCLUDED.hashtags,
+                        status = EXCLUDED.status,
+                        voice_score = EXCLUDED.voice_score,
+                        length = EXCLUDED.length
+                    """,
+                    [self._post_row(row) for row in rows],
+                    template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, COALESCE(%s, NOW()))",
+                    page_size=len(rows),
+                )
+        return [row["id"] for row in rows]
+
     def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
         with self._connect() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -153,7 +216,22 @@ class NeonDatabase:
                 row = cur.fetchone()
                 return dict(row) if row else None
 
-    def get_posts(self, limit: int = 20, status: Optional[str] = None, channel: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_posts_by_ids(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        if not post_ids:
+            return []
+        with self._connect() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("SELECT * FROM posts WHERE id = ANY(%s) ORDER BY created_at", (list(post_ids),))
+                return [dict(row) for row in cur.fetchall()]
+
+    def get_posts(
+        self,
+        limit: int = 20,
+        status: Optional[str] = None,
+        channel: Optional[str] = None,
+        pillar: Optional[str] = None,
+        min_voice_score: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
         clauses: List[str] = []
         params: List[Any] = []
         if status:
@@ -162,6 +240,12 @@ class NeonDatabase:
         if channel:
             clauses.append("channel = %s")
             params.append(channel)
+        if pillar:
+            clauses.append("pillar = %s")
+            params.append(pillar)
+        if min_voice_score is not None:
+            clauses.append("voice_score >= %s")
+            params.append(min_voice_score)
 
         where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
         sql = f"SELECT * FROM posts {where_sql} ORDER BY created_at DESC LIMIT %s"
@@ -172,9 +256,32 @@ class NeonDatabase:
                 cur.execute(sql, params)
                 return [dict(row) for row in cur.fetchall()]
 
-    def update_post(self, post_id: str, **kwargs) -> bool:
+    def get_post_aggregates(self) -> Dict[str, Any]:
+        """Return post totals and average voice score computed in SQL."""
+        with self._connect() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        COUNT(*) AS total,
+                        COUNT(*) FILTER (WHERE status = 'published') AS published,
+                        COUNT(*) FILTER (WHERE status = 'draft') AS drafts,
+                        COALESCE(SUM(voice_score) / NULLIF(COUNT(*), 0), 0) AS avg_voice_score
+                    FROM posts
+                    """
+                )
+                row = cur.fetchone()
+                return {
+                    "total": int(row["total"]),
+                    "published": int(row["published"]),
+                    "drafts": int(row["drafts"]),
+                    "avg_voice_score": float(row["avg_voice_score"]),
+                }
+
+    def update_post(self, post_id: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Update a post and return the updated row, or None if no post matched."""
         if not kwargs:
-            return True
+            return self.get_post(post_id)
 
         fields = []
         params: List[Any] = []
@@ -184,9 +291,10 @@ class NeonDatabase:
 
         params.append(post_id)
         with self._connect() as conn:
-            with conn.cursor() as cur:
-                cur.execute(f"UPDATE posts SET {', '.join(fields)} WHERE id = %s", params)
-                return cur.rowcount > 0
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(f"UPDATE posts SET {', '.join(fields)} WHERE id = %s RETURNING *", params)
+                row = cur.fetchone()
+                return dict(row) if row else None
 
     def delete_post(self, post_id: str) -> bool:
         with self._connect() as conn:
@@ -333,6 +441,48 @@ class NeonDatabase:
                 row = cur.fetchone()
                 return dict(row) if row else None
 
+    def create_batch_job(self, job_id: str, total: int) -> None:
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO batch_jobs (id, status, total) VALUES (%s, 'queued', %s) ON CONFLICT (id) DO NOTHING",
+                    (job_id, total),
+                )
+
+    def record_batch_progress(self, job_id: str, succeeded: bool) -> None:
+        column = "completed" if succeeded else "failed"
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"UPDATE batch_jobs SET {column} = {column} + 1, status = 'running', updated_at = NOW() WHERE id = %s",
+                    (job_id,),
+                )
+
+    def finish_batch_job(
+        self,
+        job_id: str,
+        status: str,
+        post_ids: Optional[List[str]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE batch_jobs
+                    SET status = %s, post_ids = %s, error = %s, updated_at = NOW()
+                    WHERE id = %s
+                    """,
+                    (status, post_ids or [], error, job_id),
+                )
+
+    def get_batch_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("SELECT * FROM batch_jobs WHERE id = %s", (job_id,))
+                row = cur.fetchone()
+                return dict(row) if row else None
+
     def touch_channel_last_post(self, channel: str) -> None:
         with self._connect() as conn:
             with conn.cursor() as cur:
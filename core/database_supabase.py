@@ -23,19 +23,21 @@ class SupabaseDatabase:
         
         self.base_url = f"{self.url}/rest/v1"
     
-    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Any:
-        """Make HTTP request to Supabase"""
+    def _request(self, method: str, endpoint: str, data: Optional[Any] = None, params: Optional[Dict] = None,
+                 prefer: Optional[str] = None) -> Any:
+        """Make HTTP request to Supabase (prefer overrides the default Prefer header)"""
         url = f"{self.base_url}/{endpoint}"
+        headers = {**self.headers, "Prefer": prefer} if prefer else self.headers
         
         with httpx.Client() as client:
             if method == "GET":
-                response = client.get(url, headers=self.headers, params=params)
+                response = client.get(url, headers=headers, params=params)
             elif method == "POST":
-                response = client.post(url, headers=self.headers, json=data)
+                response = client.post(url, headers=headers, json=data, params=params)
             elif method == "PATCH":
-                response = client.patch(url, headers=self.headers, json=data, params=params)
+                response = client.patch(url, headers=headers, json=data, params=params)
             elif method == "DELETE":
-                response = client.delete(url, headers=self.headers, params=params)
+                response = client.delete(url, headers=headers, params=params)
             
             response.raise_for_status()
             return response.json() if response.text else None
@@ -53,13 +55,23 @@ class SupabaseDatabase:
             topic TEXT,
             text TEXT NOT NULL,
             image_path TEXT,
-            hashtags TEXT,
+            hashtags TEXT[],
             created_at TIMESTAMPTZ DEFAULT NOW(),
             status TEXT DEFAULT 'draft',
             voice_score NUMERIC,
             length INTEGER
         );
         
+        -- Existing projects created hashtags as TEXT (comma/space separated): convert in place
+        DO $$
+        BEGIN
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'posts' AND column_name = 'hashtags') = 'text' THEN
+                ALTER TABLE posts ALTER COLUMN hashtags TYPE TEXT[]
+                USING regexp_split_to_array(NULLIF(btrim(hashtags), ''), '[,[:space:]]+');
+            END IF;
+        END $$;
+        
         CREATE TABLE IF NOT EXISTS engagement (
             id SERIAL PRIMARY KEY,
             post_id TEXT REFERENCES posts(id) ON DELETE CASCADE,
@@ -74,15 +86,48 @@ class SupabaseDatabase:
         CREATE INDEX IF NOT EXISTS idx_posts_pillar ON posts(pillar);
         CREATE INDEX IF NOT EXISTS idx_posts_status ON posts(status);
         CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at);
+        CREATE INDEX IF NOT EXISTS idx_posts_status_pillar_score_created
+        ON posts(status, pillar, voice_score DESC, created_at DESC);
+        
+        CREATE TABLE IF NOT EXISTS batch_jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'queued',
+            total INTEGER NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            post_ids TEXT[],
+            error TEXT,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        
+        -- Atomic per-post progress for background batch jobs (PostgREST PATCH cannot increment)
+        CREATE OR REPLACE FUNCTION record_batch_progress(job_id TEXT, succeeded BOOLEAN)
+        RETURNS VOID
+        LANGUAGE sql AS $$
+            UPDATE batch_jobs
+            SET completed = completed + CASE WHEN succeeded THEN 1 ELSE 0 END,
+                failed = failed + CASE WHEN succeeded THEN 0 ELSE 1 END,
+                status = 'running',
+                updated_at = NOW()
+            WHERE id = job_id;
+        $$;
+        
+        CREATE OR REPLACE FUNCTION post_stats()
+        RETURNS TABLE (total BIGINT, published BIGINT, drafts BIGINT, avg_voice_score NUMERIC)
+        LANGUAGE sql STABLE AS $$
+            SELECT
+                COUNT(*),
+                COUNT(*) FILTER (WHERE status = 'published'),
+                COUNT(*) FILTER (WHERE status = 'draft'),
+                COALESCE(SUM(voice_score) / NULLIF(COUNT(*), 0), 0)
+            FROM posts;
+        $$;
         """
         print("⚠️  Run the SQL above in Supabase SQL Editor to create tables")
     
     def save_post(self, post_data: Dict) -> str:
         """Save a post to Supabase"""
-        # Convert hashtags list to comma-separated string
-        if isinstance(post_data.get('hashtags'), list):
-            post_data['hashtags'] = ','.join(post_data['hashtags'])
-        
         # Ensure created_at is set
         if 'created_at' not in post_data:
             post_data['created_at'] = datetime.now().isoformat()
@@ -90,6 +135,18 @@ class SupabaseDatabase:
         result = self._request("POST", "posts", data=post_data)
         return result[0]['id'] if result else post_data['id']
     
+    def bulk_save_posts(self, rows: List[Dict]) -> List[str]:
+        """Save many posts with a single PostgREST bulk insert"""
+        if not rows:
+            return []
+        
+        # New dicts: the caller's rows are returned to API clients and must not change
+        now = datetime.now().isoformat()
+        payload = [{**row, 'created_at': row.get('created_at') or now} for row in rows]
+        
+        result = self._request("POST", "posts", data=payload)
+        return [row['id'] for row in result] if result else [row['id'] for row in rows]
+    
     def get_post(self, post_id: str) -> Optional[Dict]:
         """Get a post by ID"""
         try:
@@ -98,7 +155,30 @@ class SupabaseDatabase:
         except:
             return None
     
-    def get_posts(self, limit: int = 20, status: Optional[str] = None) -> List[Dict]:
+    def ping(self) -> None:
+        """Cheap round-trip used by startup checks and /health"""
+        self._request("GET", "posts", params={"select": "id", "limit": 1})
+    
+    def get_posts_by_ids(self, post_ids: List[str]) -> List[Dict]:
+        """Get several posts by ID, oldest first"""
+        if not post_ids:
+            return []
+        params = {
+            "select": "*",
+            "id": f"in.({','.join(post_ids)})",
+            "order": "created_at.asc"
+        }
+        result = self._request("GET", "posts", params=params)
+        return result or []
+    
+    def get_posts(
+        self,
+        limit: int = 20,
+        status: Optional[str] = None,
+        channel: Optional[str] = None,
+        pillar: Optional[str] = None,
+        min_voice_score: Optional[float] = None
+    ) -> List[Dict]:
         """Get all posts with optional filters"""
         params = {
             "select": "*",
@@ -108,21 +188,34 @@ class SupabaseDatabase:
         
         if status:
             params["status"] = f"eq.{status}"
+        if channel:
+            params["channel"] = f"eq.{channel}"
+        if pillar:
+            params["pillar"] = f"eq.{pillar}"
+        if min_voice_score is not None:
+            params["voice_score"] = f"gte.{min_voice_score}"
         
         result = self._request("GET", "posts", params=params)
         return result or []
     
-    def update_post(self, post_id: str, **kwargs) -> bool:
-        """Update a post"""
+    def get_post_aggregates(self) -> Dict:
+        """Get post totals and average voice score via the post_stats() SQL function"""
+        result = self._request("POST", "rpc/post_stats", data={})
+        row = result[0] if isinstance(result, list) and result else (result or {})
+        return {
+            "total": int(row.get("total") or 0),
+            "published": int(row.get("published") or 0),
+            "drafts": int(row.get("drafts") or 0),
+            "avg_voice_score": float(row.get("avg_voice_score") or 0),
+        }
+    
+    def update_post(self, post_id: str, **kwargs) -> Optional[Dict]:
+        """Update a post and return the updated row (None if no post matched)"""
         try:
-            # Convert hashtags list to string if needed
-            if 'hashtags' in kwargs and isinstance(kwargs['hashtags'], list):
-                kwargs['hashtags'] = ','.join(kwargs['hashtags'])
-            
-            self._request("PATCH", "posts", data=kwargs, params={"id": f"eq.{post_id}"})
-            return True
+            result = self._request("PATCH", "posts", data=kwargs, params={"id": f"eq.{post_id}"})
+            return result[0] if result else None
         except:
-            return False
+            return None
     
     def delete_post(self, post_id: str) -> bool:
         """Delete a post"""
@@ -179,6 +272,40 @@ class SupabaseDatabase:
         except:
             return False
     
+    def create_batch_job(self, job_id: str, total: int) -> None:
+        """Register a background batch job (a repeated job_id is ignored)"""
+        self._request(
+            "POST", "batch_jobs",
+            data={"id": job_id, "status": "queued", "total": total},
+            params={"on_conflict": "id"},
+            prefer="resolution=ignore-duplicates,return=minimal"
+        )
+    
+    def record_batch_progress(self, job_id: str, succeeded: bool) -> None:
+        """Count one finished post via the record_batch_progress() SQL function"""
+        self._request("POST", "rpc/record_batch_progress", data={"job_id": job_id, "succeeded": succeeded})
+    
+    def finish_batch_job(
+        self,
+        job_id: str,
+        status: str,
+        post_ids: Optional[List[str]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Mark a batch job completed or failed"""
+        data = {
+            "status": status,
+            "post_ids": post_ids or [],
+            "error": error,
+            "updated_at": datetime.now().isoformat()
+        }
+        self._request("PATCH", "batch_jobs", data=data, params={"id": f"eq.{job_id}"})
+    
+    def get_batch_job(self, job_id: str) -> Optional[Dict]:
+        """Get a batch job's status and counters"""
+        result = self._request("GET", "batch_jobs", params={"id": f"eq.{job_id}", "select": "*"})
+        return result[0] if result else None
+    
     def get_engagement(self, post_id: str) -> Optional[Dict]:
         """Get engagement metrics for a post"""
         try:
@@ -0,0 +1,77 @@
+"""
+LLM Response Cache
+In-process TTL + LRU cache for provider completions, keyed on provider and prompt.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class LLMCache:
+    """Thread-safe TTL/LRU cache (generation runs in worker threads)"""
+
+    def __init__(self, max_items: int = 512, ttl_seconds: int = 3600):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Stable sha256 key over the generation inputs"""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries past max_items"""
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_items": self.max_items,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+
+# Shared instance. Opt-in (LLM_CACHE_MAX_ITEMS > 0): generation prompts repeat often
+# (topics come from short per-pillar lists), and a cached completion would hand back
+# the same draft on every batch or regenerate call within the TTL.
+llm_cache = LLMCache(
+    max_items=int(os.getenv("LLM_CACHE_MAX_ITEMS", "0")),
+    ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+)
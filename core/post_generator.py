@@ -5,23 +5,39 @@ Generates posts using multiple AI providers with voice consistency checks
 import os
 import json
 import random
+import asyncio
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import re
 import anthropic
 import openai
 from google import generativeai as genai
+from core.coalescer import PromptCoalescer
+from core.llm_cache import llm_cache
 try:
     from core.vertex_wrapper import VertexWrapper
 except ImportError:
     VertexWrapper = None
 
+# A hashtag is '#' followed by word characters, optionally hyphen-joined (#AI-driven)
+HASHTAG_PATTERN = re.compile(r"#\w+(?:-\w+)*")
+
 class PostGenerator:
+    GPT4_SYSTEM_PROMPT = (
+        "You are a LinkedIn post writer for a mining operations executive with 24 years experience. "
+        "Write authentic, insightful posts that demonstrate expertise without sounding like marketing."
+    )
+
     def __init__(self, config_path="config.json"):
         self.config_path = Path(__file__).parent.parent / config_path
         self.config = self._load_config()
         self._init_ai_clients()
+        # Micro-batching of concurrent generate requests (0 disables)
+        self.coalesce_window_ms = int(os.getenv("LLM_COALESCE_WINDOW_MS", "0"))
+        self.coalesce_max_batch = int(os.getenv("LLM_COALESCE_MAX_BATCH", "8"))
+        self._coalescers: Dict[str, PromptCoalescer] = {}
         
     def _load_config(self) -> Dict:
         """Load configuration from config.json"""
@@ -93,6 +109,18 @@ class PostGenerator:
         # Generate with selected provider
         text = self._generate_with_provider(provider, prompt)
         
+        return self._complete_post(prompt, text, pillar, format_type, topic, channel, provider, source_context)
+
+    def _complete_post(self,
+                       prompt: str,
+                       text: str,
+                       pillar: str,
+                       format_type: str,
+                       topic: Optional[str],
+                       channel: str,
+                       provider: str,
+                       source_context: Optional[Dict]) -> Dict:
+        """Parse a completion, run the source-grounding safety pass and add metadata"""
         # Extract components
         post_data = self._parse_response(text)
 
@@ -106,14 +134,79 @@ class PostGenerator:
                 + "\nNever claim hiring, selection, deployment, partnership, implementation, or customer status unless explicitly in the source evidence."
                 + "\nIf uncertain, use neutral wording like: 'the article suggests', 'this may indicate', or 'for teams pursuing similar outcomes'."
             )
-            text = self._generate_with_provider(provider, correction_prompt)
+            # Never cached: the revision must be a fresh completion of this draft's fix
+            text = self._call_provider(provider, correction_prompt)
             post_data = self._parse_response(text)
 
             # Final hard guardrail: strip risky sentences if model still violates source grounding.
             if self._has_unsupported_source_claims(post_data.get("text", ""), source_context):
                 post_data["text"] = self._strip_unsupported_source_claims(post_data.get("text", ""))
         
-        # Add metadata
+        return self._add_metadata(post_data, pillar, format_type, topic, channel, provider)
+
+    def build_prompt(self,
+                     pillar: str,
+                     format_type: str = "insight",
+                     topic: Optional[str] = None,
+                     channel: str = "personal_career",
+                     language: str = "english",
+                     source_context: Optional[Dict] = None) -> str:
+        """Build the generation prompt without calling a provider (used for provider batch jobs)"""
+        return self._build_prompt(pillar, format_type, topic, channel, language, source_context)
+
+    def post_from_text(self,
+                       text: str,
+                       pillar: str,
+                       format_type: str = "insight",
+                       topic: Optional[str] = None,
+                       channel: str = "personal_career",
+                       provider: str = "gpt4",
+                       source_context: Optional[Dict] = None) -> Dict:
+        """Turn raw model output (batch job result or streamed text) into the generate_post result shape"""
+        post_data = self._parse_response(text)
+        # No second pass is possible once text has been delivered, so apply the hard guardrail directly
+        if source_context and self._has_unsupported_source_claims(post_data.get("text", ""), source_context):
+            post_data["text"] = self._strip_unsupported_source_claims(post_data.get("text", ""))
+        return self._add_metadata(post_data, pillar, format_type, topic, channel, provider)
+
+    def stream_completion(self, provider: str, prompt: str) -> Iterator[str]:
+        """
+        Yield completion text chunks as the provider produces them
+        
+        OpenAI and consumer Gemini stream natively; other paths (Vertex, Claude,
+        cloud deployments) yield the full completion as a single chunk.
+        """
+        is_cloud = os.getenv("RENDER") or os.getenv("RAILWAY_ENVIRONMENT")
+        if provider == "gpt4" and self.openai_client:
+            stream = self.openai_client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": self.GPT4_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=1024,
+                temperature=0.7,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            return
+        if provider == "gemini" and self.gemini and not is_cloud:
+            streamed = False
+            try:
+                for chunk in self.gemini.generate_content(prompt, stream=True):
+                    if chunk.text:
+                        streamed = True
+                        yield chunk.text
+                return
+            except Exception as e:
+                if streamed:
+                    raise
+                print(f"Standard Gemini streaming failed ({e}), falling back to buffered generation...")
+        yield self._generate_with_provider(provider, prompt)
+
+    def _add_metadata(self, post_data: Dict, pillar: str, format_type: str, topic: Optional[str], channel: str, provider: str) -> Dict:
         post_data.update({
             "pillar": pillar,
             "format": format_type,
@@ -126,7 +219,94 @@ class PostGenerator:
         
         return post_data
 
+    async def generate_post_async(self,
+                                  pillar: str,
+                                  format_type: str = "insight",
+                                  topic: Optional[str] = None,
+                                  channel: str = "personal_career",
+                                  language: str = "english",
+                                  provider: str = "gemini",
+                                  source_context: Optional[Dict] = None) -> Dict:
+        """
+        Async variant of generate_post for use inside the API event loop
+        
+        The provider SDKs are synchronous, so the call runs in a worker thread
+        and concurrent posts overlap their network-bound LLM latency. When
+        LLM_COALESCE_WINDOW_MS is set, first-pass completions from concurrent
+        callers are micro-batched into one multi-prompt call per provider.
+        """
+        if self.coalesce_window_ms <= 0:
+            return await asyncio.to_thread(
+                self.generate_post, pillar, format_type, topic, channel, language, provider, source_context
+            )
+        
+        prompt = self._build_prompt(pillar, format_type, topic, channel, language, source_context)
+        text = await self._get_coalescer(provider).submit(prompt)
+        return await asyncio.to_thread(
+            self._complete_post, prompt, text, pillar, format_type, topic, channel, provider, source_context
+        )
+
+    def _get_coalescer(self, provider: str) -> PromptCoalescer:
+        coalescer = self._coalescers.get(provider)
+        if coalescer is None:
+            coalescer = PromptCoalescer(
+                partial(self.complete_prompts, provider),
+                max_batch=self.coalesce_max_batch,
+                window_seconds=self.coalesce_window_ms / 1000
+            )
+            self._coalescers[provider] = coalescer
+        return coalescer
+
+    def complete_prompts(self, provider: str, prompts: List[str]) -> List[str]:
+        """
+        Complete several independent prompts with as few provider calls as possible
+        
+        Cached prompts are answered from the LLM cache; the rest go out as one
+        JSON-array request. If the model's answer can't be split back into one
+        completion per prompt, each prompt is sent on its own.
+        """
+        keys = [llm_cache.make_key(provider=provider, prompt=prompt) for prompt in prompts]
+        results: List[Optional[str]] = [llm_cache.get(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        if len(pending) == 1:
+            results[pending[0]] = self._generate_with_provider(provider, prompts[pending[0]])
+        elif pending:
+            tasks = "\n\n".join(
+                f"### TASK {n + 1}\n{prompts[i]}" for n, i in enumerate(pending)
+            )
+            combined = (
+                f"You will receive {len(pending)} independent writing tasks. Complete each one separately, "
+                "following its own instructions exactly.\n"
+                f"Respond with ONLY a JSON array of {len(pending)} strings, where item N is the complete "
+                "response to TASK N.\n\n" + tasks
+            )
+            answers = None
+            try:
+                raw = self._call_provider(provider, combined)
+                match = re.search(r'\[.*\]', raw, re.DOTALL)
+                answers = json.loads(match.group(0)) if match else None
+            except Exception as e:
+                print(f"Coalesced generation failed ({e}), sending prompts individually...")
+            if not isinstance(answers, list) or len(answers) != len(pending) or not all(isinstance(a, str) for a in answers):
+                answers = [self._call_provider(provider, prompts[i]) for i in pending]
+            for i, answer in zip(pending, answers):
+                llm_cache.set(keys[i], answer)
+                results[i] = answer
+        
+        return results
+
     def _generate_with_provider(self, provider: str, prompt: str) -> str:
+        # Identical prompts (same pillar/format/topic/language/source) reuse the cached completion
+        key = llm_cache.make_key(provider=provider, prompt=prompt)
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
+        text = self._call_provider(provider, prompt)
+        llm_cache.set(key, text)
+        return text
+
+    def _call_provider(self, provider: str, prompt: str) -> str:
         if provider == "gemini":
             return self._generate_gemini(prompt)
         if provider == "gpt4":
@@ -438,7 +618,7 @@ Generate the post text, then provide hashtags separately."""
         response = self.openai_client.chat.completions.create(
             model="gpt-4o",
             messages=[
-                {"role": "system", "content": "You are a LinkedIn post writer for a mining operations executive with 24 years experience. Write authentic, insightful posts that demonstrate expertise without sounding like marketing."},
+                {"role": "system", "content": self.GPT4_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=1024,
@@ -548,13 +728,8 @@ Generate the post text, then provide hashtags separately."""
                 post_text = '\n'.join(lines).strip()
         
         # Extract hashtags
-        hashtags = []
-        for word in hashtag_section.split():
-            word = word.strip('*,.-')  # Remove markdown and punctuation
-            if word.startswith("#"):
-                clean_tag = word.split()[0] if ' ' in word else word  # Take first word if multiple
-                if clean_tag not in hashtags:  # Avoid duplicates
-                    hashtags.append(clean_tag)
+        # (one regex pass handles space-, comma- and markdown-separated tags alike)
+        hashtags = list(dict.fromkeys(HASHTAG_PATTERN.findall(hashtag_section)))
         
         # If no hashtags found, generate some from the post
         if not hashtags:
@@ -574,17 +749,47 @@ Generate the post text, then provide hashtags separately."""
     
     def batch_generate(self, 
                       count: int,
-                      pillar_distribution: Optional[Dict[str, float]] = None) -> List[Dict]:
+                      pillar_distribution: Optional[Dict[str, float]] = None,
+                      provider: Optional[str] = None) -> List[Dict]:
         """
         Generate multiple posts following pillar distribution
         
         Args:
             count: Number of posts to generate
             pillar_distribution: Custom distribution (defaults to config)
+            provider: Force one provider for every post (randomized when None)
             
         Returns:
             List of generated posts
         """
+        # Generate posts
+        posts = []
+        
+        for spec in self.plan_batch(count, pillar_distribution, provider):
+            try:
+                post = self.generate_post(**spec)
+                posts.append(post)
+                print(f"✓ Generated {spec['pillar']} / {spec['format_type']} post ({len(posts)}/{count})")
+            except Exception as e:
+                print(f"✗ Error generating {spec['pillar']} post: {e}")
+        
+        return posts
+
+    def plan_batch(self,
+                   count: int,
+                   pillar_distribution: Optional[Dict[str, float]] = None,
+                   provider: Optional[str] = None) -> List[Dict]:
+        """
+        Build the per-post generation specs for a batch without calling any provider
+        
+        Args:
+            count: Number of posts to plan
+            pillar_distribution: Custom distribution (defaults to config)
+            provider: Force one provider for every post (randomized when None)
+            
+        Returns:
+            List of generate_post keyword arguments (pillar, format_type, provider)
+        """
         if not pillar_distribution:
             pillar_distribution = {
                 "asset_management": 0.25,
@@ -607,28 +812,18 @@ Generate the post text, then provide hashtags separately."""
             largest_pillar = max(pillar_distribution, key=pillar_distribution.get)
             pillar_counts[largest_pillar] += (count - total)
         
-        # Generate posts
-        posts = []
         formats = ["insight", "story", "data", "question", "contrarian"]
         providers = ["claude", "gpt4", "gemini"]
         
-        for pillar, pillar_count in pillar_counts.items():
-            for i in range(pillar_count):
-                format_type = random.choice(formats)
-                provider = random.choice(providers)
-                
-                try:
-                    post = self.generate_post(
-                        pillar=pillar,
-                        format_type=format_type,
-                        provider=provider
-                    )
-                    posts.append(post)
-                    print(f"✓ Generated {pillar} / {format_type} post ({len(posts)}/{count})")
-                except Exception as e:
-                    print(f"✗ Error generating {pillar} post: {e}")
-        
-        return posts
+        return [
+            {
+                "pillar": pillar,
+                "format_type": random.choice(formats),
+                "provider": provider or random.choice(providers),
+            }
+            for pillar, pillar_count in pillar_counts.items()
+            for _ in range(pillar_count)
+        ]
 
 
 if __name__ == "__main__":
@@ -1,17 +1,25 @@
 import os
 import json
 import base64
+import asyncio
 import requests
 from typing import Optional, Dict, Any
 from google.oauth2 import service_account
 from google.oauth2 import credentials as authorized_user_credentials
 from google.auth.transport.requests import Request as AuthRequest
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 class VertexWrapper:
     """
     Direct wrapper for Vertex AI Gemini API using Service Account credentials.
     Bypasses the 'User location not supported' error by using Enterprise Vertex AI endpoints.
     """
+    # One aiohttp session shared by every wrapper in the process (created lazily on the running loop)
+    _session: Optional["aiohttp.ClientSession"] = None
+
     def __init__(self, project_id: Optional[str] = None, location: str = "us-central1"):
         self.project_id = project_id
         self.location = location
@@ -93,26 +101,12 @@ class VertexWrapper:
                     print(f"Failed to load credentials from file {local_path}: {e}")
 
 
-    def generate_content(self, prompt: str) -> Optional[str]:
-        """Generate content using Vertex AI REST API"""
-        if not self.credentials or not self.project_id:
-            print("Vertex AI Not Configured: No credentials found")
-            return None
-
-        # Refresh token if needed
-        if not self.credentials.valid:
-            request = AuthRequest()
-            self.credentials.refresh(request)
+    def _endpoint_url(self) -> str:
+        return f"https://{self.location}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{self.location}/publishers/google/models/{self.model_name}:generateContent"
 
-        token = self.credentials.token
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-
-        url = f"https://{self.location}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{self.location}/publishers/google/models/{self.model_name}:generateContent"
-
-        payload = {
+    @staticmethod
+    def _build_payload(prompt: str) -> Dict[str, Any]:
+        return {
             "contents": [{
                 "role": "user",
                 "parts": [{"text": prompt}]
@@ -123,22 +117,82 @@ class VertexWrapper:
             }
         }
 
+    @staticmethod
+    def _extract_text(data: Dict[str, Any]) -> Optional[str]:
+        # Response format: candidates[0].content.parts[0].text
+        if 'candidates' in data and len(data['candidates']) > 0:
+            parts = data['candidates'][0].get('content', {}).get('parts', [])
+            if parts:
+                return parts[0].get('text', '')
+        return None
+
+    def _auth_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.credentials.token}",
+            "Content-Type": "application/json"
+        }
+
+    def generate_content(self, prompt: str) -> Optional[str]:
+        """Generate content using Vertex AI REST API"""
+        if not self.credentials or not self.project_id:
+            print("Vertex AI Not Configured: No credentials found")
+            return None
+
+        # Refresh token if needed
+        if not self.credentials.valid:
+            request = AuthRequest()
+            self.credentials.refresh(request)
+
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = requests.post(self._endpoint_url(), headers=self._auth_headers(), json=self._build_payload(prompt))
             response.raise_for_status()
-            data = response.json()
-            
-            # Extract text from response
-            # Response format: candidates[0].content.parts[0].text
-            if 'candidates' in data and len(data['candidates']) > 0:
-                parts = data['candidates'][0].get('content', {}).get('parts', [])
-                if parts:
-                    return parts[0].get('text', '')
-            
-            return None
+            return self._extract_text(response.json())
 
         except Exception as e:
             print(f"Vertex AI Generation Error: {e}")
             if 'response' in locals() and hasattr(response, 'text'):
                 print(f"API Response: {response.text}")
             return None
+
+    @classmethod
+    def _get_session(cls) -> "aiohttp.ClientSession":
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120))
+        return cls._session
+
+    @classmethod
+    def use_session(cls, session: "aiohttp.ClientSession") -> None:
+        """Share an externally owned session (e.g. the app's pooled session)"""
+        cls._session = session
+
+    @classmethod
+    async def close_session(cls) -> None:
+        """Close the shared aiohttp session (call on app shutdown)"""
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+
+    async def generate_content_async(self, prompt: str) -> Optional[str]:
+        """Generate content using Vertex AI REST API over the shared aiohttp session"""
+        if aiohttp is None:
+            return await asyncio.to_thread(self.generate_content, prompt)
+        if not self.credentials or not self.project_id:
+            print("Vertex AI Not Configured: No credentials found")
+            return None
+
+        # Token refresh is a rare blocking call (about hourly); keep it off the event loop
+        if not self.credentials.valid:
+            await asyncio.to_thread(self.credentials.refresh, AuthRequest())
+
+        try:
+            async with self._get_session().post(
+                self._endpoint_url(), headers=self._auth_headers(), json=self._build_payload(prompt)
+            ) as response:
+                if response.status >= 400:
+                    print(f"Vertex AI Generation Error: HTTP {response.status}")
+                    print(f"API Response: {await response.text()}")
+                    return None
+                return self._extract_text(await response.json())
+        except Exception as e:
+            print(f"Vertex AI Generation Error: {e}")
+            return None
@@ -2,14 +2,41 @@
 Voice Checker - Ensures posts match Adolfo's authentic voice
 """
 import json
+import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+# Positive markers (add points). Markers are matched as literal substrings.
+POSITIVE_MARKERS = {
+    "specific numbers": [r"\d+%", r"\$\d+", r"\d+ years", r"\d+ months"],
+    "operator language": ["ran the numbers", "board demanded", "metal prices", "availability", "uptime"],
+    "authentic framing": ["portfolio career", "building ventures", "co-founding with partners"],
+    "results focus": ["delivered", "achieved", "reduced by", "improved", "increased"],
+    "real examples": ["at southern copper", "at ferreyros", "at chinalco", "through hatch"]
+}
+
+# Negative markers (subtract points)
+NEGATIVE_MARKERS = {
+    "marketing speak": ["excited to announce", "thrilled to share", "game-changer", "disruptive"],
+    "vague claims": ["world-class", "best-in-class", "cutting-edge", "next-generation" ],
+    "humble bragging": ["humbled", "honored", "blessed", "grateful for this journey"],
+    "lifestyle content": ["work-life balance", "follow your passion", "do what you love"]
+}
+
+# One alternation per positive category so each category is a single scan of the text
+_POSITIVE_PATTERNS = {
+    category: re.compile("|".join(re.escape(marker) for marker in markers))
+    for category, markers in POSITIVE_MARKERS.items()
+}
+
 class VoiceChecker:
     def __init__(self, config_path="config.json"):
         self.config_path = Path(__file__).parent.parent / config_path
         self.config = self._load_config()
         self.voice_rules = self.config["voice_guidelines"]
+        self._forbidden_phrases = [
+            (phrase, phrase.lower()) for phrase in self.voice_rules["forbidden_phrases"]
+        ]
     
     def _load_config(self) -> Dict:
         """Load voice guidelines from config"""
@@ -28,15 +55,16 @@ class VoiceChecker:
         """
         issues = []
         score = 100.0
+        text_lower = text.lower()
         
         # Check forbidden phrases
-        forbidden_issues = self._check_forbidden_phrases(text)
+        forbidden_issues = self._check_forbidden_phrases(text, text_lower)
         if forbidden_issues:
             issues.extend(forbidden_issues)
             score -= len(forbidden_issues) * 15  # -15 points per forbidden phrase
         
         # Check authenticity markers
-        auth_score, auth_issues = self._check_authenticity(text)
+        auth_score, auth_issues = self._check_authenticity(text, text_lower)
         score = (score + auth_score) / 2  # Average with authenticity score
         issues.extend(auth_issues)
         
@@ -54,49 +82,33 @@ class VoiceChecker:
         
         return max(0, min(100, score)), issues
     
-    def _check_forbidden_phrases(self, text: str) -> List[str]:
+    def _check_forbidden_phrases(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """Check for forbidden phrases"""
         issues = []
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for phrase in self.voice_rules["forbidden_phrases"]:
-            if phrase.lower() in text_lower:
+        for phrase, phrase_lower in self._forbidden_phrases:
+            if phrase_lower in text_lower:
                 issues.append(f"❌ Contains forbidden phrase: '{phrase}'")
         
         return issues
     
-    def _check_authenticity(self, text: str) -> Tuple[float, List[str]]:
+    def _check_authenticity(self, text: str, text_lower: Optional[str] = None) -> Tuple[float, List[str]]:
         """Check authenticity markers"""
         score = 50.0  # Start at 50
         issues = []
-        text_lower = text.lower()
-        
-        # Positive markers (add points)
-        positive_markers = {
-            "specific numbers": [r"\d+%", r"\$\d+", r"\d+ years", r"\d+ months"],
-            "operator language": ["ran the numbers", "board demanded", "metal prices", "availability", "uptime"],
-            "authentic framing": ["portfolio career", "building ventures", "co-founding with partners"],
-            "results focus": ["delivered", "achieved", "reduced by", "improved", "increased"],
-            "real examples": ["at southern copper", "at ferreyros", "at chinalco", "through hatch"]
-        }
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for category, markers in positive_markers.items():
-            found = any(marker in text_lower for marker in markers)
-            if found:
+        for category, pattern in _POSITIVE_PATTERNS.items():
+            if pattern.search(text_lower):
                 score += 10
             else:
                 if category in ["specific numbers", "results focus"]:
                     issues.append(f"⚠️  Missing {category}")
         
-        # Negative markers (subtract points)
-        negative_markers = {
-            "marketing speak": ["excited to announce", "thrilled to share", "game-changer", "disruptive"],
-            "vague claims": ["world-class", "best-in-class", "cutting-edge", "next-generation" ],
-            "humble bragging": ["humbled", "honored", "blessed", "grateful for this journey"],
-            "lifestyle content": ["work-life balance", "follow your passion", "do what you love"]
-        }
-        
-        for category, markers in negative_markers.items():
+        for category, markers in NEGATIVE_MARKERS.items():
             for marker in markers:
                 if marker in text_lower:
                     score -= 15
@@ -10,7 +10,7 @@ CREATE TABLE IF NOT EXISTS posts (
     topic TEXT,
     text TEXT NOT NULL,
     image_path TEXT,
-    hashtags TEXT,
+    hashtags TEXT[],
     created_at TIMESTAMPTZ DEFAULT NOW(),
     status TEXT DEFAULT 'draft',
     voice_score NUMERIC,
@@ -35,6 +35,8 @@ CREATE INDEX IF NOT EXISTS idx_posts_channel ON posts(channel);
 CREATE INDEX IF NOT EXISTS idx_posts_status ON posts(status);
 CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_posts_voice_score ON posts(voice_score);
+CREATE INDEX IF NOT EXISTS idx_posts_status_pillar_score_created
+ON posts(status, pillar, voice_score DESC, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_engagement_post_id ON engagement(post_id);
 
 -- Channel topic queue (7-impact-topic list per channel)
@@ -53,6 +55,19 @@ CREATE TABLE IF NOT EXISTS channel_topics (
 CREATE INDEX IF NOT EXISTS idx_channel_topics_channel_rank
 ON channel_topics(channel, rank);
 
+-- Background /posts/batch jobs
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'queued',
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    post_ids TEXT[],
+    error TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- Cadence targets per channel
 CREATE TABLE IF NOT EXISTS channel_cadence (
     channel VARCHAR(50) PRIMARY KEY,
@@ -76,7 +91,7 @@ ON CONFLICT (channel) DO NOTHING;
 -- Sample data (optional - remove if not needed)
 INSERT INTO posts (id, channel, pillar, format, topic, text, hashtags, voice_score, length, status)
 VALUES 
-    ('sample-1', 'personal_career', 'technology', 'insight', 'AI in mining', 'Last week I ran the numbers on our new AI system at the Toquepala mine. Board demanded 15% uptime improvement. Delivered 23%.', '#Mining,#AI,#Operations', 92.5, 147, 'published')
+    ('sample-1', 'personal_career', 'technology', 'insight', 'AI in mining', 'Last week I ran the numbers on our new AI system at the Toquepala mine. Board demanded 15% uptime improvement. Delivered 23%.', ARRAY['#Mining', '#AI', '#Operations'], 92.5, 147, 'published')
 ON CONFLICT (id) DO NOTHING;
 
 -- Verify tables created
@@ -0,0 +1,8 @@
+"""
+Shared test setup: keep the media caches memory-only so test runs never write
+under ./cache (the cache modules read these at import time).
+"""
+import os
+
+os.environ.setdefault("MEDIA_CACHE_DIR", "")
+os.environ.setdefault("IMAGEN_CACHE_DIR", "")
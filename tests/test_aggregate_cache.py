@@ -0,0 +1,34 @@
+"""
+Cached /stats and /dashboard aggregates: served from memory within the TTL,
+stale values answered immediately while a background task recomputes them.
+"""
+import asyncio
+
+from fastapi import BackgroundTasks
+
+import api.main as main
+
+
+def test_cached_aggregate_serves_stale_value_and_refreshes_in_background(monkeypatch):
+    monkeypatch.setattr(main, "_aggregate_cache", {})
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"total": len(calls)}
+
+    async def run():
+        first = await main._cached_aggregate("stats", compute, BackgroundTasks())
+        cached = await main._cached_aggregate("stats", compute, BackgroundTasks())
+        main._aggregate_cache["stats"]["ts"] -= main.AGGREGATE_CACHE_TTL_SECONDS + 1
+        tasks = BackgroundTasks()
+        stale = await main._cached_aggregate("stats", compute, tasks)
+        await tasks()
+        return first, cached, stale
+
+    first, cached, stale = asyncio.run(run())
+    assert first == cached == stale == {"total": 1}
+    assert main._aggregate_cache["stats"]["value"] == {"total": 2}
+
+    main._invalidate_aggregate_cache()
+    assert main._aggregate_cache == {}
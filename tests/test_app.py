@@ -0,0 +1,53 @@
+"""
+API smoke tests: the app must import (route decorators resolve their Depends
+factories at definition time) and answer the health probe.
+"""
+from fastapi.testclient import TestClient
+
+from api.main import app, get_checker, get_db, get_generator
+
+
+def test_health_reports_status():
+    # No context manager: the lifespan (media pool, upload workers) is not needed here
+    client = TestClient(app)
+    response = client.get("/health")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] in ("healthy", "degraded")
+    assert "services" in body
+
+
+def test_batch_without_services_is_unavailable():
+    for factory in (get_generator, get_checker, get_db):
+        app.dependency_overrides[factory] = lambda: None
+    try:
+        response = TestClient(app).post("/posts/batch", json={"count": 2})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 503
+
+
+def test_posts_are_private_and_revalidated_with_etag():
+    class _Db:
+        def get_posts(self, **filters):
+            return []
+
+    app.dependency_overrides[get_db] = lambda: _Db()
+    try:
+        client = TestClient(app)
+        first = client.get("/posts")
+        again = client.get("/posts", headers={"If-None-Match": first.headers["etag"]})
+    finally:
+        app.dependency_overrides.clear()
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert again.status_code == 304
+
+
+def test_generate_probe_without_generator_is_unavailable():
+    app.dependency_overrides[get_generator] = lambda: None
+    try:
+        response = TestClient(app).get("/debug/test-generate")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 503
@@ -0,0 +1,56 @@
+"""
+Batch generation with fake services in place of the LLM-backed generator,
+voice checker and database.
+"""
+import asyncio
+
+import api.main as main
+
+
+class _Generator:
+    async def generate_post_async(self, pillar, **spec):
+        if pillar == "broken":
+            raise RuntimeError("provider down")
+        return {"pillar": pillar, "format": "story", "topic": None,
+                "text": f"{pillar} post", "hashtags": ["#ai"]}
+
+
+class _Checker:
+    def check_post(self, text):
+        if text.startswith("unscorable"):
+            raise ValueError("voice model unavailable")
+        return 8.5, {}
+
+
+class _Db:
+    def __init__(self):
+        self.saved = []
+        self.progress = []
+
+    def bulk_save_posts(self, rows):
+        self.saved.extend(rows)
+
+    def record_batch_progress(self, job_id, succeeded):
+        self.progress.append((job_id, succeeded))
+
+
+def test_generate_batch_rows_skips_failures_and_saves_once():
+    db = _Db()
+    specs = [{"pillar": "ai"}, {"pillar": "broken"}, {"pillar": "career"}]
+    rows = asyncio.run(main._generate_batch_rows(specs, _Generator(), _Checker(), db, job_id="batch_1"))
+
+    assert [row["pillar"] for row in rows] == ["ai", "career"]
+    assert all(row["voice_score"] == 8.5 and row["status"] == "draft" for row in rows)
+    assert len({row["id"] for row in rows}) == 2
+    assert db.saved == rows
+    assert sorted(db.progress) == [("batch_1", False), ("batch_1", True), ("batch_1", True)]
+
+
+def test_voice_check_failure_skips_only_that_post():
+    db = _Db()
+    specs = [{"pillar": "ai"}, {"pillar": "unscorable"}, {"pillar": "career"}]
+    rows = asyncio.run(main._generate_batch_rows(specs, _Generator(), _Checker(), db, job_id="batch_2"))
+
+    assert [row["pillar"] for row in rows] == ["ai", "career"]
+    assert db.saved == rows
+    assert sorted(db.progress) == [("batch_2", False), ("batch_2", True), ("batch_2", True)]
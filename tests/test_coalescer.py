@@ -0,0 +1,59 @@
+"""
+PromptCoalescer: concurrent submissions share one batch call, and a failed
+batch fails every prompt in it.
+"""
+import asyncio
+
+from core.coalescer import PromptCoalescer
+
+
+def test_concurrent_prompts_share_a_batch():
+    batches = []
+
+    def complete_batch(prompts):
+        batches.append(list(prompts))
+        return [prompt.upper() for prompt in prompts]
+
+    async def run():
+        coalescer = PromptCoalescer(complete_batch, max_batch=8, window_seconds=0.05)
+        try:
+            return await asyncio.gather(*(coalescer.submit(p) for p in ["a", "b", "c"]))
+        finally:
+            await coalescer.aclose()
+
+    assert asyncio.run(run()) == ["A", "B", "C"]
+    assert batches == [["a", "b", "c"]]
+
+
+def test_batch_size_is_capped():
+    batches = []
+
+    def complete_batch(prompts):
+        batches.append(len(prompts))
+        return prompts
+
+    async def run():
+        coalescer = PromptCoalescer(complete_batch, max_batch=2, window_seconds=0.05)
+        try:
+            await asyncio.gather(*(coalescer.submit(str(i)) for i in range(5)))
+        finally:
+            await coalescer.aclose()
+
+    asyncio.run(run())
+    assert max(batches) == 2 and sum(batches) == 5
+
+
+def test_short_batch_result_fails_every_prompt():
+    async def run():
+        coalescer = PromptCoalescer(lambda prompts: prompts[:1], window_seconds=0.05)
+        try:
+            return await asyncio.gather(coalescer.submit("a"), coalescer.submit("b"), return_exceptions=True)
+        finally:
+            await coalescer.aclose()
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_aclose_without_submissions():
+    asyncio.run(PromptCoalescer(lambda prompts: prompts).aclose())
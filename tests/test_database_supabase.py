@@ -0,0 +1,48 @@
+"""
+SupabaseDatabase request shapes, with the PostgREST round-trip replaced by a recorder.
+"""
+import pytest
+
+from core.database_supabase import SupabaseDatabase
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "test-key")
+    database = SupabaseDatabase()
+    database.calls = []
+
+    def record(method, endpoint, data=None, params=None, prefer=None):
+        database.calls.append((method, endpoint, data, params, prefer))
+        return None
+
+    database._request = record
+    return database
+
+
+def test_bulk_save_posts_leaves_caller_rows_untouched(db):
+    rows = [{"id": "a", "pillar": "technology", "text": "x"}]
+    assert db.bulk_save_posts(rows) == ["a"]
+    assert "created_at" not in rows[0]
+    _, _, payload, _, _ = db.calls[0]
+    assert payload[0]["created_at"]
+
+
+def test_batch_job_lifecycle_requests(db):
+    db.create_batch_job("job-1", 3)
+    db.record_batch_progress("job-1", True)
+    db.finish_batch_job("job-1", "completed", ["a", "b"])
+    assert [(method, endpoint) for method, endpoint, *_ in db.calls] == [
+        ("POST", "batch_jobs"),
+        ("POST", "rpc/record_batch_progress"),
+        ("PATCH", "batch_jobs"),
+    ]
+    assert "ignore-duplicates" in db.calls[0][4]
+    assert db.calls[2][2]["post_ids"] == ["a", "b"]
+    assert db.calls[2][3] == {"id": "eq.job-1"}
+
+
+def test_get_batch_job_missing_returns_none(db):
+    assert db.get_batch_job("nope") is None
+    assert db.get_posts_by_ids([]) == []
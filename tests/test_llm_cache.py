@@ -0,0 +1,42 @@
+"""
+LLMCache: TTL expiry, LRU eviction and the disabled (max_items=0) default.
+"""
+from types import SimpleNamespace
+
+import core.llm_cache as llm_cache_module
+from core.llm_cache import LLMCache
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = LLMCache(max_items=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["size"] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    cache = LLMCache(max_items=4, ttl_seconds=10)
+    cache.set("k", "v")
+    now[0] += 10
+    assert cache.get("k") == "v"
+    now[0] += 1
+    assert cache.get("k") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_zero_max_items_disables_caching():
+    cache = LLMCache(max_items=0)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_is_stable_over_argument_order():
+    assert LLMCache.make_key(provider="gemini", prompt="x") == LLMCache.make_key(prompt="x", provider="gemini")
+    assert LLMCache.make_key(provider="gemini", prompt="x") != LLMCache.make_key(provider="claude", prompt="x")
@@ -0,0 +1,104 @@
+"""
+Media response plumbing: the per-process /media/tmp store and the URLs handed
+back by the generate-* endpoints.
+"""
+import asyncio
+from collections import OrderedDict
+
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+import api.main as main
+
+
+def _reset_temp_media(monkeypatch, max_bytes):
+    monkeypatch.setattr(main, "TEMP_MEDIA_MAX_BYTES", max_bytes)
+    monkeypatch.setattr(main, "_temp_media", OrderedDict())
+    monkeypatch.setattr(main, "_temp_media_bytes", 0)
+
+
+def test_temp_media_is_bounded_by_bytes(monkeypatch):
+    _reset_temp_media(monkeypatch, 10)
+    first = main._store_temp_media(b"a" * 4, "image/png")
+    second = main._store_temp_media(b"b" * 4, "image/png")
+    third = main._store_temp_media(b"c" * 4, "image/png")
+    assert first not in main._temp_media
+    assert list(main._temp_media) == [second, third]
+    assert main._temp_media_bytes == 8
+
+
+def test_temp_media_is_served_with_short_private_caching(monkeypatch):
+    _reset_temp_media(monkeypatch, 1024)
+    token = main._store_temp_media(b"png-bytes", "image/png")
+    client = TestClient(main.app)
+
+    response = client.get(f"/media/tmp/{token}")
+    assert response.status_code == 200
+    assert response.content == b"png-bytes"
+    assert "immutable" not in response.headers["cache-control"]
+
+    assert client.get("/media/tmp/unknown").status_code == 404
+
+
+def test_generate_qrcode_returns_a_temp_link(monkeypatch):
+    _reset_temp_media(monkeypatch, 1024 * 1024)
+    client = TestClient(main.app)
+    response = client.post("/media/generate-qrcode", json={"url": "https://example.com"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["type"] == "qrcode" and body["storage_url"] is None
+
+    image = client.get(body["url"])
+    assert image.status_code == 200
+    assert image.headers["content-type"] == "image/png"
+    assert image.content.startswith(b"\x89PNG")
+
+
+class _FakeStorage:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.uploads = []
+
+    def media_path(self, post_id, media_type, extension="png"):
+        return f"{post_id}/{media_type}.{extension}"
+
+    def upload_media(self, data, post_id, media_type, extension="png", file_path=None):
+        if self.fail:
+            raise Exception("bucket unavailable")
+        self.uploads.append(file_path)
+        return f"https://storage.example/{file_path}"
+
+
+class _SaveRequest(BaseModel):
+    save_to_storage: bool = True
+    post_id: str = "post-1"
+
+
+def test_saved_media_url_is_the_uploaded_storage_url():
+    storage = _FakeStorage()
+    url, storage_url = asyncio.run(main._media_urls(
+        None, _SaveRequest(), storage, b"png", "image/png", "chart", "png"
+    ))
+    assert storage.uploads == ["post-1/chart.png"]
+    assert url == storage_url == "https://storage.example/post-1/chart.png"
+
+
+def test_failed_queued_upload_is_reported(monkeypatch):
+    monkeypatch.setattr(main, "UPLOAD_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(main, "failed_uploads", OrderedDict())
+
+    async def run():
+        main.start_upload_workers()
+        await main._queue_media_upload(_FakeStorage(fail=True), b"pdf", "post-2", "carousel", "pdf")
+        await main.stop_upload_workers()
+
+    asyncio.run(run())
+    assert main.failed_uploads["post-2"] == {"post-2/carousel.pdf": "carousel"}
+    assert "post-2" not in main.pending_uploads
+
+
+def test_presign_rejects_object_key_traversal():
+    client = TestClient(main.app)
+    for body in ({"post_id": "../other-post", "media_type": "chart"},
+                 {"post_id": "post-1", "media_type": "chart/../../x"}):
+        assert client.post("/media/presign", json=body).status_code == 422
@@ -0,0 +1,49 @@
+"""
+MediaCache: memory LRU by bytes, disk round-trips, and the disk tier's version
+directories and size cap.
+"""
+import os
+
+from api.services.media_cache import MediaCache
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = MediaCache(None, max_memory_bytes=8)
+    cache.set("a", "png", b"aaaa")
+    cache.set("b", "png", b"bbbb")
+    assert cache.get_memory("a") == b"aaaa"  # a is now the most recent
+    cache.set("c", "png", b"cccc")
+    assert cache.get_memory("b") is None
+    assert cache.get_memory("a") == b"aaaa"
+    assert cache.stats()["memory_bytes"] == 8
+
+
+def test_key_depends_on_params_and_version():
+    v1, v2 = MediaCache(None, version="v1"), MediaCache(None, version="v2")
+    assert v1.make_key("qr", url="x") == v1.make_key("qr", url="x")
+    assert v1.make_key("qr", url="x") != v1.make_key("qr", url="y")
+    assert v1.make_key("qr", url="x") != v2.make_key("qr", url="x")
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    MediaCache(str(tmp_path), version="v1").set("k", "png", b"bytes")
+    fresh = MediaCache(str(tmp_path), version="v1")
+    assert fresh.get_memory("k") is None
+    assert fresh.get_disk("k", "png") == b"bytes"
+    assert fresh.get_memory("k") == b"bytes"
+
+
+def test_new_version_removes_old_entries(tmp_path):
+    MediaCache(str(tmp_path), version="v1").set("k", "png", b"old")
+    (tmp_path / "legacy.png").write_bytes(b"flat layout")
+    MediaCache(str(tmp_path), version="v2").set("k", "png", b"new")
+    assert sorted(os.listdir(tmp_path)) == ["v2"]
+
+
+def test_disk_tier_is_capped_by_size(tmp_path):
+    cache = MediaCache(str(tmp_path), version="v1", max_disk_bytes=10)
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.set(key, "png", b"x" * 4)
+        os.utime(cache.cache_dir / f"{key}.png", (index, index))
+    assert sorted(os.listdir(cache.cache_dir)) == ["b.png", "c.png"]
+    assert cache.stats()["disk_bytes"] == 8